@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of the \phi_r memoization in GR1Formula._gen_phi_prop
+
+For synthetic dense transition systems of increasing size, the benchmark
+times (once with and once without the memoization):
+  * getting \phi_r for the target of every edge of the TS, and
+  * generating the topology formulas that use \phi_r
+    (TransitionRelationFormula, SingleStepChangeFormula,
+     TopologyFairnessConditionsFormula).
+
+Usage (from the root of the repository):
+
+  PYTHONPATH=src python benchmarks/phi_cache_benchmark.py [sizes ...]
+
+"""
+
+import sys
+import time
+
+from respec.formula import GR1Formula, ActivationOutcomesFormula, \
+                           TransitionRelationFormula, \
+                           SingleStepChangeFormula, \
+                           TopologyFairnessConditionsFormula
+
+from workloads import gen_random_ts, get_num_edges
+
+FORMULA_CLASSES = [TransitionRelationFormula, SingleStepChangeFormula,
+                   TopologyFairnessConditionsFormula]
+
+DEFAULT_SIZES = [25, 50, 100, 200]
+
+def time_phi_props(ts, cache_phi_props):
+    """Wall-clock time (seconds) of getting \phi_r for all edges of the TS."""
+
+    formula = ActivationOutcomesFormula(sys_props = [], ts = ts)
+    formula.cache_phi_props = cache_phi_props
+
+    start = time.time()
+    for act_props in formula.ts.values():
+        for act_prop in act_props:
+            formula._gen_phi_prop(act_prop)
+    return time.time() - start
+
+def time_formula_class(formula_class, ts, cache_phi_props):
+    """Wall-clock time (seconds) of generating the formulas of a class."""
+
+    GR1Formula.cache_phi_props = cache_phi_props
+    try:
+        start = time.time()
+        formula_class(ts = ts)
+        return time.time() - start
+    finally:
+        GR1Formula.cache_phi_props = True
+
+def main(): #pragma: no cover
+
+    sizes = map(int, sys.argv[1:]) or DEFAULT_SIZES
+
+    header = '{0:>6} {1:>8} {2:<36} {3:>10} {4:>10} {5:>8}'
+    row = '{0:>6} {1:>8} {2:<36} {3:>10.4f} {4:>10.4f} {5:>7.1f}x'
+
+    print(header.format('states', 'edges', 'formula class',
+                        'uncached', 'cached', 'speedup'))
+
+    for size in sizes:
+        ts = gen_random_ts(size, density = 0.5)
+        num_edges = get_num_edges(ts)
+
+        uncached = time_phi_props(ts, False)
+        cached = time_phi_props(ts, True)
+        print(row.format(size, num_edges, '\phi_r of all edges',
+                         uncached, cached, uncached / max(cached, 1e-9)))
+
+        for formula_class in FORMULA_CLASSES:
+            uncached = time_formula_class(formula_class, ts, False)
+            cached = time_formula_class(formula_class, ts, True)
+            print(row.format(size, num_edges, formula_class.__name__,
+                             uncached, cached, uncached / max(cached, 1e-9)))
+
+if __name__ == "__main__": #pragma: no cover
+    main()
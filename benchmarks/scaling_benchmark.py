@@ -0,0 +1,310 @@
+#!/usr/bin/env python
+
+"""
+Scaling benchmark of the formula classes and of complete specifications.
+
+For synthetic transition systems (see workloads.TS_SHAPES) and action
+libraries of increasing size, the benchmark measures, for each formula class
+in activation_outcomes and for a CompleteSpecification (the one of the ATLAS
+example, built from the synthetic TS and actions instead of the config file):
+  * the wall-clock time (seconds, the best of --repeat runs),
+  * the peak memory (KiB above the memory in use before the run), and
+  * the size of the output (formulas, props, and characters).
+
+Each case runs in a child process (where os.fork is available), so the peak
+memory of a case does not depend on the cases that were run before it.
+The results are written as JSON, so that scaling curves can be compared
+across releases:
+
+  {"label": ..., "python": ..., "date": ...,
+   "results": [{"shape": "grid", "size": 100, "edges": ..., "actions": ...,
+                "case": "TransitionRelationFormula", "time": ...,
+                "peak_memory_kib": ..., "output": {...}}, ...]}
+
+Usage (from the root of the repository):
+
+  PYTHONPATH=src python benchmarks/scaling_benchmark.py \\
+      [--shapes grid chain] [--sizes 25 50 100] [--output results.json]
+
+"""
+
+import os
+import gc
+import sys
+import json
+import time
+import argparse
+import datetime
+import platform
+
+from respec.formula import *
+from respec.ltl.syntax_tree import iter_chunks
+from respec.spec.writers import StructuredSlugsWriter
+
+from workloads import TS_SHAPES, gen_ts, gen_preconditions, get_num_edges
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             os.pardir, 'examples'))
+import atlas_specification
+
+try:
+    import resource
+except ImportError: # not on Windows
+    resource = None
+
+DEFAULT_SHAPES = sorted(TS_SHAPES.keys())
+DEFAULT_SIZES = [25, 50, 100, 200]
+
+OUTCOMES = ['completed', 'failed']
+
+# Formula class -> function of a workload that generates its formulas
+FORMULA_CASES = [
+    (TransitionRelationFormula,
+        lambda w: TransitionRelationFormula(w.ts)),
+    (TopologyMutexFormula,
+        lambda w: TopologyMutexFormula(w.ts)),
+    (SingleStepChangeFormula,
+        lambda w: SingleStepChangeFormula(w.ts, OUTCOMES)),
+    (TopologyOutcomeConstraintFormula,
+        lambda w: TopologyOutcomeConstraintFormula(w.ts, OUTCOMES)),
+    (TopologyOutcomePersistenceFormula,
+        lambda w: TopologyOutcomePersistenceFormula(w.ts, OUTCOMES)),
+    (TopologyFairnessConditionsFormula,
+        lambda w: TopologyFairnessConditionsFormula(w.ts, OUTCOMES)),
+    (TopologyFormulaGenerator,
+        lambda w: TopologyFormulaGenerator(w.ts, OUTCOMES).families),
+    (OutcomeMutexFormula,
+        lambda w: OutcomeMutexFormula(w.actions, OUTCOMES, w.ts)),
+    (PropositionDeactivationFormula,
+        lambda w: PropositionDeactivationFormula(w.actions, OUTCOMES, w.ts)),
+    (ActionOutcomeConstraintsFormula,
+        lambda w: ActionOutcomeConstraintsFormula(w.actions, OUTCOMES)),
+    (ActionOutcomePersistenceFormula,
+        lambda w: ActionOutcomePersistenceFormula(w.actions, OUTCOMES)),
+    (ActionFairnessConditionsFormula,
+        lambda w: ActionFairnessConditionsFormula(w.actions, OUTCOMES)),
+    (PreconditionsFormula,
+        lambda w: [PreconditionsFormula(action, pcs) for action, pcs
+                   in sorted(w.preconditions.items()) if pcs]),
+    (SimpleLivenessRequirementActOutFormula,
+        lambda w: [SimpleLivenessRequirementActOutFormula(goal, 'finished')
+                   for goal in w.actions]),
+    (SuccessfulOutcomeFormula,
+        lambda w: SuccessfulOutcomeFormula(w.actions, strict_order = True)),
+    (FailedOutcomeFormula,
+        lambda w: FailedOutcomeFormula(w.actions)),
+    (RetryAfterFailureFormula,
+        lambda w: RetryAfterFailureFormula(w.actions, OUTCOMES)),
+    (SystemInitialConditions,
+        lambda w: SystemInitialConditions(w.ts.keys() + w.actions,
+                                          w.initial_conditions)),
+    (EnvironmentInitialConditions,
+        lambda w: EnvironmentInitialConditions(w.ts.keys() + w.actions,
+                                               w.initial_conditions)),
+]
+
+class Workload(object):
+    """A synthetic TS (of a shape and size) and a library of actions."""
+
+    def __init__(self, shape, size, num_actions = None, seed = 0):
+
+        self.shape = shape
+        self.size = size
+        self.ts = gen_ts(shape, size, seed)
+
+        if num_actions is None:
+            num_actions = size
+        self.preconditions = gen_preconditions(num_actions, self.ts.keys(),
+                                               seed = seed)
+        self.actions = sorted(self.preconditions.keys(),
+                              key = lambda a: int(a[1:]))
+
+        # Start at the first state, the goal is the last (deepest) action
+        self.initial_conditions = ['r0']
+        self.goals = self.actions[-1:]
+
+    def get_info(self):
+        return {'shape': self.shape, 'size': self.size,
+                'edges': get_num_edges(self.ts), 'actions': len(self.actions)}
+
+
+class SyntheticFragments(atlas_specification.SpecificationFragments):
+    """The fragments of the ATLAS example, but for a synthetic workload."""
+
+    def __init__(self, workload, action_outcomes = OUTCOMES):
+
+        self.control_mode_ts = workload.ts
+        self.preconditions = workload.preconditions
+        self.action_outcomes = action_outcomes
+
+        self._ts_specs = dict()
+        self._action_specs = dict()
+
+def build_complete_specification(workload):
+
+    fragments = SyntheticFragments(workload)
+
+    return atlas_specification.CompleteSpecification(
+                                        'benchmark',
+                                        workload.initial_conditions,
+                                        workload.goals,
+                                        action_outcomes = OUTCOMES,
+                                        fragments = fragments)
+
+# =========================================================
+# Measurements
+# =========================================================
+
+def get_output_size(output):
+    """The number of formulas, props, and characters of formulas or a spec."""
+
+    if isinstance(output, list):
+        sizes = map(get_output_size, output)
+        return dict((key, sum(size[key] for size in sizes))
+                    for key in ['formulas', 'props', 'chars'])
+
+    if isinstance(output, GR1Formula):
+        return {'formulas': len(output.formulas),
+                'props': len(output.sys_props) + len(output.env_props),
+                'chars': sum(_get_num_chars(f) for f in output.formulas)}
+
+    # A specification: its size is that of the .structuredslugs text
+    return {'formulas': sum(len(getattr(output, section)) for section in
+                            ['sys_init', 'env_init', 'sys_trans',
+                             'env_trans', 'sys_liveness', 'env_liveness']),
+            'props': len(output.sys_props) + len(output.env_props),
+            'chars': sum(map(len, StructuredSlugsWriter().iter_chunks(output)))}
+
+def _get_num_chars(formula):
+    """The length of a formula (without rendering it as a whole)."""
+    return sum(map(len, iter_chunks(formula)))
+
+def measure(generate, workload, repeat = 1):
+    """Time, peak memory (KiB or None), and output size of generate(workload)."""
+
+    gc.collect()
+    start_memory = _get_peak_memory()
+
+    times = list()
+    for _ in range(repeat):
+        start = time.time()
+        output = generate(workload)
+        times.append(time.time() - start)
+
+    peak_memory = _get_peak_memory()
+    if start_memory is not None:
+        peak_memory -= start_memory
+
+    return {'time': min(times), 'peak_memory_kib': peak_memory,
+            'output': get_output_size(output)}
+
+def measure_in_child(generate, workload, repeat = 1):
+    """Measure in a forked process, so that the peak memory is not shared."""
+
+    if not hasattr(os, 'fork'):
+        result = measure(generate, workload, repeat)
+        result['peak_memory_kib'] = None # includes the previous cases
+        return result
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0: #pragma: no cover
+        os.close(read_fd)
+        try:
+            result = measure(generate, workload, repeat)
+        except Exception as e:
+            result = {'error': '{0}: {1}'.format(e.__class__.__name__, e)}
+        with os.fdopen(write_fd, 'w') as pipe:
+            json.dump(result, pipe)
+        os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd) as pipe:
+        data = pipe.read()
+    os.waitpid(pid, 0)
+
+    return json.loads(data)
+
+def _get_peak_memory():
+    """The peak memory of the process (KiB) or None."""
+
+    if resource is None:
+        return None
+
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        peak_memory //= 1024 # bytes (instead of KiB)
+    return peak_memory
+
+def run_benchmarks(shapes, sizes, num_actions = None, repeat = 1,
+                   fork = True, log = None):
+    """The results of all of the cases, for each workload (shape and size)."""
+
+    cases = [(cls.__name__, generate) for cls, generate in FORMULA_CASES]
+    cases.append(('CompleteSpecification', build_complete_specification))
+
+    run = measure_in_child if fork else measure
+
+    results = list()
+    for shape in shapes:
+        for size in sizes:
+            workload = Workload(shape, size, num_actions)
+            for name, generate in cases:
+                result = workload.get_info()
+                result['case'] = name
+                result.update(run(generate, workload, repeat))
+                results.append(result)
+                if log:
+                    log(result)
+    return results
+
+def _print_result(result):
+
+    if 'error' in result:
+        print >> sys.stderr, '{shape:>6} {size:>6} {case:<38} {error}'\
+                             .format(**result)
+        return
+
+    print >> sys.stderr, ('{shape:>6} {size:>6} {case:<38} {time:>9.4f}s '
+                          '{memory:>9} KiB {chars:>11} chars').format(
+                                memory = result['peak_memory_kib'],
+                                chars = result['output']['chars'], **result)
+
+# =========================================================
+# Entry point
+# =========================================================
+
+def main(): #pragma: no cover
+
+    parser = argparse.ArgumentParser(description = 'ReSpeC scaling benchmark')
+    parser.add_argument('--shapes', nargs = '+', default = DEFAULT_SHAPES,
+                        choices = sorted(TS_SHAPES.keys()))
+    parser.add_argument('--sizes', nargs = '+', type = int,
+                        default = DEFAULT_SIZES, help = 'numbers of TS states')
+    parser.add_argument('--actions', type = int, default = None,
+                        help = 'number of actions (default: the TS size)')
+    parser.add_argument('--repeat', type = int, default = 1)
+    parser.add_argument('--no-fork', action = 'store_true',
+                        help = 'run in this process (no peak memory per case)')
+    parser.add_argument('--label', default = None,
+                        help = 'e.g. the release that is benchmarked')
+    parser.add_argument('--output', default = None,
+                        help = 'JSON file (default: standard output)')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.shapes, args.sizes, args.actions,
+                             args.repeat, not args.no_fork, _print_result)
+
+    report = {'label': args.label,
+              'python': platform.python_version(),
+              'date': datetime.datetime.now().isoformat(),
+              'results': results}
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent = 1, sort_keys = True)
+    else:
+        json.dump(report, sys.stdout, indent = 1, sort_keys = True)
+
+if __name__ == "__main__": #pragma: no cover
+    main()
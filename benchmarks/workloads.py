@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+
+"""
+Synthetic workloads for the benchmarks: transition systems (TS) of a given
+shape and size, and libraries of actions whose preconditions form a DAG.
+
+All of the generators are deterministic (given the seed), so the same
+workload can be benchmarked across releases. As in the robot configurations,
+every TS state has a self-loop.
+
+  ts = gen_ts('grid', 100)
+  preconditions = gen_preconditions(50, ts_props = ts.keys())
+
+"""
+
+import math
+import random
+
+def gen_grid_ts(size):
+    """A (nearly) square grid of states, each adjacent to its 4 neighbors."""
+
+    width = int(math.ceil(math.sqrt(size)))
+    states = ['r{}'.format(i) for i in range(size)]
+
+    ts = dict()
+    for i, state in enumerate(states):
+        neighbors = [i - width, i + width]
+        if i % width > 0:
+            neighbors.append(i - 1)
+        if i % width < width - 1:
+            neighbors.append(i + 1)
+        ts[state] = [state] + [states[j] for j in sorted(neighbors)
+                               if 0 <= j < size]
+    return ts
+
+def gen_random_ts(size, density = 0.5, seed = 0):
+    """A TS where each state has density*size random successors."""
+
+    rng = random.Random(seed)
+    states = ['r{}'.format(i) for i in range(size)]
+    num_successors = max(1, int(density * size))
+
+    ts = dict()
+    for state in states:
+        successors = rng.sample(states, num_successors)
+        ts[state] = [state] + [s for s in successors if s != state]
+    return ts
+
+def gen_chain_ts(size):
+    """States in a line, each adjacent to the previous and next ones."""
+
+    states = ['r{}'.format(i) for i in range(size)]
+
+    return dict((state, [state] + [states[j] for j in [i - 1, i + 1]
+                                   if 0 <= j < size])
+                for i, state in enumerate(states))
+
+def gen_star_ts(size):
+    """A hub state (r0) that is adjacent to all of the other states."""
+
+    states = ['r{}'.format(i) for i in range(size)]
+
+    ts = dict((state, [state, states[0]]) for state in states[1:])
+    ts[states[0]] = list(states)
+    return ts
+
+# The shapes of TS that gen_ts can generate
+TS_SHAPES = {
+    'grid':     lambda size, seed: gen_grid_ts(size),
+    'sparse':   lambda size, seed: gen_random_ts(size, 0.05, seed),
+    'dense':    lambda size, seed: gen_random_ts(size, 0.5, seed),
+    'chain':    lambda size, seed: gen_chain_ts(size),
+    'star':     lambda size, seed: gen_star_ts(size),
+}
+
+def gen_ts(shape, size, seed = 0):
+    """A TS of one of the TS_SHAPES."""
+
+    if shape not in TS_SHAPES:
+        raise ValueError('Unknown TS shape: {0} (expected one of {1})'
+                         .format(shape, sorted(TS_SHAPES.keys())))
+
+    return TS_SHAPES[shape](size, seed)
+
+def gen_preconditions(num_actions, ts_props = [], max_preconditions = 2,
+                      locality = 5, ts_probability = 0.5, seed = 0):
+    """
+    Actions a0, a1, etc., each of which has up to max_preconditions of the
+    locality actions before it as preconditions (so they form a DAG, whose
+    depth grows with num_actions) and, with ts_probability, a TS prop.
+    """
+
+    rng = random.Random(seed)
+    actions = ['a{}'.format(i) for i in range(num_actions)]
+
+    preconditions = dict()
+    for i, action in enumerate(actions):
+        candidates = actions[max(0, i - locality):i]
+        num_preconditions = rng.randint(0, min(max_preconditions,
+                                               len(candidates)))
+        action_preconditions = rng.sample(candidates, num_preconditions)
+        if ts_props and rng.random() < ts_probability:
+            action_preconditions.append(rng.choice(sorted(ts_props)))
+        preconditions[action] = action_preconditions
+    return preconditions
+
+def get_num_edges(ts):
+    return sum(map(len, ts.values()))
@@ -8,51 +8,115 @@ The module defines the components that make up a LTL specification for ATLAS.
 The name of the class below, CompleteSpecification, should be the same for all
 robots to facilitate integration with ROS. Only the module's name and the 
 details of the class's constructor should change between robots.
+
+Many specifications (e.g., a sweep over scenarios) can be built at once with
+build_complete_specifications. The robot configuration, the TS specification,
+and the specification of each action are then only generated once and shared
+by all of the specifications (see SpecificationFragments).
 """
 
 SM_OUTCOME_SUCCESS = 'finished'
 SM_OUTCOME_FAILURE = 'failed'
 
+DEFAULT_ACTION_OUTCOMES = ['completed', 'failed']
+
+class SpecificationFragments(object):
+    """
+    The sub-specifications that do not depend on a particular combination of
+    initial conditions and goals. Each one is generated the first time that
+    it is needed and is then reused (the fragments are only read by merging).
+    """
+
+    def __init__(self, action_outcomes = DEFAULT_ACTION_OUTCOMES):
+
+        # Load control modes and action preconditions from config file
+        atlas_config = RobotConfiguration('atlas')
+        self.control_mode_ts = atlas_config.ts
+        self.preconditions = atlas_config.preconditions
+
+        self.action_outcomes = action_outcomes
+
+        self._ts_specs = dict()
+        self._action_specs = dict()
+
+    def get_ts_spec(self, initial_conditions, goals):
+        """
+        The LTL specification governing the BDI control modes that are
+        reachable from the initial conditions and from which the goals
+        (or the modes that they require) are reachable.
+        """
+
+        goal_props = goals + get_required_props(goals, self.preconditions)
+        modes_of_interest = tuple(get_relevant_ts_props(self.control_mode_ts,
+                                                        initial_conditions,
+                                                        goal_props))
+
+        if modes_of_interest not in self._ts_specs:
+            self._ts_specs[modes_of_interest] = TransitionSystemSpecification(
+                                    ts = self.control_mode_ts,
+                                    props_of_interest = list(modes_of_interest),
+                                    outcomes = self.action_outcomes)
+
+        return self._ts_specs[modes_of_interest]
+
+    def get_action_spec(self, action):
+        """The LTL specification governing an action and its preconditions."""
+
+        if action not in self._action_specs:
+            action_spec = ActionSpecification(preconditions = self.preconditions)
+            action_spec.handle_new_action(action = action,
+                                          act_out = True,
+                                          outcomes = self.action_outcomes)
+            self._action_specs[action] = action_spec
+
+        return self._action_specs[action]
+
 class CompleteSpecification(GR1Specification):
     """
     Upon construction, this class generates LTL specifications for individual
     subcomponents of ATLAS (BDI control mode transition system, action 
     preconditions) as well as LTL specifications for the objective and the 
     initial conditions. It then merges them onto the object itself.
+
+    The action outcomes are the ones of the fragments, if they are shared
+    (they are generated for them), so they cannot be different.
     """
     
     def __init__(self, name, initial_conditions, goals,
-                 action_outcomes = ['completed', 'failed'],
+                 action_outcomes = None,
                  sm_outcomes = [SM_OUTCOME_SUCCESS, SM_OUTCOME_FAILURE],
-                 strict_order = True):
+                 strict_order = True,
+                 fragments = None):
         
         super(CompleteSpecification, self).__init__(spec_name = name,
                                                     env_props = [],
                                                     sys_props = [])
 
+        if fragments is not None:
+            if action_outcomes is not None and \
+               list(action_outcomes) != list(fragments.action_outcomes):
+                raise ValueError('The action outcomes {0} are not the ones '
+                                 'of the fragments {1}'.format(action_outcomes,
+                                 fragments.action_outcomes))
+            action_outcomes = fragments.action_outcomes
+        elif action_outcomes is None:
+            action_outcomes = DEFAULT_ACTION_OUTCOMES
+
         self._check_input_arguments(initial_conditions, goals,
                                     action_outcomes, sm_outcomes)
 
-        # Load control modes and action preconditions from config file
-        atlas_config = RobotConfiguration('atlas')
-        control_mode_ts = atlas_config.ts
-        atlas_preconditions = atlas_config.preconditions
-
-        # Generate a LTL specification governing BDI control modes
-        #FIX: infer control modes of interest from input arguments and actions
-        modes_of_interest = ['stand_prep', 'stand', 'manipulate']
-        ts_spec = TransitionSystemSpecification(
-                                    ts = control_mode_ts,
-                                    props_of_interest = modes_of_interest,
-                                    outcomes = action_outcomes)
-
-        # Generate LTL specification governing action and preconditions
-        action_spec = ActionSpecification(preconditions = atlas_preconditions)
-        for goal in goals:
-            if goal not in ts_spec.ts.keys(): # topology is handled above
-                action_spec.handle_new_action(action = goal,
-                                              act_out = True,
-                                              outcomes = action_outcomes)
+        # Load the configuration (unless the fragments are shared)
+        if fragments is None:
+            fragments = SpecificationFragments(action_outcomes)
+
+        # Get the LTL specification governing (the relevant) BDI control modes
+        ts_spec = fragments.get_ts_spec(initial_conditions, goals)
+
+        # Get the LTL specifications governing actions and preconditions
+        action_specs = [fragments.get_action_spec(goal) for goal in goals
+                        if goal not in ts_spec.ts.keys()] # topology is above
+        all_actions = list(set(sum([spec.all_actions
+                                    for spec in action_specs], [])))
 
         # Generate LTL specification governing the achievement of goals ...
         goal_spec = GoalSpecification()
@@ -62,13 +126,13 @@ class CompleteSpecification(GR1Specification):
         
         if SM_OUTCOME_FAILURE in sm_outcomes:
             # Add LTL formula tying all the things that can fail to SM outcome
-            failure_conditions = ts_spec.ts.keys() + action_spec.all_actions
+            failure_conditions = ts_spec.ts.keys() + all_actions
             assert len(failure_conditions) == len(set(failure_conditions))
             goal_spec.handle_any_failure(conditions = failure_conditions,
                                          failure = SM_OUTCOME_FAILURE)
 
         # Merge these specifications. Initial conditions are still missing.
-        self.merge_gr1_specifications([ts_spec, action_spec, goal_spec])
+        self.merge_gr1_specifications([ts_spec] + action_specs + [goal_spec])
 
         # Now generate LTL formulas encoding all of the initial conditions
         ic_spec = InitialConditionsSpecification()
@@ -88,6 +152,23 @@ class CompleteSpecification(GR1Specification):
                                       'than State Machine outcomes {1}'
                                       .format(action_outcomes, sm_outcomes))
 
+
+def build_complete_specifications(name, requests,
+                                  action_outcomes = DEFAULT_ACTION_OUTCOMES,
+                                  **kwargs):
+    """
+    Build a CompleteSpecification for each (initial_conditions, goals) pair
+    in requests, sharing the fragments that do not depend on the pair.
+    The specifications are named name_0, name_1, etc.
+    """
+
+    fragments = SpecificationFragments(action_outcomes)
+
+    return [CompleteSpecification('{0}_{1}'.format(name, i),
+                                  initial_conditions, goals,
+                                  fragments = fragments, **kwargs)
+            for i, (initial_conditions, goals) in enumerate(requests)]
+
 # =========================================================
 # Entry point
 # =========================================================
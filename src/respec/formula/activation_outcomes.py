@@ -1,6 +1,9 @@
 #!/usr/bin/env python
 
+import itertools
+
 from ..ltl import ltl as LTL
+from ..ltl.syntax_tree import get_first_atom
 from gr1_formulas import *
 
 """
@@ -11,6 +14,13 @@ The base class ActivationOutcomesFormula is a generalization of FastSlowFormula.
 
 """
 
+# Encodings of the (mutually exclusive) TS propositions
+ONE_HOT = 'one_hot'
+INTEGER = 'integer'
+
+# Base name of the integer variables that encode the TS propositions
+TS_VARIABLE = 'ts'
+
 class ActivationOutcomesFormula(GR1Formula):
     """
     
@@ -23,6 +33,11 @@ class ActivationOutcomesFormula(GR1Formula):
                                 be unique, such as in the example above (c,f,p)
       ts        (dict of str)   Transition system, TS (e.g. workspace topology)
                                 Implicitly contains some props in its keys.
+      encoding  (str)           How the mutually exclusive TS props are encoded.
+                                ONE_HOT (default): one proposition per state.
+                                INTEGER: the activation and completion props
+                                of the TS states become the values of two
+                                integer variables (ts_a and ts_c).
 
     Attributes:
       outcomes   (list of str)  The possible outcomes of activating a prop.
@@ -30,6 +45,8 @@ class ActivationOutcomesFormula(GR1Formula):
                                     to each possible activation outcome.
       ts        (dict of str)   The input TS but transformed such that the keys
                                 are completion props and the values activation.
+      encoded_props (dict)      The integer variables (INTEGER encoding only)
+                                and the props encoded by each of their values.
 
     Raises:
       TypeError
@@ -37,12 +54,14 @@ class ActivationOutcomesFormula(GR1Formula):
     
     """
 
-    def __init__(self, sys_props, outcomes = ['completed'], ts = dict()):
+    def __init__(self, sys_props, outcomes = ['completed'], ts = dict(),
+                 encoding = ONE_HOT):
 
         # Check whether the input arguments are of the correct type, etc.
-        self._check_input_arguments(sys_props, outcomes, ts)
+        self._check_input_arguments(sys_props, outcomes, ts, encoding)
         
         self.outcomes = outcomes
+        self.encoding = encoding
 
         sys_props = sys_props + ts.keys()
 
@@ -52,18 +71,34 @@ class ActivationOutcomesFormula(GR1Formula):
         # Get the outcome props (environment) as a list
         env_props = self._get_env_props_from_outcome_props()
 
+        # Replace the TS props by integer variables (if requested)
+        if encoding == INTEGER:
+            encoded_props = _gen_integer_encoding(ts.keys())
+            act_props, env_props = self._encode_propositions(encoded_props,
+                                                             act_props,
+                                                             env_props)
+        else:
+            encoded_props = dict()
+
         super(ActivationOutcomesFormula, self).__init__(env_props = env_props,
                                                         sys_props = act_props,
                                                         ts = {}) # bypass ts
 
+        self.encoded_props = encoded_props
+
         # Convert the transition system's props to activation-outcome props
         #TODO: Not really useful besides for TransitionRelation formula [?]
         self.original_ts = ts
         self.ts = self._convert_ts_to_act_out(ts) # overwrites self.ts
 
-    def _check_input_arguments(self, sys_props, outcomes, ts):
+    def _check_input_arguments(self, sys_props, outcomes, ts,
+                               encoding = ONE_HOT):
         """Check type of input arguments as well as adherence to conventions."""
 
+        if encoding not in [ONE_HOT, INTEGER]:
+            raise ValueError('Unknown encoding of the TS props: {}'
+                             .format(encoding))
+
         if any([type(pi) != str for pi in sys_props]):
             raise TypeError('Invalid type of system props (expected str): {}'
                             .format(map(type, sys_props)))
@@ -95,15 +130,15 @@ class ActivationOutcomesFormula(GR1Formula):
             raise TypeError('Invalid type of TS dict values (expected list): {}'
                             .format(map(type, ts.values())))
         
-        all_values = reduce(lambda acc, ele: acc + ele, ts.values(), [])
+        all_values = set(itertools.chain.from_iterable(ts.values()))
         
         if any([type(v) is not str for v in all_values]):
             raise TypeError('Invalid type of TS value props (expected str): {}'
                             .format(map(type, all_values)))
 
-        if any([v not in ts.keys() for v in all_values]):
+        if not all_values.issubset(ts):
             raise ValueError('Some values are not in the keys of the TS: {}'
-                             .format(all_values))
+                             .format(sorted(all_values.difference(ts))))
 
     def _gen_outcome_propositions(self, sys_props):
         """
@@ -123,6 +158,218 @@ class ActivationOutcomesFormula(GR1Formula):
                            self.outcome_props.values(), [])
         return env_props
 
+    def _encode_propositions(self, encoded_props, act_props, env_props):
+        """
+        Replace the encoded props by the declarations of the integer variables
+        and use the integer comparisons in the outcome props instead.
+        """
+
+        self._int_literals = _get_int_literals(encoded_props)
+
+        act_var = _get_act_prop(TS_VARIABLE)
+        com_var = _get_com_prop(TS_VARIABLE)
+
+        act_props = [pi for pi in act_props if pi not in self._int_literals]
+        act_props.append(_get_int_declaration(act_var, encoded_props[act_var]))
+
+        env_props = [pi for pi in env_props if pi not in self._int_literals]
+        env_props.append(_get_int_declaration(com_var, encoded_props[com_var]))
+
+        for pi, pi_outs in self.outcome_props.items():
+            self.outcome_props[pi] = [self._int_literals.get(pi_out, pi_out)
+                                      for pi_out in pi_outs]
+
+        return act_props, env_props
+
+    def _get_act(self, prop):
+        """The activation proposition of a prop (or its integer equivalent)."""
+
+        act_prop = _get_act_prop(prop)
+        if self.encoded_props:
+            return self._int_literals.get(act_prop, act_prop)
+        return act_prop
+
+    def _get_com(self, prop):
+        """The completion proposition of a prop (or its integer equivalent)."""
+
+        com_prop = _get_com_prop(prop)
+        if self.encoded_props:
+            return self._int_literals.get(com_prop, com_prop)
+        return com_prop
+
+    def _get_act_phi(self, prop):
+        """Activation of a TS prop and of no other TS prop, i.e., \phi_r."""
+
+        if self.encoded_props:
+            return self._get_act(prop)
+        return self._gen_phi_prop(_get_act_prop(prop))
+
+    def _get_act_nothing(self):
+        """None of the TS props is being activated."""
+
+        if self.encoded_props:
+            act_var = _get_act_prop(TS_VARIABLE)
+            return LTL.eq(act_var, self.encoded_props[act_var].index(None))
+        return _get_act_nothing(self.original_ts.keys())
+
+    # =====================================================
+    # Topology formulas of a single TS state
+    # =====================================================
+
+    def _gen_transition_formula(self, prop, adj_props, activate_nothing):
+        """Completing prop allows activating an adjacent prop (or nothing)."""
+
+        left_hand_side = LTL.next(self._get_com(prop))
+        right_hand_side = list()
+        
+        for adj_prop in adj_props:
+            adj_phi_prop = self._get_act_phi(adj_prop)
+            disjunct = LTL.next(adj_phi_prop)
+            right_hand_side.append(disjunct)
+
+        activate_nothing_disjunct = LTL.next(activate_nothing)
+        right_hand_side.append(activate_nothing_disjunct)
+
+        right_hand_side = LTL.disj(right_hand_side)
+        return LTL.implication(left_hand_side, right_hand_side)
+
+    def _gen_single_step_change_formulas_of(self, pi, adj_props):
+        """Equivalent of Eq. (2) for the transitions out of pi"""
+
+        formulas = list()
+
+        pi_c = self._get_com(pi)
+        next_pi_c = LTL.next(pi_c)
+        
+        for pi_prime in adj_props:
+            
+            phi = self._get_act_phi(pi_prime)
+
+            left_hand_side = LTL.conj([pi_c, phi])
+
+            act_outcomes = map(LTL.next, self.outcome_props[pi_prime])
+            
+            rhs_elements = [next_pi_c] # reinitialize list for new pi_prime
+            rhs_elements.extend(act_outcomes)
+            rhs_elements = list(set(rhs_elements)) # clear duplicates
+
+            right_hand_side = LTL.disj(rhs_elements)
+
+            implication = LTL.implication(left_hand_side, right_hand_side)
+
+            formulas.append(implication)
+
+        return formulas
+
+    def _gen_topology_outcome_formulas_of(self, pi):
+        """Equivalent of Equation (4) for the outcomes of pi"""
+
+        formulas = list()
+
+        pi_a = self._get_act(pi)
+        pi_outcomes = self.outcome_props[pi]
+
+        not_pi_a = LTL.neg(pi_a)
+
+        for pi_out in pi_outcomes:
+            
+            not_pi_out = LTL.neg(pi_out)
+            left_hand_side = LTL.conj([not_pi_out, not_pi_a])
+            right_hand_side = LTL.next(not_pi_out)
+            
+            formula = LTL.implication(left_hand_side, right_hand_side)
+            formulas.append(formula)
+
+        return formulas
+
+    def _gen_topology_persistence_formulas_of(self, pi, activate_nothing):
+        """The outcomes of pi persist while nothing is being activated."""
+
+        formulas = list()
+
+        for pi_out in self.outcome_props[pi]:
+
+            left_hand_side = LTL.conj([pi_out, activate_nothing])
+            formula = LTL.implication(left_hand_side, LTL.next(pi_out))
+            formulas.append(formula)
+
+        return formulas
+
+    def _gen_ts_fairness_term(self, pi):
+        """Activating pi (and no other TS prop) returns an outcome."""
+
+        phi = self._get_act_phi(pi)
+
+        pi_outcomes = self.outcome_props[pi]
+        next_pi_outs = map(LTL.next, pi_outcomes)
+        out_disjunct = LTL.disj(next_pi_outs)
+
+        return LTL.conj([phi, out_disjunct])
+
+    def _gen_ts_fairness_formula(self, completion_terms):
+        """Some activation returns an outcome, or nothing is activated."""
+
+        # (The change terms, phi & ! next(phi), are currently not used)
+        completion_formula = LTL.disj(completion_terms)
+        activate_nothing = self._get_act_nothing()
+        fairness_formula = LTL.disj([completion_formula,
+                                     activate_nothing])
+
+        return fairness_formula
+
+    def _gen_deactivation_formula(self, pi):
+        """Turn the activation prop of pi off once an outcome is returned."""
+
+        pi_outs = self.outcome_props[pi]
+        next_pi_outs = map(LTL.next, pi_outs)
+        out_disjunct = LTL.disj(next_pi_outs)
+
+        pi_a = self._get_act(pi)
+        next_not_pi_a = LTL.next(LTL.neg(pi_a))
+
+        left_hand_side = LTL.conj([pi_a, out_disjunct])
+
+        return LTL.implication(left_hand_side, next_not_pi_a)
+
+    def _gen_outcome_mutex_formulas_of(self, outcome_props, aux_prefix,
+                                       mutex_encoding = PAIRWISE):
+        """
+        Mutual exclusion between the outcomes of a single prop.
+        Returns the formulas and the auxiliary props (if any).
+        """
+
+        encoding = resolve_mutex_encoding(mutex_encoding, len(outcome_props))
+        if encoding != PAIRWISE:
+            return gen_at_most_one_formulas(outcome_props, encoding,
+                                            aux_prefix, future = True)
+        
+        formulas = list()
+
+        for prop in outcome_props:
+            other_props = [p for p in outcome_props if p != prop]
+            
+            next_neg_props = map(LTL.next, map(LTL.neg, other_props))
+
+            right_hand_side = LTL.conj(next_neg_props)
+            
+            formulas.append(LTL.implication(left_hand_side = LTL.next(prop),
+                                            right_hand_side = right_hand_side))
+
+        return formulas, []
+
+    def _gen_element_props(self):
+        """The activation, outcome, and memory props of each prop pi -> pi."""
+
+        element_props = super(ActivationOutcomesFormula,
+                              self)._gen_element_props()
+
+        for pi, pi_outcomes in self.outcome_props.items():
+            props = [self._get_act(pi), self._get_com(pi), _get_mem_prop(pi)]
+            for prop in props + pi_outcomes:
+                element_props[get_first_atom(prop)] = pi
+
+        return element_props
+
     @staticmethod
     def _convert_ts_to_act_out(ts):
         """Convert the keys to completion props and the values to activation."""
@@ -136,11 +383,22 @@ class ActivationOutcomesFormula(GR1Formula):
 
 
 class OutcomeMutexFormula(ActivationOutcomesFormula):
-    """The outcomes of an action are mutually exclusive."""
+    """
+    The outcomes of an action are mutually exclusive.
+
+    The mutex_encoding is one of MUTEX_ENCODINGS (default: PAIRWISE). The
+    auxiliary props of the other encodings are environment props named
+    after the action (e.g., 'dance_out_b0').
+    """
     
-    def __init__(self, sys_props, outcomes):
+    def __init__(self, sys_props, outcomes, ts = dict(), encoding = ONE_HOT,
+                 mutex_encoding = PAIRWISE):
         super(OutcomeMutexFormula, self).__init__(sys_props = sys_props,
-                                                  outcomes = outcomes)
+                                                  outcomes = outcomes,
+                                                  ts = ts,
+                                                  encoding = encoding)
+
+        self.mutex_encoding = mutex_encoding
 
         if len(outcomes) == 1:
             print('No need for OutcomeMutex for: ' +
@@ -160,24 +418,18 @@ class OutcomeMutexFormula(ActivationOutcomesFormula):
 
             # Use the method of the parent's parent class (GR1Formula)
             pi_outs = self.outcome_props[pi]
-            formulas = self._gen_single_mutex_formulas(pi_outs)
+            formulas = self._gen_single_mutex_formulas(pi_outs, pi + '_out')
             mutex_formulas.extend(formulas)
 
         return mutex_formulas
 
-    def _gen_single_mutex_formulas(self, outcome_props):
-        
-        formulas = list()
+    def _gen_single_mutex_formulas(self, outcome_props, aux_prefix):
 
-        for prop in outcome_props:
-            other_props = [p for p in outcome_props if p != prop]
-            
-            next_neg_props = map(LTL.next, map(LTL.neg, other_props))
-
-            right_hand_side = LTL.conj(next_neg_props)
-            
-            formulas.append(LTL.implication(left_hand_side = LTL.next(prop),
-                                            right_hand_side = right_hand_side))
+        formulas, aux_props = self._gen_outcome_mutex_formulas_of(
+                                                        outcome_props,
+                                                        aux_prefix,
+                                                        self.mutex_encoding)
+        self.env_props = self.env_props + aux_props
 
         return formulas
 
@@ -266,9 +518,12 @@ class PropositionDeactivationFormula(ActivationOutcomesFormula):
     Turn action proposition OFF once an outcome is returned.
     """
     
-    def __init__(self, sys_props, outcomes = ['completed']):
+    def __init__(self, sys_props, outcomes = ['completed'], ts = dict(),
+                 encoding = ONE_HOT):
         super(PropositionDeactivationFormula, self).__init__(sys_props = sys_props,
-                                                             outcomes = outcomes)
+                                                             outcomes = outcomes,
+                                                             ts = ts,
+                                                             encoding = encoding)
 
         self.formulas = self._gen_proposition_deactivation_formulas()
         self.type = 'sys_trans'
@@ -282,17 +537,7 @@ class PropositionDeactivationFormula(ActivationOutcomesFormula):
         deactivation_formulas = list()
 
         for pi in self.outcome_props.keys():
-
-            pi_outs = self.outcome_props[pi]
-            next_pi_outs = map(LTL.next, pi_outs)
-            out_disjunct = LTL.disj(next_pi_outs)
-
-            pi_a = _get_act_prop(pi)
-            next_not_pi_a = LTL.next(LTL.neg(pi_a))
-
-            left_hand_side = LTL.conj([pi_a, out_disjunct])
-
-            formula = LTL.implication(left_hand_side, next_not_pi_a)
+            formula = self._gen_deactivation_formula(pi)
             deactivation_formulas.append(formula)
 
         return deactivation_formulas
@@ -363,10 +608,18 @@ class PreconditionsFormula(GR1Formula):
         super(PreconditionsFormula, self).__init__(env_props = pc_props,
                                                    sys_props = [action_prop])
 
+        self.action = action
         self.formulas = [self.gen_precondition_formula(action_prop,
                                                        pc_props)]
         self.type = 'sys_trans'
 
+    def _gen_element_props(self):
+        """The formula is generated for the action (not its preconditions)."""
+
+        props = list(self.sys_props)
+        props.extend(self.env_props)
+        return dict.fromkeys(props, self.action)
+
 # =============================================================================
 # Topology-specific formulas (i.e., those based on a transition system encoding)
 # =============================================================================
@@ -379,9 +632,10 @@ class TransitionRelationFormula(ActivationOutcomesFormula):
     The transition system TS, is provided in the form of a dictionary.
     """
     
-    def __init__(self, ts):
+    def __init__(self, ts, encoding = ONE_HOT):
         super(TransitionRelationFormula, self).__init__(sys_props = [],
-                                                        ts = ts)
+                                                        ts = ts,
+                                                        encoding = encoding)
 
         self.formulas = self._gen_system_transition_relation_formulas(ts)
         self.type = 'sys_trans'
@@ -392,25 +646,13 @@ class TransitionRelationFormula(ActivationOutcomesFormula):
         option to not activate any proposition in the next time step.
         """
 
-        activate_nothing = _get_act_nothing(ts.keys())
+        activate_nothing = self._get_act_nothing()
 
         sys_trans_formulas = list()
         for prop in ts.keys():
-            left_hand_side = LTL.next(_get_com_prop(prop))
-            right_hand_side = list()
-            
-            for adj_prop in ts[prop]:
-                adj_prop_a = _get_act_prop(adj_prop)
-                adj_phi_prop = self._gen_phi_prop(adj_prop_a)
-                disjunct = LTL.next(adj_phi_prop)
-                right_hand_side.append(disjunct)
-
-            activate_nothing_disjunct = LTL.next(activate_nothing)
-            right_hand_side.append(activate_nothing_disjunct)
-            
-            right_hand_side = LTL.disj(right_hand_side)
-            sys_trans_formulas.append(LTL.implication(left_hand_side,
-                                                      right_hand_side))
+            formula = self._gen_transition_formula(prop, ts[prop],
+                                                   activate_nothing)
+            sys_trans_formulas.append(formula)
 
         return sys_trans_formulas
 
@@ -421,15 +663,25 @@ class TopologyMutexFormula(ActivationOutcomesFormula):
     mutual exclusion between the topology propositions; Eq. (1)
 
     The transition system TS, is provided in the form of a dictionary.
+    For large TSs, a linear-size mutex_encoding (see MUTEX_ENCODINGS)
+    avoids the quadratic size of the (default) pairwise formulas.
     """
     
-    def __init__(self, ts):
+    def __init__(self, ts, encoding = ONE_HOT, mutex_encoding = PAIRWISE):
         super(TopologyMutexFormula, self).__init__(sys_props = [],
                                                    outcomes = ['completed'],
-                                                   ts = ts)
+                                                   ts = ts,
+                                                   encoding = encoding)
         
-        # Delegate to the parent's parent class (GR1Formula) method
-        self.formulas = self.gen_mutex_formulas(self.env_props, future = True)
+        if not self.encoded_props:
+            # Delegate to the parent's parent class (GR1Formula) method
+            # (auxiliary props, if any, are environment props as well)
+            self.formulas = self.gen_mutex_formulas(self.env_props,
+                                                    future = True,
+                                                    encoding = mutex_encoding,
+                                                    aux_props = 'env_props')
+        # else: the values of an integer variable are mutually exclusive
+
         self.type = 'env_trans'
 
 
@@ -444,10 +696,11 @@ class SingleStepChangeFormula(ActivationOutcomesFormula):
     (e.g. failed to transition to the next region).
     """
 
-    def __init__(self, ts, outcomes = ['completed']):
+    def __init__(self, ts, outcomes = ['completed'], encoding = ONE_HOT):
         super(SingleStepChangeFormula, self).__init__(sys_props = [],
                                                       outcomes = outcomes,
-                                                      ts = ts)
+                                                      ts = ts,
+                                                      encoding = encoding)
         
         self.formulas = self._gen_single_step_change_formulas(ts)
         self.type = 'env_trans'
@@ -458,28 +711,8 @@ class SingleStepChangeFormula(ActivationOutcomesFormula):
         all_formulas = list()
 
         for pi in ts.keys():
-            
-            pi_c = _get_com_prop(pi)
-            next_pi_c = LTL.next(pi_c)
-            
-            for pi_prime in ts[pi]:
-                
-                pi_prime_a = _get_act_prop(pi_prime)
-                phi = self._gen_phi_prop(pi_prime_a)
-
-                left_hand_side = LTL.conj([pi_c, phi])
-
-                act_outcomes = map(LTL.next, self.outcome_props[pi_prime])
-                
-                rhs_elements = [next_pi_c] # reinitialize list for new pi_prime
-                rhs_elements.extend(act_outcomes)
-                rhs_elements = list(set(rhs_elements)) # clear duplicates
-
-                right_hand_side = LTL.disj(rhs_elements)
-
-                implication = LTL.implication(left_hand_side, right_hand_side)
-
-                all_formulas.append(implication)
+            formulas = self._gen_single_step_change_formulas_of(pi, ts[pi])
+            all_formulas.extend(formulas)
 
         return all_formulas
 
@@ -487,11 +720,12 @@ class SingleStepChangeFormula(ActivationOutcomesFormula):
 class TopologyOutcomeConstraintFormula(ActivationOutcomesFormula):
     """Safety formulas that constrain the outcomes of topology transitions."""
 
-    def __init__(self, ts, outcomes = ['completed']):
+    def __init__(self, ts, outcomes = ['completed'], encoding = ONE_HOT):
         super(TopologyOutcomeConstraintFormula, self).__init__(
                                                         sys_props = [],
                                                         outcomes = outcomes,
-                                                        ts = ts)
+                                                        ts = ts,
+                                                        encoding = encoding)
         
         self.formulas = self._gen_topology_outcomes_formulas(ts)
         self.type = 'env_trans'
@@ -502,21 +736,8 @@ class TopologyOutcomeConstraintFormula(ActivationOutcomesFormula):
         eq4_formulas = list()
 
         for pi in ts.keys():
-
-            pi_a = _get_act_prop(pi)
-            pi_outcomes = self.outcome_props[pi]
-
-            # Generate Eq. (4)
-            not_pi_a = LTL.neg(pi_a)
-
-            for pi_out in pi_outcomes:
-                
-                not_pi_out = LTL.neg(pi_out)
-                left_hand_side = LTL.conj([not_pi_out, not_pi_a])
-                right_hand_side = LTL.next(not_pi_out)
-                
-                formula = LTL.implication(left_hand_side, right_hand_side)
-                eq4_formulas.append(formula)
+            formulas = self._gen_topology_outcome_formulas_of(pi)
+            eq4_formulas.extend(formulas)
 
         return eq4_formulas
 
@@ -527,10 +748,11 @@ class TopologyOutcomePersistenceFormula(ActivationOutcomesFormula):
     while no topology transitions are being activated.
     """
 
-    def __init__(self, ts, outcomes = ['completed']):
+    def __init__(self, ts, outcomes = ['completed'], encoding = ONE_HOT):
         super(TopologyOutcomePersistenceFormula, self).__init__(sys_props = [],
                                                                 outcomes = outcomes,
-                                                                ts = ts)
+                                                                ts = ts,
+                                                                encoding = encoding)
         
         self.formulas = self._gen_topo_outcome_persistence_formulas(ts)
         self.type = 'env_trans'
@@ -542,17 +764,12 @@ class TopologyOutcomePersistenceFormula(ActivationOutcomesFormula):
 
         persistence_formulas = list()
 
-        activate_nothing = _get_act_nothing(ts.keys())
+        activate_nothing = self._get_act_nothing()
 
         for pi in ts.keys():
-            
-            pi_outcomes = self.outcome_props[pi]
-
-            for pi_out in pi_outcomes:
-
-                left_hand_side = LTL.conj([pi_out, activate_nothing])
-                formula = LTL.implication(left_hand_side, LTL.next(pi_out))
-                persistence_formulas.append(formula)
+            formulas = self._gen_topology_persistence_formulas_of(
+                                                        pi, activate_nothing)
+            persistence_formulas.extend(formulas)
 
         return persistence_formulas
 
@@ -564,11 +781,12 @@ class TopologyFairnessConditionsFormula(ActivationOutcomesFormula):
     The possible outcomes are all adjacent states in the transition system.
     """
 
-    def __init__(self, ts, outcomes = ['completed']):
+    def __init__(self, ts, outcomes = ['completed'], encoding = ONE_HOT):
         super(TopologyFairnessConditionsFormula, self).__init__(
                                         sys_props = [],
                                         outcomes = outcomes,
-                                        ts = ts)
+                                        ts = ts,
+                                        encoding = encoding)
         
         self.formulas = self._gen_ts_fairness_formulas(ts)
         self.type = 'env_liveness'
@@ -577,33 +795,214 @@ class TopologyFairnessConditionsFormula(ActivationOutcomesFormula):
         """Fairness conditions (for regions) from Section V-B (4)"""
         
         completion_terms = list()
-        change_terms = list()
 
         for pi in ts.keys():
+            completion_term = self._gen_ts_fairness_term(pi)
+            completion_terms.append(completion_term)
 
-            pi_a = _get_act_prop(pi)
-            phi = self._gen_phi_prop(pi_a)
+        return [self._gen_ts_fairness_formula(completion_terms)]
 
-            not_next_phi = LTL.neg(LTL.next(phi))
 
-            pi_outcomes = self.outcome_props[pi]
-            next_pi_outs = map(LTL.next, pi_outcomes)
-            out_disjunct = LTL.disj(next_pi_outs)
+class TopologyFormulaGenerator(ActivationOutcomesFormula):
+    """
+    Generate all of the topology formulas of a TS in a single traversal.
+
+    The input is checked, and the outcome props and activation-outcomes TS
+    are built, only once (instead of once per formula class). The formula
+    families are GR1Formula objects with the same props, type, and formulas
+    as those of (in this order): TransitionRelationFormula,
+    TopologyMutexFormula, SingleStepChangeFormula,
+    TopologyOutcomePersistenceFormula, TopologyFairnessConditionsFormula,
+    TopologyOutcomeConstraintFormula, OutcomeMutexFormula, and
+    PropositionDeactivationFormula.
+
+    The formulas can also be generated per TS state (gen_state_formulas) and
+    for the TS as a whole (gen_shared_formulas), e.g., to only regenerate the
+    formulas of a state whose transitions have changed. Then, gen_families
+    should be False.
 
-            completion_term = LTL.conj([phi, out_disjunct])
-            completion_terms.append(completion_term)
-            
-            change_term = LTL.conj([phi, not_next_phi])
-            change_terms.append(change_term)
+    Attributes:
+      families  (list of GR1Formula)    The formula families (see above)
+    """
 
-        completion_formula = LTL.disj(completion_terms)
-        change_formula = LTL.disj(change_terms)
-        activate_nothing = _get_act_nothing(ts.keys())
-        fairness_formula = LTL.disj([completion_formula,
-                                     # change_formula,
-                                     activate_nothing])
+    def __init__(self, ts, outcomes = ['completed'], encoding = ONE_HOT,
+                 mutex_encoding = PAIRWISE, gen_families = True):
+        super(TopologyFormulaGenerator, self).__init__(sys_props = [],
+                                                       outcomes = outcomes,
+                                                       ts = ts,
+                                                       encoding = encoding)
+
+        self.mutex_encoding = mutex_encoding
+        self.families = list()
+        if gen_families:
+            self.families = self._gen_topology_formula_families(ts)
+
+    def gen_state_formulas(self, pi, adj_props):
+        """
+        The formulas that only depend on the transitions out of pi, by type.
+        The auxiliary props of the outcome mutex (if any) are in 'env_props'.
+        """
+
+        activate_nothing = self._get_act_nothing()
+
+        sys_trans = [self._gen_transition_formula(pi, adj_props,
+                                                  activate_nothing),
+                     self._gen_deactivation_formula(pi)]
 
-        return [fairness_formula]
+        env_trans = list()
+        env_trans.extend(self._gen_single_step_change_formulas_of(pi, adj_props))
+        env_trans.extend(self._gen_topology_persistence_formulas_of(
+                                                        pi, activate_nothing))
+        env_trans.extend(self._gen_topology_outcome_formulas_of(pi))
+
+        aux_props = list()
+        if len(self.outcomes) > 1:
+            formulas, aux_props = self._gen_outcome_mutex_formulas_of(
+                                                        self.outcome_props[pi],
+                                                        pi + '_out',
+                                                        self.mutex_encoding)
+            env_trans.extend(formulas)
+
+        return {'sys_trans': sys_trans, 'env_trans': env_trans,
+                'env_props': aux_props}
+
+    def gen_shared_formulas(self):
+        """
+        The formulas that depend on the TS states (but not on the transitions)
+        and the props of the TS, by type.
+        """
+
+        pi_order = self.outcome_props.keys()
+
+        completion_terms = map(self._gen_ts_fairness_term, pi_order)
+        fairness = self._gen_ts_fairness_formula(completion_terms)
+
+        com_props = self._get_completion_env_props(pi_order)
+        topology_mutex = self._gen_topology_mutex_family(com_props)
+
+        return {'env_trans': topology_mutex.formulas,
+                'env_liveness': [fairness],
+                'env_props': list(self.env_props + topology_mutex.env_props),
+                'sys_props': list(self.sys_props)}
+
+    def _gen_topology_formula_families(self, ts):
+
+        trans_relation = list()
+        single_step = list()
+        persistence = list()
+        completion_terms = list()
+        constraints = list()
+        outcome_mutex = dict()
+        deactivation = dict()
+
+        activate_nothing = self._get_act_nothing()
+        multiple_outcomes = len(self.outcomes) > 1
+
+        for pi in ts.keys():
+            adj_props = ts[pi]
+
+            trans_relation.append(self._gen_transition_formula(
+                                            pi, adj_props, activate_nothing))
+            single_step.extend(self._gen_single_step_change_formulas_of(
+                                            pi, adj_props))
+            persistence.extend(self._gen_topology_persistence_formulas_of(
+                                            pi, activate_nothing))
+            completion_terms.append(self._gen_ts_fairness_term(pi))
+            constraints.extend(self._gen_topology_outcome_formulas_of(pi))
+
+            if multiple_outcomes:
+                outcome_mutex[pi] = self._gen_outcome_mutex_formulas_of(
+                                            self.outcome_props[pi],
+                                            pi + '_out',
+                                            self.mutex_encoding)
+
+            deactivation[pi] = self._gen_deactivation_formula(pi)
+
+        # The outcome formulas are ordered like the outcome props
+        pi_order = self.outcome_props.keys()
+
+        outcome_mutex_formulas = list()
+        outcome_mutex_aux_props = list()
+
+        if multiple_outcomes:
+            for pi in pi_order:
+                formulas, aux_props = outcome_mutex[pi]
+                outcome_mutex_formulas.extend(formulas)
+                outcome_mutex_aux_props.extend(aux_props)
+        else:
+            print('No need for OutcomeMutex for: ' +
+                  '{0} Only one outcome found: {1}'
+                  .format([], self.outcomes))
+
+        deactivation = [deactivation[pi] for pi in pi_order]
+
+        fairness = [self._gen_ts_fairness_formula(completion_terms)]
+
+        # Both only use the completion outcome (see their classes)
+        com_props = self._get_completion_env_props(pi_order)
+        topology_mutex = self._gen_topology_mutex_family(com_props)
+
+        return [self._gen_family(TransitionRelationFormula, trans_relation,
+                                 'sys_trans', com_props),
+                topology_mutex,
+                self._gen_family(SingleStepChangeFormula, single_step,
+                                 'env_trans'),
+                self._gen_family(TopologyOutcomePersistenceFormula,
+                                 persistence, 'env_trans'),
+                self._gen_family(TopologyFairnessConditionsFormula, fairness,
+                                 'env_liveness'),
+                self._gen_family(TopologyOutcomeConstraintFormula,
+                                 constraints, 'env_trans'),
+                self._gen_family(OutcomeMutexFormula, outcome_mutex_formulas,
+                                 'env_trans',
+                                 self.env_props + outcome_mutex_aux_props),
+                self._gen_family(PropositionDeactivationFormula, deactivation,
+                                 'sys_trans')]
+
+    def _get_completion_env_props(self, pi_order):
+        """The env props for the outcomes = ['completed'] (default)"""
+
+        if self.encoded_props:
+            com_var = _get_com_prop(TS_VARIABLE)
+            return [_get_int_declaration(com_var, self.encoded_props[com_var])]
+        return map(_get_com_prop, pi_order)
+
+    def _gen_topology_mutex_family(self, com_props):
+        """Same as TopologyMutexFormula"""
+
+        family = self._gen_family(TopologyMutexFormula, list(), 'env_trans',
+                                  com_props)
+
+        if not self.encoded_props:
+            family.formulas = family.gen_mutex_formulas(
+                                            com_props,
+                                            future = True,
+                                            encoding = self.mutex_encoding,
+                                            aux_props = 'env_props')
+        return family
+
+    def _gen_family(self, formula_class, formulas, formula_type,
+                    env_props = None):
+        """
+        A GR1Formula with the props of the TS (by default), whose formulas
+        originate from (the equivalent of) formula_class.
+        """
+
+        if env_props is None:
+            env_props = self.env_props
+
+        if self.element_props is None:
+            self.element_props = self._gen_element_props()
+
+        family = GR1Formula(env_props = list(env_props),
+                            sys_props = list(self.sys_props))
+        family.formulas = formulas
+        family.type = formula_type
+        family.encoded_props = dict(self.encoded_props)
+        family.origin = formula_class.__name__
+        family.element_props = self.element_props
+
+        return family
 
 
 # =============================================================================
@@ -753,57 +1152,181 @@ class RetryAfterFailureFormula(ActivationOutcomesFormula):
 # =============================================================================
 
 class SystemInitialConditions(GR1Formula):
-    """..."""
+    """
+    Arguments:
+      encoded_props (dict)  Integer variables (declared in the sys_props)
+                            and the props encoded by each of their values.
+    """
     
-    def __init__(self, sys_props, true_props):
+    def __init__(self, sys_props, true_props, encoded_props = dict()):
         super(SystemInitialConditions, self).__init__(sys_props = sys_props)
         
-        self.formulas = self._gen_sys_init_from_true_props(sys_props,true_props)    
+        self.formulas = self._gen_sys_init_from_true_props(sys_props,true_props)
+        self.formulas.extend(_gen_int_init_from_true_props(
+                                    sys_props, map(_get_act_prop, true_props),
+                                    encoded_props))
         
         self.type = 'sys_init'
 
     def _gen_sys_init_from_true_props(self, sys_props, true_props):
         
-        sys_init_props = list()
+        true_act_props = set(map(_get_act_prop, true_props))
 
-        for pi_a in sys_props:
-
-            if pi_a in map(_get_act_prop, true_props):
-                sys_init_props.append(pi_a)
-            else:
-                not_pi_a = LTL.neg(pi_a)
-                sys_init_props.append(not_pi_a)
-
-        return sys_init_props
+        return _gen_init_from_true_props(_get_init_literals(sys_props),
+                                         true_act_props)
 
 class EnvironmentInitialConditions(GR1Formula):
-    """..."""
+    """
+    Arguments:
+      encoded_props (dict)  Integer variables (declared in the env_props)
+                            and the props encoded by each of their values.
+    """
 
-    def __init__(self, env_props, true_props):
+    def __init__(self, env_props, true_props, encoded_props = dict()):
         super(EnvironmentInitialConditions, self).__init__(env_props=env_props)
         
-        self.formulas = self._gen_env_init_from_true_props(env_props,true_props) 
+        self.formulas = self._gen_env_init_from_true_props(env_props,true_props)
+        self.formulas.extend(_gen_int_init_from_true_props(
+                                    env_props, map(_get_com_prop, true_props),
+                                    encoded_props))
         
         self.type = 'env_init'
 
     def _gen_env_init_from_true_props(self, env_props, true_props):
         
-        env_init_props = list()
+        true_com_props = set(map(_get_com_prop, true_props))
 
-        for pi_out in env_props:
+        return _gen_init_from_true_props(_get_init_literals(env_props),
+                                         true_com_props)
 
-            if pi_out in map(_get_com_prop, true_props):
-                env_init_props.append(pi_out)
-            else:
-                not_pi_out = LTL.neg(pi_out)
-                env_init_props.append(not_pi_out)
+def gen_initial_conditions(sys_props, env_props, true_props_batch,
+                           encoded_props = dict()):
+    """
+    The formulas of SystemInitialConditions and EnvironmentInitialConditions
+    for each set of true props in a batch (e.g., many variants of a mission).
+    The props are only analyzed once per batch.
+
+    Returns:
+      initial_conditions (list of tuple)    A (sys_init, env_init) pair of
+                                            lists of formulas per set of props
+    """
 
-        return env_init_props
+    sys_literals = _get_init_literals(sys_props)
+    env_literals = _get_init_literals(env_props)
+    sys_int_vars = _get_int_init_variables(sys_props, encoded_props)
+    env_int_vars = _get_int_init_variables(env_props, encoded_props)
+
+    initial_conditions = list()
+
+    for true_props in true_props_batch:
+        true_act_props = map(_get_act_prop, true_props)
+        true_com_props = map(_get_com_prop, true_props)
+
+        sys_init = _gen_init_from_true_props(sys_literals, set(true_act_props))
+        sys_init.extend(_gen_int_init(sys_int_vars, true_act_props))
+
+        env_init = _gen_init_from_true_props(env_literals, set(true_com_props))
+        env_init.extend(_gen_int_init(env_int_vars, true_com_props))
+
+        initial_conditions.append((sys_init, env_init))
+
+    return initial_conditions
+
+def _get_init_literals(props):
+    """
+    The (non-integer) props and their negations. (Integer variables are
+    initialized by _gen_int_init_from_true_props.)
+    """
+    return [(pi, LTL.neg(pi)) for pi in props if not _get_int_variable(pi)]
+
+def _gen_init_from_true_props(literals, true_props):
+    """Each prop if it is in the set of true props, its negation otherwise."""
+    return [pi if pi in true_props else not_pi for pi, not_pi in literals]
+
+def _gen_int_init_from_true_props(props, true_props, encoded_props):
+    """
+    Initial value of each integer variable (declared in props): the value
+    that encodes a true prop or, if there is none, the value encoding None.
+    The variable is not constrained if neither exists.
+    """
+
+    return _gen_int_init(_get_int_init_variables(props, encoded_props),
+                         true_props)
+
+def _get_int_init_variables(props, encoded_props):
+    """
+    The integer variables declared in props, each with the value of each
+    encoded prop and the value encoding None (if any).
+    """
+
+    int_vars = list()
+
+    for prop in props:
+
+        var = _get_int_variable(prop)
+        if not var:
+            continue
+
+        values = encoded_props[var]
+        value_of = dict((pi, i) for i, pi in enumerate(values)
+                        if pi is not None)
+        none_value = values.index(None) if None in values else None
+
+        int_vars.append((var, value_of, none_value))
+
+    return int_vars
+
+def _gen_int_init(int_vars, true_props):
+
+    int_init = list()
+
+    for var, value_of, none_value in int_vars:
+
+        true_values = [value_of[pi] for pi in true_props if pi in value_of]
+
+        if true_values:
+            int_init.append(LTL.eq(var, true_values[0]))
+        elif none_value is not None:
+            int_init.append(LTL.eq(var, none_value))
+
+    return int_init
 
 # =============================================================================
 # Module-level helper functions
 # =============================================================================
 
+def _gen_integer_encoding(ts_props):
+    """
+    Map the activation (completion) props of the TS states to the values of
+    an integer variable. The activation variable has an extra value, which
+    stands for not activating any of the TS states.
+    """
+
+    ts_props = sorted(ts_props)
+
+    act_var, com_var = _get_act_prop(TS_VARIABLE), _get_com_prop(TS_VARIABLE)
+
+    return {act_var: map(_get_act_prop, ts_props) + [None],
+            com_var: map(_get_com_prop, ts_props)}
+
+def _get_int_literals(encoded_props):
+    """Map each encoded prop to the corresponding integer comparison."""
+
+    int_literals = dict()
+    for var, values in encoded_props.items():
+        for value, prop in enumerate(values):
+            if prop is not None:
+                int_literals[prop] = LTL.eq(var, value)
+    return int_literals
+
+def _get_int_declaration(var, values):
+    """Declaration of an integer variable in .structuredslugs, e.g. x:0...3"""
+    return '{0}:0...{1}'.format(var, len(values) - 1)
+
+def _get_int_variable(prop):
+    """The name of a declared integer variable (None for a proposition)."""
+    return prop.split(':')[0] if ':' in prop else None
+
 def _get_act_nothing(props):
     """Conjunction stands for not activating any of the activation props."""
     return LTL.conj(map(LTL.neg, map(_get_act_prop, props)))
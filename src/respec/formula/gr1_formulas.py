@@ -1,6 +1,9 @@
 #!/usr/bin/env python
 
 from ..ltl import ltl as LTL
+from ..ltl.registry import PropositionRegistry
+from ..ltl.syntax_tree import get_first_atom
+from mutex_encodings import *
 
 """
 Formulas for the GR(1) fragment of Linear Temporal Logic
@@ -30,6 +33,9 @@ class GR1Formula(object):
 	  type		(str)			GR(1) subformula type (sys_init, env_init,
 	  							sys_trans, env_trans, sys_liveness,
 	  							env_liveness)
+	  encoded_props (dict)		Integer variables (if any) and the props
+	  							that are encoded by each of their values.
+	  origin	(str)			What generated the formulas (see get_origins)
 
 	Raises:
 	  ValueError:				When a proposition is neither a system nor
@@ -37,10 +43,14 @@ class GR1Formula(object):
 
 	"""
 	
+	# Whether \phi_r propositions are memoized (see _gen_phi_prop)
+	cache_phi_props = True
+	
 	def __init__(self, env_props = [], sys_props = [], ts = {}):
 		#FIX: TS should be an argument of a subclass, not base class
-		self.sys_props = sys_props
-		self.env_props = env_props
+		# (The props are copied into ordered sets, see PropositionRegistry)
+		self.sys_props = PropositionRegistry(sys_props)
+		self.env_props = PropositionRegistry(env_props)
 		self.ts = ts
 
 		self._add_props_from_ts()
@@ -49,6 +59,9 @@ class GR1Formula(object):
 		# classes (subformulas) that inherit from GR1Formula
 		self.formulas = list()
 		self.type = str()
+		self.encoded_props = dict()
+		self.origin = self.__class__.__name__
+		self.element_props = None # Atom -> input element (see get_origins)
 		#TODO: Make formulas a property. Setter would work with
 		# either a single formula or a list of formulas.
 
@@ -63,20 +76,10 @@ class GR1Formula(object):
 		system initial conditions formula. Set all the others to False.
 		"""
 		
-		sys_init = list()
-
 		props_of_type = getattr(self, props)
 
-		for prop in props_of_type:
-			if prop in prop_assignment.keys():
-				if prop_assignment[prop] is True:
-					sys_init.append(prop)
-				else:
-					sys_init.append(LTL.neg(prop))
-			else:
-				sys_init.append(LTL.neg(prop))
-		
-		return sys_init
+		return [prop if prop_assignment.get(prop) is True else LTL.neg(prop)
+				for prop in props_of_type]
 
 	def gen_env_init_from_prop_assignment(self, prop_assignment, props = "env_props"):
 		"""
@@ -84,20 +87,10 @@ class GR1Formula(object):
 		environment initial conditions formula. Set all the others to False.
 		"""
 		
-		env_init = list()
-
 		props_of_type = getattr(self, props)
 
-		for prop in props_of_type:
-			if prop in prop_assignment.keys():
-				if prop_assignment[prop]:
-					env_init.append(prop)
-				else:
-					env_init.append(LTL.neg(prop))
-			else:
-				env_init.append(LTL.neg(prop))
-		
-		return env_init
+		return [prop if prop_assignment.get(prop) else LTL.neg(prop)
+				for prop in props_of_type]
 
 	# =====================================================
 	# System transition formulas (e.g., workspace topology)
@@ -130,15 +123,28 @@ class GR1Formula(object):
 	# Various formulas
 	# =====================================================
 
-	def gen_mutex_formulas(self, mutex_props, future):
+	def gen_mutex_formulas(self, mutex_props, future, encoding = PAIRWISE,
+						   aux_prefix = None, aux_props = "sys_props"):
 		""" 
 		Create a set of formulas that enforce mutual exclusion
 		between the given propositions, see Eq. (1).
 
 		The argument 'future' dictates whether the propositions will be
 		primed (T) or not (F). Should be set to True in fast-slow formulas.
+
+		The encoding is one of MUTEX_ENCODINGS (see mutex_encodings.py).
+		Besides PAIRWISE, they require auxiliary propositions, whose names
+		start with aux_prefix (default: the first prop + '_mutex') and which
+		are added to the list of props named by aux_props.
 		"""
 
+		encoding = resolve_mutex_encoding(encoding, len(mutex_props))
+
+		if encoding != PAIRWISE and mutex_props:
+			return self._gen_encoded_mutex_formulas(mutex_props, future,
+													encoding, aux_prefix,
+													aux_props)
+
 		mutex_formulas = list()
 
 		for prop in mutex_props:
@@ -158,6 +164,28 @@ class GR1Formula(object):
 
 		return mutex_formulas
 
+	def _gen_encoded_mutex_formulas(self, mutex_props, future, encoding,
+									aux_prefix, aux_props):
+		"""Exactly one of the props: at least one and at most one of them."""
+
+		if aux_prefix is None:
+			aux_prefix = mutex_props[0] + '_mutex'
+
+		formulas, new_aux_props = gen_at_most_one_formulas(mutex_props,
+														   encoding,
+														   aux_prefix,
+														   future)
+
+		literals = map(LTL.next, mutex_props) if future else mutex_props
+		formulas.insert(0, LTL.disj(literals))
+
+		# Don't extend in place, the list may be shared (e.g., default args)
+		props_of_type = getattr(self, aux_props)
+		setattr(self, aux_props, props_of_type +
+				[pi for pi in new_aux_props if pi not in props_of_type])
+
+		return formulas
+
 	def gen_precondition_formula(self, action, preconditions):
 		'''Conditions that have to hold for an action (prop) to be allowed.'''
 
@@ -207,6 +235,35 @@ class GR1Formula(object):
 
 		return mem_prop
 
+	# =====================================================
+	# Origin of the formulas
+	# =====================================================
+
+	def get_origins(self):
+		"""
+		The origin of each formula: what generated it (e.g., the class
+		SingleStepChangeFormula) and the input element that it was generated
+		for (e.g., the TS state 'stand'), i.e., the element of the first
+		atom of the formula (None if it is not a prop of an element).
+		"""
+
+		if self.element_props is None:
+			self.element_props = self._gen_element_props()
+
+		formulas = self.formulas
+		if not isinstance(formulas, list):
+			formulas = [formulas]
+
+		return [(self.origin, self.element_props.get(get_first_atom(formula)))
+				for formula in formulas]
+
+	def _gen_element_props(self):
+		"""By default, each prop is an input element of its own."""
+
+		props = list(self.sys_props)
+		props.extend(self.env_props)
+		return dict(zip(props, props))
+
 	# =====================================================
 	# Various helper methods
 	# =====================================================
@@ -214,39 +271,94 @@ class GR1Formula(object):
 	def _add_props_from_ts(self):
 		"""Reads the items in the TS dictionary and adds them to the system propositions, if they are not already there."""
 
-		props_to_add = self.ts.keys()
+		self.sys_props.extend(self.ts.keys())
 		for v in self.ts.values():
-			for prop in v:
-				props_to_add.append(prop)
-
-		self.sys_props = list(set(self.sys_props + props_to_add))
+			self.sys_props.extend(v)
 
 	def _gen_phi_prop(self, prop):
 		"""
 		Generate (non-atomic) proposition of the form \phi_r,
 		i.e., mutex version of \pi_r (where prop = \pi_r)
+
+		Each \phi_r is only built once per formula object and then reused.
 		"""
-		
+
+		if not self.cache_phi_props:
+			return self._build_phi_prop(prop)
+
+		phi_cache = self._get_phi_cache()
+		phi_prop = phi_cache.get(prop)
+		if phi_prop is None:
+			phi_prop = self._build_phi_prop(prop)
+			phi_cache[prop] = phi_prop
+
+		return phi_prop
+
+	def _build_phi_prop(self, prop):
+		"""Build \phi_r, i.e., \pi_r and the negation of all other \pi_r'."""
+
 		props_in_phi = [prop] # Initialize with just pi_r
 
-		other_props = self._get_other_trans_props(prop)
-		for other_prop in other_props:
-			props_in_phi.append(LTL.neg(other_prop)) # All pi_r' are negated
+		props_in_phi.extend(self._get_other_trans_props(prop, negated = True))
 
 		phi_prop = LTL.conj(props_in_phi)
 
 		return phi_prop
 
-	def _get_other_trans_props(self, prop):
+	def _get_other_trans_props(self, prop, negated = False):
 		"""For some proposition \pi_r, get all propositions \pi_r' such that r' =/= r."""
-		
-		if prop in self.sys_props:
-			return [p for p in self.sys_props if p != prop]
-		elif prop in self.env_props:
-			return [p for p in self.env_props if p != prop]
+
+		index = self._get_trans_props_index()
+
+		if prop in index['sys_props']:
+			props = 'sys_props'
+		elif prop in index['env_props']:
+			props = 'env_props'
 		else:
 			raise ValueError("Unknown type for proposition: %s" % prop)
 
+		all_props = index[props]
+		other_props = index['neg_' + props] if negated else getattr(self, props)
+
+		if all_props[prop] is None: # prop appears more than once
+			return [other_props[i] for i, p in enumerate(getattr(self, props))
+					if p != prop]
+		else:
+			i = all_props[prop]
+			return other_props[:i] + other_props[i+1:]
+
+	def _get_trans_props_index(self):
+		"""
+		Index of the system and environment propositions: their positions
+		(for set-based membership and slicing out the complement of a prop)
+		and their negations. It is rebuilt if the propositions have changed.
+		"""
+
+		signature = (_get_props_signature(self.sys_props),
+					 _get_props_signature(self.env_props))
+
+		if getattr(self, '_trans_props_signature', None) != signature:
+			index = dict()
+			for props in ['sys_props', 'env_props']:
+				positions = dict()
+				for i, p in enumerate(getattr(self, props)):
+					positions[p] = None if p in positions else i
+				index[props] = positions
+				index['neg_' + props] = map(LTL.neg, getattr(self, props))
+
+			self._trans_props_index = index
+			self._trans_props_signature = signature
+			self._phi_cache = dict()
+
+		return self._trans_props_index
+
+	def _get_phi_cache(self):
+		"""The \phi_r built so far (invalidated along with the prop index)."""
+
+		self._get_trans_props_index()
+
+		return self._phi_cache
+
 
 class SimpleLivenessRequirementFormula(GR1Formula):
     """
@@ -269,6 +381,17 @@ class SimpleLivenessRequirementFormula(GR1Formula):
         return [liveness_formula]
 
 
+def _get_props_signature(props):
+	"""
+	What tells whether a list of props has changed: a registry (which is kept
+	alive, so that its id is not reused) and its version, or the props.
+	"""
+
+	if isinstance(props, PropositionRegistry):
+		return (props, props.version)
+	return tuple(props)
+
+
 # =========================================================
 # Entry point
 # =========================================================
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+
+from ..ltl import ltl as LTL
+
+"""
+Encodings of the constraint that at most one of a set of propositions is True.
+
+The pairwise encoding needs no auxiliary propositions, but it is quadratic in
+the number of propositions. The other encodings are (almost) linear in size,
+at the cost of auxiliary propositions:
+  * SEQUENTIAL  Sequential counter (ladder), n - 1 auxiliary props
+  * COMMANDER   Commander variables over groups of 3, about n / 2 aux props
+  * BINARY      Each prop implies a distinct binary code, log2(n) aux props
+
+AUTO keeps the pairwise encoding for small sets and uses the binary encoding
+otherwise, because every auxiliary prop is an extra BDD variable in slugs.
+
+Each formula is an implication between literals. A literal is a prop, or
+next(prop) if the encoding is about the next time step (future = True).
+
+"""
+
+PAIRWISE   = 'pairwise'
+SEQUENTIAL = 'sequential'
+COMMANDER  = 'commander'
+BINARY     = 'binary'
+AUTO       = 'auto'
+
+MUTEX_ENCODINGS = [PAIRWISE, SEQUENTIAL, COMMANDER, BINARY, AUTO]
+
+# Largest set of props for which AUTO uses the pairwise encoding
+PAIRWISE_MAX_PROPS = 6
+
+# Size of the groups in the commander encoding
+COMMANDER_GROUP_SIZE = 3
+
+def resolve_mutex_encoding(encoding, num_props):
+    """Check the encoding and resolve AUTO based on the number of props."""
+
+    if encoding not in MUTEX_ENCODINGS:
+        raise ValueError('Unknown mutual exclusion encoding: {}'
+                         .format(encoding))
+
+    if encoding == AUTO:
+        return PAIRWISE if num_props <= PAIRWISE_MAX_PROPS else BINARY
+    return encoding
+
+def gen_at_most_one_formulas(props, encoding, aux_prefix, future = False):
+    """
+    Generate formulas that allow at most one of the props to be True.
+
+    Arguments:
+      props      (list of str)  The mutually exclusive propositions
+      encoding   (str)          One of MUTEX_ENCODINGS
+      aux_prefix (str)          Prefix of the names of the auxiliary props
+      future     (bool)         Whether the props are primed (next) or not
+
+    Returns:
+      formulas   (list)         The formulas (implications)
+      aux_props  (list of str)  The auxiliary propositions that were used
+
+    """
+
+    encoding = resolve_mutex_encoding(encoding, len(props))
+
+    lit = LTL.next if future else lambda prop: prop
+
+    if encoding == PAIRWISE:
+        return _gen_pairwise(props, lit), []
+    elif encoding == SEQUENTIAL:
+        return _gen_sequential(props, lit, aux_prefix)
+    elif encoding == COMMANDER:
+        return _gen_commander(props, lit, aux_prefix)
+    else:
+        return _gen_binary(props, lit, aux_prefix)
+
+def _gen_pairwise(props, lit):
+    """One formula per pair of props: p -> ! q"""
+
+    formulas = list()
+    for i in range(len(props)):
+        for j in range(i + 1, len(props)):
+            formulas.append(LTL.implication(lit(props[i]),
+                                            LTL.neg(lit(props[j]))))
+    return formulas
+
+def _gen_sequential(props, lit, aux_prefix):
+    """
+    Sequential counter (Sinz, 2005). The auxiliary prop s_i is True if
+    any of the first i+1 props is True. 3n - 4 formulas, n - 1 aux props.
+    """
+
+    n = len(props)
+    if n < 2:
+        return [], []
+
+    aux_props = ['{0}_s{1}'.format(aux_prefix, i) for i in range(n - 1)]
+    s = map(lit, aux_props)
+    x = map(lit, props)
+
+    formulas = [LTL.implication(x[0], s[0])]
+    for i in range(1, n - 1):
+        formulas.append(LTL.implication(x[i], s[i]))
+        formulas.append(LTL.implication(s[i-1], s[i]))
+        formulas.append(LTL.implication(x[i], LTL.neg(s[i-1])))
+    formulas.append(LTL.implication(x[n-1], LTL.neg(s[n-2])))
+
+    return formulas, aux_props
+
+def _gen_commander(props, lit, aux_prefix, level = 0):
+    """
+    Commander encoding (Klieber and Kwon, 2007). The props are split in
+    groups, each with a commander prop that is True if a prop in the group
+    is True. At most one prop per group and at most one commander is True
+    (recursively, until there are few enough commanders for pairwise).
+    """
+
+    if len(props) <= COMMANDER_GROUP_SIZE:
+        return _gen_pairwise(props, lit), []
+
+    formulas = list()
+    commanders = list()
+
+    for j in range(0, len(props), COMMANDER_GROUP_SIZE):
+        group = props[j:j + COMMANDER_GROUP_SIZE]
+        commander = '{0}_c{1}_{2}'.format(aux_prefix, level,
+                                          j // COMMANDER_GROUP_SIZE)
+        commanders.append(commander)
+
+        formulas.extend(_gen_pairwise(group, lit))
+        for prop in group:
+            formulas.append(LTL.implication(lit(prop), lit(commander)))
+
+    commander_formulas, aux_props = _gen_commander(commanders, lit,
+                                                   aux_prefix, level + 1)
+    formulas.extend(commander_formulas)
+
+    return formulas, commanders + aux_props
+
+def _gen_binary(props, lit, aux_prefix):
+    """
+    Binary (bitwise) encoding (Frisch et al., 2006). Prop i implies that the
+    auxiliary bits spell i, so no two props can be True at the same time.
+    """
+
+    n = len(props)
+    if n < 2:
+        return [], []
+
+    num_bits = (n - 1).bit_length()
+    aux_props = ['{0}_b{1}'.format(aux_prefix, k) for k in range(num_bits)]
+    bits = map(lit, aux_props)
+    not_bits = map(LTL.neg, bits)
+
+    formulas = list()
+    for i, prop in enumerate(props):
+        code = [bits[k] if (i >> k) & 1 else not_bits[k]
+                for k in range(num_bits)]
+        formulas.append(LTL.implication(lit(prop), LTL.conj(code)))
+
+    return formulas, aux_props
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+
+from .translator import FormulaTranslator
+from .syntax_tree import NEG, CONJ, DISJ, IMPLIES, IFF
+
+"""
+Evaluation of formulas, given the values of their props (and of the next
+values of their props), e.g., to check small formulas by enumeration:
+
+  holds = FormulaEvaluator(['a', 'x:0...3']).compile('a -> next(x = 2)')
+  holds({'a': True, "x'": 2})  # True
+
+A formula is translated (once) to a Python expression over the dictionary
+of values, which is then evaluated for each assignment.
+"""
+
+
+class FormulaEvaluator(FormulaTranslator):
+	"""
+	Translate formulas to Python expressions, to evaluate them.
+
+	Arguments:
+	  props     (list of str)   The env and sys props, including the
+								declarations of integer variables
+
+	"""
+
+	constants = {'TRUE': 'True', 'FALSE': 'False'}
+
+	# (All of them are parenthesized, since 'not' binds less than '==')
+	_operators = {NEG: ('(not ', '', ')'),
+				  CONJ: ('(', ' and ', ')'),
+				  DISJ: ('(', ' or ', ')'),
+				  IMPLIES: ('(not ', ' or ', ')'),
+				  IFF: ('(', ' == ', ')')}
+
+	def compile(self, formula):
+		"""
+		A function that evaluates a formula, given a dictionary of values
+		(name -> value, and name + "'" -> next value).
+		"""
+		return eval('lambda values: ' + self.translate(formula))
+
+	def get_operator(self, op, num_args):
+		return self._operators[op]
+
+	def translate_name(self, name, primed):
+		return 'values[{!r}]'.format(name + "'" if primed else name)
+
+	def translate_comparison(self, variable, value, primed):
+		return '({0} == {1})'.format(self.translate_name(variable.name, primed),
+									 value)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+
+from .translator import FormulaTranslator
+from .parser import parse_declaration
+from .syntax_tree import NEG, CONJ, DISJ, IMPLIES, IFF
+
+"""
+Translation of formulas to the infix syntax of gr1c (which TuLiP also reads),
+where the next operator is written by priming the variables:
+  '(a & ! b) -> next(c)'  becomes  "((a & !b) -> c')"
+(See https://github.com/slivingston/gr1c/blob/master/doc/spc_format.md)
+
+The binary operators are always parenthesized, so the text does not depend on
+the precedence rules of the tool. Integer variables are not blasted into bits
+(unlike in the .slugsin format), since both tools support them, e.g., 'x [0,5]'
+is declared, and 'x = 3' is a comparison.
+"""
+
+
+class Gr1cTranslator(FormulaTranslator):
+	"""
+	Translate formulas (syntax trees or text) to the gr1c syntax.
+
+	Arguments:
+	  props     (list of str)   The env and sys props, including the
+								declarations of integer variables
+
+	"""
+
+	constants = {'TRUE': 'True', 'FALSE': 'False'}
+
+	_separators = {CONJ: ' & ', DISJ: ' | ', IMPLIES: ' -> ', IFF: ' <-> '}
+
+	def translate_prop(self, prop):
+		"""The declaration of a prop, e.g., 'x [0,3]' for 'x:0...3'."""
+
+		name, bounds = parse_declaration(prop)
+		if bounds is None:
+			return name
+		return '{0} [{1},{2}]'.format(name, *bounds)
+
+	def get_operator(self, op, num_args):
+
+		if op == NEG:
+			return '!', '', ''
+		return '(', self._separators[op], ')'
+
+	def translate_comparison(self, variable, value, primed):
+		return '({0}{1} = {2})'.format(variable.name, "'" if primed else '',
+									   value)
@@ -1,38 +1,48 @@
 #!/usr/bin/env python
 
 """
-Boolean operators and the 'next' LTL operator.
+Boolean operators, the 'next' LTL operator, and comparisons of
+(bounded) integer variables with constant values.
 
-The remaining LTL operators are not (currently) needed because 
+The remaining LTL operators are not (currently) needed because
 the specification module is using the .structuredslugs format.
+
+The operators build (interned) syntax tree nodes, see syntax_tree.py.
+Operands can be either strings or nodes. The nodes compare equal to, and
+hash like, the .structuredslugs string that they render to.
 """
-		
+
+from .syntax_tree import FormulaNode, make_node, make_unary_node, render, \
+						 substitute, \
+						 NEG, NEXT, CONJ, DISJ, IMPLIES, IFF, PAREN
+
 def conj(terms):
 	if len(terms) > 1:
-		return paren(" & ".join(terms))
+		return make_node(CONJ, terms)
 	else:
 		return terms[0]
 
 def disj(terms):
 	if len(terms) > 1:
-		return paren(" | ".join(terms))
+		return make_node(DISJ, terms)
 	else:
 		return terms[0]
 
 def neg(term):
-	return "! " + term
+	return make_unary_node(NEG, term)
 
 def next(term):
-	if term[0] == '(' and term[-1] == ')':
-		return 'next' + term
-	else:
-		return 'next' + paren(term)
+	return make_unary_node(NEXT, term)
 
 def implication(left_hand_side, right_hand_side):
-	return left_hand_side + " -> " + right_hand_side
+	return make_node(IMPLIES, [left_hand_side, right_hand_side])
 
 def iff(left_hand_side, right_hand_side):
-	return left_hand_side + " <-> " + right_hand_side
+	return make_node(IFF, [left_hand_side, right_hand_side])
 
 def paren(term):
-	return "(" + term + ")"
+	return make_unary_node(PAREN, term)
+
+def eq(variable, value):
+	"""Integer variable comparison, e.g., '(region = 3)'."""
+	return paren("{0} = {1}".format(variable, value))
@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+
+import re
+
+from .syntax_tree import atom, make_node, make_unary_node, \
+						 ATOM, NEG, NEXT, CONJ, DISJ, IMPLIES, IFF, PAREN
+
+"""
+Parser of formulas (and proposition declarations) in the .structuredslugs
+format, i.e., the text that the syntax trees render to.
+
+The formulas are parsed into (interned) syntax tree nodes, so parsing the text
+of a formula returns a node that renders to the same text (and, therefore, is
+equal to the original formula, see syntax_tree.py):
+
+  parse('(r1_c & r1_a) -> next(! r2_a)')
+
+Operators, from the loosest to the tightest: <-> and -> (right-associative),
+|, &, ! and next(...). Integer comparisons (e.g., 'x = 3') are atoms, as in the
+formulas built by respec.ltl.ltl, and so is TRUE (FALSE). A primed variable
+(e.g., "x'") is parsed as next(x).
+"""
+
+_TOKEN_PATTERN = re.compile(r"\s*(?:(<->|->|[()!&|'=])|"
+							r"([A-Za-z_][A-Za-z0-9_]*)|(\d+)|(\S))")
+
+_NAME_PATTERN = re.compile(r'[A-Za-z_][A-Za-z0-9_]*$')
+
+# A declared integer variable, e.g., 'x:0...3'
+_DECLARATION_PATTERN = re.compile(r'^\s*([A-Za-z_][A-Za-z0-9_]*)\s*:'
+								  r'\s*(-?\d+)\s*\.\.\.\s*(-?\d+)\s*$')
+
+# Token kinds
+_OPERATOR = 'operator'
+_NAME = 'name'
+_NUMBER = 'number'
+
+def parse(text, memo = None):
+	"""
+	Parse the text of a formula into a syntax tree (FormulaNode).
+
+	A memo (dictionary) from the text of parenthesized subformulas to their
+	nodes can be shared by many formulas (e.g., those of a file), so that
+	the subformulas that they have in common are only parsed once.
+	"""
+
+	return _Parser(text, memo).parse()
+
+def parse_declaration(prop):
+	"""
+	The name of a prop and, for a declared integer variable (e.g., 'x:0...3'),
+	its bounds, i.e., ('x', (0, 3)). The bounds of a proposition are None.
+	"""
+
+	match = _DECLARATION_PATTERN.match(prop)
+	if match is None:
+		return prop.strip(), None
+
+	name, min_value, max_value = match.groups()
+	if int(min_value) > int(max_value):
+		raise ValueError('Empty range of integer variable: {}'.format(prop))
+	return name, (int(min_value), int(max_value))
+
+def tokenize(text):
+	"""The (kind, text, offset) tokens of a formula."""
+
+	tokens = list()
+	for match in _TOKEN_PATTERN.finditer(text):
+		operator, name, number, other = match.groups()
+		offset = match.start(match.lastindex)
+		if operator is not None:
+			tokens.append((_OPERATOR, operator, offset))
+		elif name is not None:
+			tokens.append((_NAME, name, offset))
+		elif number is not None:
+			tokens.append((_NUMBER, number, offset))
+		else:
+			raise ValueError('Unexpected character {0!r} in formula: {1}'
+							 .format(other, text))
+	return tokens
+
+
+class _Parser(object):
+	"""Recursive descent over the tokens of a single formula."""
+
+	def __init__(self, text, memo = None):
+		self.text = text
+		self.memo = memo
+
+		tokens = tokenize(text)
+		self.kinds = [kind for kind, _, _ in tokens]
+		self.texts = [token for _, token, _ in tokens] + [None] # (the end)
+		self.offsets = [offset for _, _, offset in tokens]
+		self.position = 0
+
+		# The position of the ')' that closes each '(' (for the memo)
+		self.closing = dict()
+		if memo is not None:
+			opening = list()
+			for position, token in enumerate(self.texts):
+				if token == '(':
+					opening.append(position)
+				elif token == ')' and opening:
+					self.closing[opening.pop()] = position
+
+		# Whether the last parsed formula is a conjunction (disjunction) that
+		# is not enclosed in parentheses yet. Since those are rendered with
+		# their own parentheses, they are not parenthesized again.
+		self._bare = False
+
+	def parse(self):
+
+		if not self.kinds:
+			raise ValueError('Empty formula!')
+
+		formula = self._parse_formula()
+		if self.position < len(self.kinds):
+			self._fail('Unexpected {!r}'.format(self.texts[self.position]))
+		return formula
+
+	def _parse_formula(self):
+
+		lhs = self._parse_binary(DISJ, '|', self._parse_conjunction)
+
+		token = self.texts[self.position]
+		if token == '->' or token == '<->':
+			self.position += 1
+			rhs = self._parse_formula()
+			self._bare = False
+			return make_node(IMPLIES if token == '->' else IFF, [lhs, rhs])
+		return lhs
+
+	def _parse_conjunction(self):
+		return self._parse_binary(CONJ, '&', self._parse_unary)
+
+	def _parse_binary(self, op, symbol, parse_operand):
+
+		operands = [parse_operand()]
+		texts = self.texts
+		while texts[self.position] == symbol:
+			self.position += 1
+			operands.append(parse_operand())
+
+		if len(operands) == 1:
+			return operands[0]
+		self._bare = True
+		return make_node(op, operands)
+
+	def _parse_unary(self):
+
+		token = self.texts[self.position]
+		if token == '!':
+			self.position += 1
+			operand = self._parse_unary()
+			self._bare = False
+			return make_unary_node(NEG, operand)
+
+		if token == '(':
+			return self._parse_group()
+
+		if token == 'next' and self.texts[self.position + 1] == '(':
+			self.position += 1
+			group = self._parse_group()
+			# 'next(a)' is the next of a, but 'next(x = 3)' is the next of
+			# the parenthesized comparison (see respec.ltl.ltl.eq)
+			if group.op == PAREN and group.args[0].op == ATOM and \
+			   _NAME_PATTERN.match(group.args[0].args):
+				group = group.args[0]
+			return make_unary_node(NEXT, group)
+
+		return self._parse_atom()
+
+	def _parse_group(self):
+
+		start = self.position
+		key = None
+		if start in self.closing:
+			end = self.closing[start]
+			key = self.text[self.offsets[start]:self.offsets[end] + 1]
+			if key in self.memo:
+				self.position = end + 1
+				self._bare = False
+				return self.memo[key]
+
+		self._expect('(')
+		formula = self._parse_formula()
+		self._expect(')')
+
+		if self._bare:
+			self._bare = False
+		else:
+			formula = make_unary_node(PAREN, formula)
+
+		if key is not None:
+			self.memo[key] = formula
+		return formula
+
+	def _parse_atom(self):
+
+		kind, name = self._next_token()
+		if kind != _NAME:
+			self._fail('Expected a proposition instead of {!r}'.format(name))
+
+		primed = self.texts[self.position] == "'"
+		if primed:
+			self.position += 1
+
+		if self.texts[self.position] == '=':
+			self.position += 1
+			kind, value = self._next_token()
+			if kind != _NUMBER:
+				self._fail('Expected a number instead of {!r}'.format(value))
+			node = atom('{0} = {1}'.format(name, value))
+		else:
+			node = atom(name)
+
+		self._bare = False
+		return make_unary_node(NEXT, node) if primed else node
+
+	def _next_token(self):
+
+		position = self.position
+		if position >= len(self.kinds):
+			self._fail('Unexpected end')
+		self.position += 1
+		return self.kinds[position], self.texts[position]
+
+	def _expect(self, text):
+
+		kind, token = self._next_token()
+		if kind != _OPERATOR or token != text:
+			self._fail('Expected {0!r} instead of {1!r}'.format(text, token))
+
+	def _fail(self, message):
+		raise ValueError('{0} (token {1}) in formula: {2}'.format(
+						 message, self.position, self.text))
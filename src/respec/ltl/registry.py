@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+
+import copy
+
+from .syntax_tree import canonicalize
+
+"""
+Insertion-ordered sets of propositions and formulas.
+
+The propositions of formulas and specifications are kept in the order in
+which they were first added (e.g., the order of the [INPUT] and [OUTPUT]
+sections of a .structuredslugs file, which is the BDD variable order of
+slugs), without duplicates. Adding and looking up a proposition is O(1).
+
+The formulas of a specification are stored the same way (FormulaStore), so
+that formulas that are shared by merged specifications are only written once.
+
+"""
+
+class PropositionRegistry(list):
+	"""
+	A list of propositions without duplicates (i.e., an ordered set).
+
+	It can be used anywhere a list of props is expected. Adding a prop
+	that is already in the registry (append, extend, insert, +, +=) has
+	no effect. Membership tests are O(1).
+
+	Attributes:
+	  version   (int)   Incremented whenever the props (or their order) change,
+						e.g., to invalidate what was computed from them.
+
+	"""
+
+	def __init__(self, props = ()):
+		super(PropositionRegistry, self).__init__()
+		self._index = set()
+		self.version = 0
+		self.extend(props)
+
+	def _key(self, prop):
+		"""What the duplicates are detected by (the prop itself)."""
+		return prop
+
+	def __contains__(self, prop):
+		return self._key(prop) in self._index
+
+	def __reduce__(self):
+		return (self.__class__, (list(self),))
+
+	def append(self, prop):
+		key = self._key(prop)
+		if key not in self._index:
+			self._index.add(key)
+			list.append(self, prop)
+			self.version += 1
+
+	def extend(self, props):
+		index = self._index
+		new_props = list()
+		for prop in props:
+			key = self._key(prop)
+			if key not in index:
+				index.add(key)
+				new_props.append(prop)
+		if new_props:
+			list.extend(self, new_props)
+			self.version += 1
+
+	def insert(self, position, prop):
+		key = self._key(prop)
+		if key not in self._index:
+			self._index.add(key)
+			list.insert(self, position, prop)
+			self.version += 1
+
+	def remove(self, prop):
+		list.remove(self, prop)
+		self._index.discard(self._key(prop))
+		self.version += 1
+
+	def pop(self, position = -1):
+		prop = list.pop(self, position)
+		self._index.discard(self._key(prop))
+		self.version += 1
+		return prop
+
+	def sort(self, *args, **kwargs):
+		list.sort(self, *args, **kwargs)
+		self.version += 1
+
+	def reverse(self):
+		list.reverse(self)
+		self.version += 1
+
+	def __add__(self, props):
+		registry = copy.copy(self)
+		registry.extend(props)
+		return registry
+
+	def __iadd__(self, props):
+		self.extend(props)
+		return self
+
+	# Any other modification rebuilds the registry (rare, so keep it simple)
+
+	def __setitem__(self, key, value):
+		props = list(self)
+		props[key] = value
+		self._reset(props)
+
+	def __delitem__(self, key):
+		props = list(self)
+		del props[key]
+		self._reset(props)
+
+	def __setslice__(self, i, j, values):
+		self.__setitem__(slice(i, j), values)
+
+	def __delslice__(self, i, j):
+		self.__delitem__(slice(i, j))
+
+	def _reset(self, props):
+		list.__delslice__(self, 0, len(self))
+		self._index = set()
+		self.version += 1
+		PropositionRegistry.extend(self, props)
+
+
+class FormulaStore(PropositionRegistry):
+	"""
+	A list of formulas without duplicates, e.g., a section of a specification.
+
+	Formulas that render to the same text are only stored once. If canonical
+	is True, so are formulas that only differ in the order of the operands of
+	conjunctions, disjunctions, and equivalences (see canonicalize).
+
+	Attributes:
+	  canonical     (bool)  Whether duplicates are detected up to reordering.
+	  duplicates    (int)   The number of formulas that have been dropped.
+
+	"""
+
+	def __init__(self, formulas = (), canonical = False):
+		self.canonical = canonical
+		self.duplicates = 0
+		super(FormulaStore, self).__init__(formulas)
+
+	def _key(self, formula):
+		return canonicalize(formula) if self.canonical else formula
+
+	def __reduce__(self):
+		return (self.__class__, (list(self), self.canonical),
+				{'duplicates': self.duplicates})
+
+	def append(self, formula):
+		length = len(self)
+		super(FormulaStore, self).append(formula)
+		self.duplicates += 1 - (len(self) - length)
+
+	def extend(self, formulas):
+		formulas = list(formulas)
+		length = len(self)
+		super(FormulaStore, self).extend(formulas)
+		self.duplicates += len(formulas) - (len(self) - length)
+
+	def insert(self, position, formula):
+		length = len(self)
+		super(FormulaStore, self).insert(position, formula)
+		self.duplicates += 1 - (len(self) - length)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+
+from . import translator
+from .parser import parse_declaration
+from .syntax_tree import NEG, CONJ, DISJ, IMPLIES, IFF
+
+"""
+Translation of formulas to the .slugsin format of slugs, i.e., the format
+that slugs' compiler.py converts .structuredslugs files to, so that the
+conversion step can be skipped.
+(See https://github.com/LTLMoP/slugs/blob/master/doc/input_formats.md)
+
+Formulas are written in prefix notation over Boolean variables:
+  '(a & ! b) -> next(c)'  becomes  "| ! & a ! b c'"
+Each integer variable (declared in the props, e.g., 'x:0...5') is blasted into
+as many bits as its range needs, which are named like the ones of compiler.py:
+x@0.0.5 (the least significant bit, with the bounds), x@1, x@2. An integer
+comparison (e.g., 'x = 3') is the conjunction of the bit values of the
+difference from the lower bound. Since 3 bits have 8 values, the variable is
+also constrained to its range (see IntegerVariable.get_range_formula).
+"""
+
+
+class IntegerVariable(translator.IntegerVariable):
+	"""
+	A bounded integer variable and its bits (least significant first).
+
+	Arguments:
+	  name      (str)   The name of the variable
+	  bounds    (tuple) The (min, max) values
+
+	"""
+
+	def __init__(self, name, bounds):
+		super(IntegerVariable, self).__init__(name, bounds)
+
+		num_bits = max(1, (self.max_value - self.min_value).bit_length())
+		self.bits = ['{0}@0.{1}.{2}'.format(name, *bounds)] + \
+					['{0}@{1}'.format(name, i) for i in range(1, num_bits)]
+
+	def get_comparison(self, value, primed = False):
+		"""The prefix formula of 'name = value' (or of its next)."""
+
+		self.check_value(value)
+
+		offset = value - self.min_value
+		prime = "'" if primed else ''
+
+		literals = list()
+		for i, bit in enumerate(self.bits):
+			if offset >> i & 1:
+				literals.append(bit + prime)
+			else:
+				literals.append('! ' + bit + prime)
+
+		return _prefix('&', literals)
+
+	def get_range_formula(self, primed = False):
+		"""
+		The prefix formula of 'name <= max' over the bits (None if all of the
+		values of the bits are in the range).
+		"""
+
+		offset = self.max_value - self.min_value
+		if offset == (1 << len(self.bits)) - 1:
+			return None
+
+		prime = "'" if primed else ''
+
+		# From the least significant bit up, the formula says that the bits
+		# so far are at most the same bits of the offset (None means TRUE)
+		formula = None
+		for i, bit in enumerate(self.bits):
+			literal = bit + prime
+			if offset >> i & 1:
+				formula = formula and '| ! {0} {1}'.format(literal, formula)
+			else:
+				formula = '& ! {0} {1}'.format(literal, formula) if formula \
+						  else '! ' + literal
+		return formula
+
+
+class SlugsInTranslator(translator.FormulaTranslator):
+	"""
+	Translate formulas (syntax trees or text) to .slugsin prefix notation.
+
+	Arguments:
+	  props     (list of str)   The env and sys props, including the
+								declarations of integer variables
+
+	"""
+
+	constants = {'TRUE': '1', 'FALSE': '0'}
+
+	variable_class = IntegerVariable
+
+	# The prefixes of the operators (the n-ary ones repeat theirs n - 1 times)
+	_prefixes = {NEG: '! ', CONJ: '& ', DISJ: '| ', IMPLIES: '| ! ',
+				 IFF: '! ^ '}
+
+	def translate_prop(self, prop):
+		"""The Boolean variables of a prop (the bits of integer variables)."""
+
+		name, bounds = parse_declaration(prop)
+		if bounds is None:
+			return [name]
+		return self.variables[name].bits
+
+	def get_operator(self, op, num_args):
+
+		if op in (CONJ, DISJ):
+			return self._prefixes[op] * (num_args - 1), ' ', ''
+		return self._prefixes[op], ' ', ''
+
+	def translate_comparison(self, variable, value, primed):
+		return variable.get_comparison(value, primed)
+
+
+def _prefix(operator, operands):
+	"""A prefix formula of a binary operator over one or more operands."""
+	return (operator + ' ') * (len(operands) - 1) + ' '.join(operands)
@@ -0,0 +1,375 @@
+#!/usr/bin/env python
+
+import weakref
+
+"""
+Hash-consed syntax trees for LTL formulas.
+
+Every formula is an immutable FormulaNode. Nodes are interned, so building the
+same subformula twice returns the very same object (structural sharing). This
+keeps terms such as the mutex conjunctions of the topology formulas in memory
+only once, no matter how many formulas they appear in.
+
+A node is only rendered to .structuredslugs text when it is written (or when
+it is hashed like, or compared with, a string of the same hash). The rendering
+is identical to the strings that the helpers in respec.ltl.ltl used to build.
+
+"""
+
+# Node operators
+ATOM    = 'atom'
+NEG     = 'neg'
+NEXT    = 'next'
+CONJ    = 'conj'
+DISJ    = 'disj'
+IMPLIES = 'implies'
+IFF     = 'iff'
+PAREN   = 'paren'
+
+_BINARY_SEPARATORS = {CONJ: ' & ', DISJ: ' | '}
+_INFIX_SEPARATORS  = {IMPLIES: ' -> ', IFF: ' <-> '}
+
+
+class FormulaNode(object):
+	"""
+	An interned, immutable node of a LTL formula's syntax tree.
+
+	Nodes should be created through the module-level constructors (atom,
+	make_node) or the helpers in respec.ltl.ltl, never directly.
+
+	Attributes:
+	  op    (str)       One of the operators defined in this module.
+	  args  (tuple)     The operands (FormulaNode) or, for atoms, the text.
+
+	"""
+
+	__slots__ = ('op', 'args', '_hash', '__weakref__')
+
+	def __init__(self, op, args):
+		self.op = op
+		self.args = args
+		self._hash = None
+
+	def __str__(self):
+		return ''.join(iter_chunks(self))
+
+	def __repr__(self):
+		# Print like the string it stands for (e.g., in lists of formulas)
+		return repr(str(self))
+
+	def __hash__(self):
+		# Hash like the rendered string, so that nodes and strings can be
+		# mixed in sets, dictionaries, etc. (same as before the AST existed).
+		# The node is rendered once, the hash is kept.
+		if self._hash is None:
+			self._hash = hash(str(self))
+		return self._hash
+
+	def __eq__(self, other):
+		# Interned nodes are compared by identity. Nodes (or strings) that
+		# have the same hash are compared as text, since a formula can be
+		# built differently, e.g., parsed and generated, or an opaque atom.
+		if self is other:
+			return True
+		if type(other) is FormulaNode:
+			return hash(self) == hash(other) and str(self) == str(other)
+		if isinstance(other, basestring):
+			return hash(self) == hash(other) and str(self) == other
+		return NotImplemented
+
+	def __ne__(self, other):
+		equal = self.__eq__(other)
+		return equal if equal is NotImplemented else not equal
+
+	def __add__(self, other):
+		return str(self) + other
+
+	def __radd__(self, other):
+		return other + str(self)
+
+	def __setattr__(self, name, value):
+		if name != '_hash' and hasattr(self, 'args'):
+			raise AttributeError('FormulaNode objects are immutable!')
+		object.__setattr__(self, name, value)
+
+	def __reduce__(self):
+		# Unpickled nodes are re-interned
+		return (make_node, (self.op, self.args))
+
+
+# =========================================================
+# Construction (interning)
+# =========================================================
+
+# (op, operand identities) -> weak reference to node. A node keeps its operands
+# alive, so the identities in a key cannot be reused while the entry exists.
+# (A plain dictionary of KeyedRefs is used instead of a WeakValueDictionary,
+# because lookups are on the hot path of formula generation.)
+_interned = dict()
+
+def _discard(ref):
+	"""Drop the entry of a node that has been garbage collected."""
+	if _interned.get(ref.key) is ref:
+		del _interned[ref.key]
+
+def _intern(key, op, args):
+	node = FormulaNode(op, args)
+	_interned[key] = weakref.KeyedRef(node, _discard, key)
+	return node
+
+def atom(text):
+	"""Get the (interned) node of an atomic (i.e., opaque) piece of text."""
+
+	if type(text) is FormulaNode:
+		return text
+
+	ref = _interned.get(text)
+	node = ref() if ref is not None else None
+	if node is None:
+		node = _intern(text, ATOM, text)
+	return node
+
+def make_node(op, args):
+	"""Get the (interned) node for an operator applied to some operands."""
+
+	if op == ATOM:
+		return atom(args)
+
+	args = tuple([a if type(a) is FormulaNode else atom(a) for a in args])
+
+	key = (op,) + tuple(map(id, args))
+	ref = _interned.get(key)
+	node = ref() if ref is not None else None
+	if node is None:
+		node = _intern(key, op, args)
+	return node
+
+def make_unary_node(op, term):
+	"""Same as make_node, but faster for a single operand (e.g., negation)."""
+
+	# Operands that are strings are also looked up by their text, which
+	# skips the lookup of their atom (e.g., when negating propositions).
+	if type(term) is FormulaNode:
+		key = (op, id(term))
+	else:
+		key = (op, term)
+
+	ref = _interned.get(key)
+	node = ref() if ref is not None else None
+	if node is None:
+		if type(term) is FormulaNode:
+			node = _intern(key, op, (term,))
+		else:
+			node = make_unary_node(op, atom(term))
+			_interned[key] = weakref.KeyedRef(node, _discard, key)
+	return node
+
+def interned_count():
+	"""Number of distinct nodes that are currently alive."""
+	return len(_interned)
+
+def substitute(formula, substitutions, memo = None):
+	"""
+	Replace atoms (e.g., propositions) in a formula according to a dictionary
+	from atom text to formula. Shared subtrees are only rewritten once.
+	A formula that is a plain string is only replaced if it matches exactly.
+	"""
+
+	if memo is None:
+		memo = dict()
+
+	if type(formula) is not FormulaNode:
+		return substitutions.get(formula, formula)
+
+	stack = [formula]
+	while stack:
+		node = stack[-1]
+		if id(node) in memo:
+			stack.pop()
+		elif node.op == ATOM:
+			memo[id(node)] = atom(substitutions.get(node.args, node))
+			stack.pop()
+		else:
+			pending = [a for a in node.args if id(a) not in memo]
+			if pending:
+				stack.extend(pending)
+			else:
+				args = [memo[id(a)] for a in node.args]
+				memo[id(node)] = make_node(node.op, args)
+				stack.pop()
+
+	return memo[id(formula)]
+
+def canonicalize(formula):
+	"""
+	A canonical version of a formula, in which the (distinct) operands of
+	conjunctions and disjunctions, and the two sides of equivalences, are
+	sorted by their text. Formulas that are equal up to the order of those
+	operands have the same canonical version. Strings are returned as is.
+	"""
+
+	if type(formula) is not FormulaNode:
+		return formula
+
+	memo = dict()
+	text = dict() # Rendered text of canonical nodes (sort keys)
+
+	def get_text(node):
+		if id(node) not in text:
+			text[id(node)] = render(node)
+		return text[id(node)]
+
+	stack = [formula]
+	while stack:
+		node = stack[-1]
+		if id(node) in memo:
+			stack.pop()
+		elif node.op == ATOM:
+			memo[id(node)] = node
+			stack.pop()
+		else:
+			pending = [a for a in node.args if id(a) not in memo]
+			if pending:
+				stack.extend(pending)
+				continue
+
+			args = [memo[id(a)] for a in node.args]
+			if node.op in (CONJ, DISJ):
+				# Interned nodes, so identity means equality
+				unique_args = dict((id(a), a) for a in args).values()
+				args = sorted(unique_args, key = get_text)
+				canonical = args[0] if len(args) == 1 else \
+							make_node(node.op, args)
+			elif node.op == IFF:
+				canonical = make_node(IFF, sorted(args, key = get_text))
+			else:
+				canonical = make_node(node.op, args)
+
+			memo[id(node)] = canonical
+			stack.pop()
+
+	return memo[id(formula)]
+
+def iter_atoms(formula):
+	"""
+	Yield the text of the distinct atoms of a formula (e.g., propositions,
+	but also opaque pieces of formulas). A string is a single atom.
+	"""
+
+	if type(formula) is not FormulaNode:
+		yield formula
+		return
+
+	seen = set()
+	stack = [formula]
+	while stack:
+		node = stack.pop()
+		if id(node) in seen:
+			continue
+		seen.add(id(node))
+		if node.op == ATOM:
+			yield node.args
+		else:
+			stack.extend(node.args)
+
+def get_first_atom(formula):
+	"""The text of the leftmost atom of a formula (a string is an atom)."""
+
+	node = formula
+	while type(node) is FormulaNode and node.op != ATOM:
+		node = node.args[0]
+
+	return node.args if type(node) is FormulaNode else node
+
+def count_nodes(formula):
+	"""The number of distinct nodes of a formula (a string is one node)."""
+
+	if type(formula) is not FormulaNode:
+		return 1
+
+	seen = set()
+	stack = [formula]
+	while stack:
+		node = stack.pop()
+		if id(node) in seen:
+			continue
+		seen.add(id(node))
+		if node.op != ATOM:
+			stack.extend(node.args)
+
+	return len(seen)
+
+# =========================================================
+# Rendering
+# =========================================================
+
+def render(formula):
+	"""Render a node (or pass a string through) as .structuredslugs text."""
+	return ''.join(iter_chunks(formula))
+
+def iter_chunks(formula):
+	"""
+	Yield the .structuredslugs text of a formula in chunks, without building
+	the full string. The traversal is iterative, so deep trees are fine.
+	"""
+
+	stack = [formula]
+	while stack:
+		item = stack.pop()
+		if isinstance(item, basestring):
+			yield item
+			continue
+
+		op, args = item.op, item.args
+		if op == ATOM:
+			yield args
+		elif op == NEG:
+			yield '! '
+			stack.append(args[0])
+		elif op == NEXT:
+			if _is_parenthesized(args[0]):
+				yield 'next'
+				stack.append(args[0])
+			else:
+				yield 'next('
+				stack.extend([')', args[0]])
+		elif op in _BINARY_SEPARATORS:
+			separator = _BINARY_SEPARATORS[op]
+			yield '('
+			stack.append(')')
+			for i in range(len(args) - 1, 0, -1):
+				stack.extend([args[i], separator])
+			stack.append(args[0])
+		elif op in _INFIX_SEPARATORS:
+			stack.extend([args[1], _INFIX_SEPARATORS[op], args[0]])
+		elif op == PAREN:
+			yield '('
+			stack.extend([')', args[0]])
+		else:
+			raise ValueError('Unknown formula operator: {}'.format(op))
+
+def _first_char(node):
+	"""First character of the rendered node (only walks the left spine)."""
+	while True:
+		if node.op == ATOM:
+			return node.args[:1]
+		elif node.op in (CONJ, DISJ, PAREN):
+			return '('
+		elif node.op == NEG:
+			return '!'
+		elif node.op == NEXT:
+			return 'n'
+		node = node.args[0] # IMPLIES, IFF
+
+def _last_char(node):
+	"""Last character of the rendered node (only walks the right spine)."""
+	while True:
+		if node.op == ATOM:
+			return node.args[-1:]
+		elif node.op in (CONJ, DISJ, PAREN, NEXT):
+			return ')'
+		node = node.args[-1] # NEG, IMPLIES, IFF
+
+def _is_parenthesized(node):
+	"""Whether the rendered node starts with '(' and ends with ')'."""
+	return _first_char(node) == '(' and _last_char(node) == ')'
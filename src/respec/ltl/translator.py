@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+
+import re
+
+from .parser import parse, parse_declaration
+from .syntax_tree import FormulaNode, render, _is_parenthesized, \
+						 ATOM, NEG, NEXT, CONJ, DISJ, IMPLIES, IFF, PAREN
+
+"""
+The base class of the translators of formulas to the syntax of a synthesis
+tool (see respec.ltl.slugsin and respec.ltl.gr1c).
+
+A translator walks the syntax tree of a formula (or parses its text) and
+yields the translation in chunks. The walk, the atoms and the integer
+variables are the same for all tools. A translator only has to say how each
+operator is written (get_operator) and how the atoms are written
+(translate_comparison, and translate_name unless the next value of a
+proposition is written by priming it, e.g., "a'").
+"""
+
+_NAME_PATTERN = re.compile(r'[A-Za-z_][A-Za-z0-9_]*$')
+_COMPARISON_PATTERN = re.compile(r'([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(\d+)$')
+
+# Stack items that are text to write as is (instead of a formula)
+_TEXT = None
+
+
+class IntegerVariable(object):
+	"""
+	A bounded integer variable.
+
+	Arguments:
+	  name      (str)   The name of the variable
+	  bounds    (tuple) The (min, max) values
+
+	"""
+
+	def __init__(self, name, bounds):
+		self.name = name
+		self.min_value, self.max_value = bounds
+
+	def check_value(self, value):
+		"""Raise a ValueError if the value is out of the range."""
+
+		if not self.min_value <= value <= self.max_value:
+			raise ValueError('Value {0} is out of the range of integer '
+							 'variable {1} ({2}...{3})'.format(value,
+							 self.name, self.min_value, self.max_value))
+
+
+class FormulaTranslator(object):
+	"""
+	Translate formulas (syntax trees or text) to the syntax of a tool.
+
+	Arguments:
+	  props     (list of str)   The env and sys props, including the
+								declarations of integer variables
+
+	"""
+
+	# The text of the Boolean constants
+	constants = {'TRUE': 'TRUE', 'FALSE': 'FALSE'}
+
+	# The class of the integer variables (in variables)
+	variable_class = IntegerVariable
+
+	def __init__(self, props = []):
+
+		self.variables = dict()
+		for prop in props:
+			name, bounds = parse_declaration(prop)
+			if bounds is not None:
+				self.variables[name] = self.variable_class(name, bounds)
+
+		# (atom text, primed) -> text, since atoms are shared
+		self._atoms = dict()
+
+	def translate(self, formula):
+		return ''.join(self.iter_chunks(formula))
+
+	def iter_chunks(self, formula, primed = False):
+		"""
+		Yield the text of a formula in chunks, without building it.
+		The traversal is iterative, like the one of syntax_tree.iter_chunks.
+		"""
+
+		stack = [(formula, primed)]
+		while stack:
+			item, primed = stack.pop()
+			if primed is _TEXT:
+				yield item
+				continue
+
+			if type(item) is not FormulaNode:
+				item = parse(item)
+
+			op, args = item.op, item.args
+			if op == ATOM:
+				yield self._get_atom(args, primed)
+			elif op == NEXT:
+				if primed:
+					raise ValueError('Nested next operators: {}'
+									 .format(render(item)))
+				if args[0].op in (IMPLIES, IFF) and \
+				   _is_parenthesized(args[0]):
+					# The text of the formula (e.g., in .structuredslugs
+					# files) is 'next(a) -> (b)', so it is what is translated
+					stack.append((parse(render(item)), False))
+				else:
+					stack.append((args[0], True))
+			elif op == PAREN:
+				stack.append((args[0], primed))
+			elif op in (NEG, CONJ, DISJ, IMPLIES, IFF):
+				prefix, separator, suffix = self.get_operator(op, len(args))
+				yield prefix
+				if suffix:
+					stack.append((suffix, _TEXT))
+				for i in range(len(args) - 1, 0, -1):
+					stack.extend([(args[i], primed), (separator, _TEXT)])
+				stack.append((args[0], primed))
+			else:
+				raise ValueError('Unknown formula operator: {}'.format(op))
+
+	def get_operator(self, op, num_args):
+		"""
+		How an operator (NEG, CONJ, DISJ, IMPLIES or IFF) is written: the
+		(prefix, separator, suffix) of the text of its arguments.
+		"""
+		raise NotImplementedError()
+
+	def translate_name(self, name, primed):
+		"""The text of a (Boolean) proposition, or of its next value."""
+		return name + "'" if primed else name
+
+	def translate_comparison(self, variable, value, primed):
+		"""The text of 'name = value' (or of its next), for a valid value."""
+		raise NotImplementedError()
+
+	def _get_atom(self, text, primed):
+
+		key = (text, primed)
+		if key not in self._atoms:
+			self._atoms[key] = self._translate_atom(text, primed)
+		return self._atoms[key]
+
+	def _translate_atom(self, text, primed):
+
+		if text in self.constants:
+			return self.constants[text]
+
+		if _NAME_PATTERN.match(text):
+			if text in self.variables:
+				raise ValueError('Integer variable {} is used as a '
+								 'proposition!'.format(text))
+			return self.translate_name(text, primed)
+
+		comparison = _COMPARISON_PATTERN.match(text)
+		if comparison:
+			name, value = comparison.groups()
+			if name not in self.variables:
+				raise ValueError('Undeclared integer variable: {}'.format(name))
+			variable = self.variables[name]
+			variable.check_value(int(value))
+			return self.translate_comparison(variable, int(value), primed)
+
+		# An opaque piece of a formula, e.g., LTL.next('(a & b)')
+		return ''.join(self.iter_chunks(parse(text), primed))
@@ -2,4 +2,6 @@ from .gr1_specification import *
 from .ic_specification import *
 from .robot_specification import *
 from .ts_specification import *
-from .goal_specification import *
\ No newline at end of file
+from .goal_specification import *
+from .spec_cache import *
+from .incremental_specification import *
\ No newline at end of file
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+
+import json
+
+from gr1_specification import _SECTIONS
+from writers import StructuredSlugsWriter
+from ..ltl.syntax_tree import iter_chunks, count_nodes
+
+"""
+Attribute the size of a specification to the origins of its formulas.
+
+Every formula that was loaded into a GR1Specification has an origin (see
+GR1Specification.origins): the GR1Formula class that generated it and the
+input element that it was generated for, e.g., ('SingleStepChangeFormula',
+'stand'). The report adds up, per origin (or per class, or per element):
+  * the number of formulas,
+  * the bytes of the .structuredslugs file that they take (one line each),
+  * the number of distinct nodes of their syntax trees (per formula),
+so that the work on encodings can target what actually makes a file large.
+
+  print get_text_report(spec, group_by = CLASS, limit = 10)
+
+Formulas without an origin (e.g., added to a section directly) are
+attributed to None.
+"""
+
+# How the formulas are grouped
+ORIGIN = 'origin'       # (class, element)
+CLASS = 'class'
+ELEMENT = 'element'
+
+_COLUMN_WIDTHS = {'class': 40, 'element': 20}
+
+_GROUP_KEYS = {
+    ORIGIN:     lambda origin: origin,
+    CLASS:      lambda origin: origin[0],
+    ELEMENT:    lambda origin: origin[1],
+}
+
+def get_attribution(spec, group_by = ORIGIN):
+    """
+    The size of the formulas per group, sorted by bytes (the largest first).
+    Each group is a dict with the keys: 'class', 'element' (one of them is
+    None unless group_by is ORIGIN), 'sections', 'formulas', 'bytes', 'nodes'.
+    """
+
+    if group_by not in _GROUP_KEYS:
+        raise ValueError('Unknown grouping: {0} (expected one of {1})'
+                         .format(group_by, sorted(_GROUP_KEYS.keys())))
+    get_key = _GROUP_KEYS[group_by]
+
+    groups = dict()
+    for section in _SECTIONS:
+        origins = spec.origins[section]
+        for formula in getattr(spec, section):
+            origin = origins.get(formula, (None, None))
+            key = get_key(origin)
+
+            if key not in groups:
+                groups[key] = {'class': origin[0] if group_by != ELEMENT
+                                        else None,
+                               'element': origin[1] if group_by != CLASS
+                                          else None,
+                               'sections': list(),
+                               'formulas': 0, 'bytes': 0, 'nodes': 0}
+            group = groups[key]
+
+            if section not in group['sections']:
+                group['sections'].append(section)
+            group['formulas'] += 1
+            group['bytes'] += sum(map(len, iter_chunks(formula))) + 1 # '\n'
+            group['nodes'] += count_nodes(formula)
+
+    return sorted(groups.values(), key = lambda group: (-group['bytes'],
+                                                        str(group['class']),
+                                                        str(group['element'])))
+
+def get_file_size(spec):
+    """The size (bytes) of the .structuredslugs file of a spec."""
+
+    return sum(map(len, StructuredSlugsWriter().iter_chunks(spec)))
+
+def get_json_report(spec, group_by = ORIGIN, indent = 1):
+
+    report = {'file_bytes': get_file_size(spec),
+              'group_by': group_by,
+              'groups': get_attribution(spec, group_by)}
+
+    return json.dumps(report, indent = indent, sort_keys = True)
+
+def get_text_report(spec, group_by = ORIGIN, limit = None):
+    """The attribution as a table (the largest first, at most limit rows)."""
+
+    file_bytes = get_file_size(spec)
+    groups = get_attribution(spec, group_by)
+
+    lines = ['{0}: {1} bytes, {2} formulas'.format(
+                spec.spec_name or 'specification', file_bytes,
+                sum(group['formulas'] for group in groups))]
+
+    # The class and/or element columns (depending on the grouping)
+    names = [name for name in ['class', 'element']
+             if group_by in [ORIGIN, name]]
+
+    def format_row(name_values, *values):
+        cells = ['{0:<{1}}'.format(value, _COLUMN_WIDTHS[name])
+                 for name, value in zip(names, name_values)]
+        cells.append('{0:>9} {1:>11} {2:>7} {3:>10}'.format(*values))
+        return ' '.join(cells)
+
+    lines.append(format_row(names, 'formulas', 'bytes', 'share', 'nodes'))
+
+    for group in groups[:limit]:
+        share = 100.0 * group['bytes'] / max(file_bytes, 1)
+        lines.append(format_row([_format(group[name]) for name in names],
+                                group['formulas'], group['bytes'],
+                                '{:.1f}%'.format(share), group['nodes']))
+
+    if limit is not None and len(groups) > limit:
+        lines.append('({} more)'.format(len(groups) - limit))
+
+    return '\n'.join(lines) + '\n'
+
+def _format(name):
+    return '-' if name is None else str(name)
@@ -17,15 +17,72 @@ From the outside, formulas can be added using the method(s) for loading.
 
 Multiple GR1Specification objects can be merged.
 Merging is both proposition-wise and formula-wise.
+Propositions are kept in the order in which they were first added.
+Each of the 6 parts only keeps the first occurrence of a formula (see
+FormulaStore), so formulas shared by merged specifications are written once.
+
+Each formula remembers its origin, i.e., the GR1Formula class that generated
+it and the input element (e.g., TS state) that it was generated for (see
+origins and GR1Formula.get_origins). Formulas that are added to a section
+directly (instead of being loaded) have no origin.
+
+Mutually exclusive propositions can be encoded by integer variables (see
+encoded_props). Once a specification knows about such a variable, the
+propositions that it encodes are replaced by integer comparisons in all of
+its formulas (e.g., 'r1_c' becomes '(ts_c = 0)').
 
 There are also (public) methods for writing the specification in 
-a .structuredslugs file for use with the SLUGS synthesis tool:
+a .structuredslugs file (or streaming it to stdout, a pipe, etc.)
+for use with the SLUGS synthesis tool, or directly in the .slugsin
+format that the structuredslugs files are converted to for slugs:
 
 https://github.com/LTLMoP/slugs
 
+The same specification can be written for other GR(1) synthesizers, e.g.,
+gr1c or TuLiP, by choosing the file format (see write_file and writers.py).
+A .structuredslugs file can be read back into a specification (see readers.py).
+
 """
 
 import os
+import re
+import operator
+import itertools
+
+from ..ltl import ltl as LTL
+from ..ltl.registry import PropositionRegistry, FormulaStore
+from ..ltl.syntax_tree import FormulaNode, iter_atoms
+from ..ltl.parser import parse_declaration
+from ..ltl.evaluator import FormulaEvaluator
+
+from .writers import get_writer, DEFAULT_BUFFER_SIZE
+from . import instrumentation
+
+# The six parts of a GR(1) formula
+_SECTIONS = ['sys_init', 'env_init', 'sys_trans', 'env_trans',
+			 'sys_liveness', 'env_liveness']
+
+# The names (e.g., propositions) in the text of a formula
+_NAME_PATTERN = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+
+# The formulas outside the cone of influence are only checked (by enumeration)
+# if their props have at most this many (current and next) values
+_MAX_ASSIGNMENTS = 1 << 12
+
+def _section_property(section):
+	"""A part of the GR(1) formula, stored in a FormulaStore."""
+
+	attribute = '_' + section
+
+	def getter(self):
+		return getattr(self, attribute)
+
+	def setter(self, formulas):
+		if not isinstance(formulas, FormulaStore):
+			formulas = FormulaStore(formulas, self.canonical_formulas)
+		setattr(self, attribute, formulas)
+
+	return property(getter, setter)
 
 class GR1Specification(object):
 	"""
@@ -38,14 +95,31 @@ class GR1Specification(object):
 	  							The spec file will be named like that.
 	  env_props	(list of str)	Environment (input) propositions
 	  sys_props	(list of str)	System (output) propositions
+
+	Attributes:
+	  encoded_props (dict)		Integer variables (declared in the props)
+	  							and the props encoded by each of their values.
+	  origins	(dict of dict)	The (class name, element) origin of the
+	  							formulas of each section, per formula.
 	
 	"""
 
+	# Whether formulas that only differ in the order of the operands of
+	# &, |, and <-> are duplicates (read when the sections are created)
+	canonical_formulas = False
+
+	sys_init = _section_property('sys_init')
+	env_init = _section_property('env_init')
+	sys_trans = _section_property('sys_trans')
+	env_trans = _section_property('env_trans')
+	sys_liveness = _section_property('sys_liveness')
+	env_liveness = _section_property('env_liveness')
+
 	def __init__(self, spec_name = '', env_props = [], sys_props = []):
 		self.spec_name = spec_name
 
-		self.env_props = env_props	
-		self.sys_props = sys_props
+		self.env_props = PropositionRegistry(env_props)
+		self.sys_props = PropositionRegistry(sys_props)
 
 		# Initialize the six GR(1) subformulas
 		self.sys_init  = list()
@@ -55,6 +129,16 @@ class GR1Specification(object):
 		self.sys_liveness = list()
 		self.env_liveness = list()
 
+		self.encoded_props = dict()
+
+		self.origins = dict((section, dict()) for section in _SECTIONS)
+
+	def count_duplicate_formulas(self):
+		"""The number of duplicate formulas that were dropped, per section."""
+
+		return dict((section, getattr(self, section).duplicates)
+					for section in _SECTIONS)
+
 	# =====================================================
 	# Merge two or more GR(1) specifications
 	# =====================================================
@@ -74,6 +158,19 @@ class GR1Specification(object):
 			self.sys_liveness.extend(spec.sys_liveness)
 			self.env_liveness.extend(spec.env_liveness)
 
+			self.merge_encoded_propositions(spec.encoded_props)
+			self.merge_origins(spec.origins)
+
+		self._apply_integer_encoding()
+
+	def merge_origins(self, origins):
+		"""Merge the origins of formulas (the first origin is kept)."""
+
+		for section in _SECTIONS:
+			section_origins = self.origins[section]
+			for formula, origin in origins[section].iteritems():
+				section_origins.setdefault(formula, origin)
+
 	def merge_env_propositions(self, props):
 		return self.merge_propositions('env_props', props)
 
@@ -84,10 +181,191 @@ class GR1Specification(object):
 		'''Merge list of propositions without duplication.'''
 
 		all_props = getattr(self, desired_list)
+		if not isinstance(all_props, PropositionRegistry):
+			all_props = PropositionRegistry(all_props)
 		all_props.extend(props)
 
-		# Return list of props without duplicates
-		return list(set(all_props))
+		# Return the (insertion-ordered) props without duplicates
+		return all_props
+
+	def merge_encoded_propositions(self, encoded_props):
+		"""Merge integer variables, which have to agree on their values."""
+
+		for var, values in encoded_props.items():
+			if self.encoded_props.get(var, values) != values:
+				raise ValueError('Conflicting encodings of integer variable '
+								 '{0}: {1} vs {2}'.format(
+								 var, self.encoded_props[var], values))
+			self.encoded_props[var] = values
+
+	def _apply_integer_encoding(self):
+		"""
+		Replace props that are encoded by an integer variable by the
+		corresponding integer comparison, in all formulas and prop lists.
+		"""
+
+		if not self.encoded_props:
+			return
+
+		substitutions = dict()
+		for var, values in self.encoded_props.items():
+			for value, prop in enumerate(values):
+				if prop is not None:
+					substitutions[prop] = LTL.eq(var, value)
+
+		# The props of a formula include the ones in it, so only
+		# rewrite the formulas if some encoded props have shown up
+		if not any(pi in substitutions
+				   for pi in self.env_props + self.sys_props):
+			return
+
+		self.env_props = PropositionRegistry(pi for pi in self.env_props
+											 if pi not in substitutions)
+		self.sys_props = PropositionRegistry(pi for pi in self.sys_props
+											 if pi not in substitutions)
+
+		# Shared subformulas are only rewritten once. (The memo is keyed by
+		# identity, so the old formulas have to stay alive until the end.)
+		memo = dict()
+		old_formulas = [getattr(self, section) for section in _SECTIONS]
+
+		for section, formulas in zip(_SECTIONS, old_formulas):
+			new_formulas = FormulaStore(canonical = formulas.canonical)
+			new_formulas.duplicates = formulas.duplicates
+			old_origins = self.origins[section]
+			new_origins = dict()
+			for f in formulas:
+				new_f = LTL.substitute(f, substitutions, memo)
+				new_formulas.append(new_f)
+				if f in old_origins:
+					new_origins.setdefault(new_f, old_origins[f])
+			setattr(self, section, new_formulas)
+			self.origins[section] = new_origins
+
+	# =====================================================
+	# Cone-of-influence reduction
+	# =====================================================
+
+	def reduce_to_cone_of_influence(self):
+		"""
+		Remove the props and formulas outside the cone of influence of the
+		liveness formulas (sys_liveness and env_liveness). A prop is in the
+		cone if it is in a liveness formula or shares a formula (of any
+		section) with a prop in the cone. A formula is kept if it has a prop
+		in the cone, or no props at all (e.g., FALSE). Integer variables are
+		props, too. Returns the number of removed props/formulas per section.
+
+		The formulas outside the cone are independent of the ones in it, but
+		they are only removed (in groups that share props) if they provably
+		cannot change realizability, i.e., if the environment can always
+		satisfy the assumptions of the group, and the system the requirements
+		(given the assumptions). See _is_harmless. Other groups are kept,
+		with their props.
+		"""
+
+		# Name -> prop (e.g., 'ts_c' -> 'ts_c:0...2' for integer variables)
+		props = dict((prop.split(':')[0], prop)
+					 for prop in self.env_props + self.sys_props)
+
+		atom_names = dict() # Memo, since atoms are shared between formulas
+
+		def get_names(formula):
+			names = set()
+			for text in iter_atoms(formula):
+				if text not in atom_names:
+					atom_names[text] = set(name for name
+										   in _NAME_PATTERN.findall(text)
+										   if name in props)
+				names.update(atom_names[text])
+			return names
+
+		formula_names = dict((section, map(get_names, getattr(self, section)))
+							 for section in _SECTIONS)
+
+		# Name -> formulas (section, index) that contain it
+		name_formulas = dict()
+		for section, names_list in formula_names.items():
+			for i, names in enumerate(names_list):
+				for name in names:
+					name_formulas.setdefault(name, list()).append((section, i))
+
+		kept_formulas = set()
+		stack = list()
+		for section, names_list in formula_names.items():
+			for i, names in enumerate(names_list):
+				if section in ['sys_liveness', 'env_liveness'] or not names:
+					kept_formulas.add((section, i))
+					stack.extend(names)
+
+		# Propagate the cone through the formulas
+		cone = set()
+		while stack:
+			name = stack.pop()
+			if name in cone:
+				continue
+			cone.add(name)
+			for formula in name_formulas.get(name, []):
+				if formula not in kept_formulas:
+					kept_formulas.add(formula)
+					stack.extend(formula_names[formula[0]][formula[1]])
+
+		# Groups of formulas (and their props) outside the cone
+		env_names = set(prop.split(':')[0] for prop in self.env_props)
+		grouped = set(kept_formulas)
+		for section in _SECTIONS:
+			for i in range(len(formula_names[section])):
+				if (section, i) in grouped:
+					continue
+
+				group = set([(section, i)])
+				group_names = set()
+				stack = list(formula_names[section][i])
+				while stack:
+					name = stack.pop()
+					if name in group_names:
+						continue
+					group_names.add(name)
+					for formula in name_formulas[name]:
+						if formula not in group:
+							group.add(formula)
+							stack.extend(formula_names[formula[0]][formula[1]])
+				grouped.update(group)
+
+				group_formulas = dict()
+				for group_section, j in group:
+					group_formulas.setdefault(group_section, list()).append(
+										getattr(self, group_section)[j])
+
+				if not _is_harmless(group_formulas,
+						[props[name] for name in group_names
+						 if name in env_names],
+						[props[name] for name in group_names
+						 if name not in env_names]):
+					kept_formulas.update(group)
+					cone.update(group_names)
+
+		kept_props = set(props[name] for name in cone)
+		removed = dict()
+
+		for section in ['env_props', 'sys_props']:
+			old_props = getattr(self, section)
+			setattr(self, section, PropositionRegistry(
+							prop for prop in old_props if prop in kept_props))
+			removed[section] = len(old_props) - len(getattr(self, section))
+
+		self.encoded_props = dict((var, values) for var, values
+								  in self.encoded_props.items() if var in cone)
+
+		for section in _SECTIONS:
+			old_formulas = getattr(self, section)
+			new_formulas = FormulaStore(canonical = old_formulas.canonical)
+			new_formulas.duplicates = old_formulas.duplicates
+			new_formulas.extend(formula for i, formula in enumerate(old_formulas)
+								if (section, i) in kept_formulas)
+			setattr(self, section, new_formulas)
+			removed[section] = len(old_formulas) - len(new_formulas)
+
+		return removed
 
 	# =====================================================
 	# Load a GR(1) formula
@@ -104,6 +382,7 @@ class GR1Specification(object):
 		
 		self.env_props = self.merge_env_propositions(formula.env_props)
 		self.sys_props = self.merge_sys_propositions(formula.sys_props)
+		self.merge_encoded_propositions(formula.encoded_props)
 
 		try:
 			self._add_to_list(formula.type, formula.formulas)
@@ -113,6 +392,10 @@ class GR1Specification(object):
 							 .format(formula = formula.__class__.__name__,
 							 		 type = formula.type))
 
+		self._add_origins(formula)
+
+		self._apply_integer_encoding()
+
 
 	# =====================================================
 	# "Setter"-type methods for the 6 types of subformulas
@@ -138,13 +421,26 @@ class GR1Specification(object):
 	# def add_to_env_liveness(self, formulas):
 	# 	self._add_to_list('env_liveness', formulas)
 
+	def _add_origins(self, formula):
+		"""Remember the origins of the formulas of a GR1Formula."""
+
+		formulas = formula.formulas
+		if formulas is None:
+			return
+		if not isinstance(formulas, list):
+			formulas = [formulas]
+
+		section_origins = self.origins[formula.type]
+		for f, origin in zip(formulas, formula.get_origins()):
+			section_origins.setdefault(f, origin)
+
 	def _add_to_list(self, desired_list, thing_to_add):
 		"""
 		Generic method for appending to, or extending,
 		a list attribute of the object (e.g. self.sys_liveness)
 		"""
 
-		if type(thing_to_add) is str:
+		if isinstance(thing_to_add, (str, FormulaNode)):
 			getattr(self, desired_list).append(thing_to_add)
 		elif type(thing_to_add) is list:
 			getattr(self, desired_list).extend(thing_to_add)
@@ -152,17 +448,55 @@ class GR1Specification(object):
 			print("Warning: Nothing was added to {}!".format(desired_list))
 		else:
 			raise ValueError("Invalid input: {} \
-							  Add either a string or a list of strings."
+							  Add either a formula or a list of formulas."
 							 .format(str(thing_to_add)))
 
 	# =====================================================
-	# Composition of the Structured SLUGS file
+	# Composition of the Structured SLUGS (or other) file
 	# =====================================================
 
-	def write_structured_slugs_file(self, folder_path):
+	def write_structured_slugs_file(self, folder_path,
+									buffer_size = DEFAULT_BUFFER_SIZE):
 		"""Open a structuredslugs file and write the 8 sections."""	
 		
-		filename = self.spec_name + ".structuredslugs"
+		return self.write_file(folder_path, 'structuredslugs', buffer_size)
+
+	def write_structured_slugs(self, stream = None,
+							   buffer_size = DEFAULT_BUFFER_SIZE):
+		"""
+		Stream the 8 sections to a file-like object (default: stdout),
+		e.g., the stdin of slugs. (See writers.StructuredSlugsWriter)
+		"""
+
+		self.write(stream, 'structuredslugs', buffer_size)
+
+	def write_slugsin_file(self, folder_path,
+						   buffer_size = DEFAULT_BUFFER_SIZE):
+		"""
+		Open a slugsin file and write the 8 sections, i.e., the file that
+		slugs' compiler.py would make of the structuredslugs file.
+		"""
+
+		return self.write_file(folder_path, 'slugsin', buffer_size)
+
+	def write_slugsin(self, stream = None, buffer_size = DEFAULT_BUFFER_SIZE):
+		"""
+		Stream the 8 sections in the .slugsin format to a file-like object
+		(default: stdout). (See writers.SlugsInWriter)
+		"""
+
+		self.write(stream, 'slugsin', buffer_size)
+
+	def write_file(self, folder_path, file_format = 'structuredslugs',
+				   buffer_size = DEFAULT_BUFFER_SIZE):
+		"""
+		Write the spec in a file format (e.g., 'gr1c', see writers.WRITERS)
+		to folder_path/spec_name/spec_name.extension
+		"""
+
+		writer = get_writer(file_format, buffer_size)
+
+		filename = self.spec_name + writer.extension
 
 		folder_path = os.path.join(folder_path, self.spec_name)
 
@@ -173,71 +507,103 @@ class GR1Specification(object):
 		full_file_path = os.path.join(folder_path, filename)
 		
 		with open(full_file_path, 'w') as spec_file:
-			# System and environment propositions
-			self._write_input(spec_file)
-			self._write_output(spec_file)
-			# Initial Conditions
-			self._write_sys_init(spec_file)
-			self._write_env_init(spec_file)
-			# Safety Requirements & Assumptions
-			self._write_sys_trans(spec_file)
-			self._write_env_trans(spec_file)
-			# Liveness Requirements & Assumptions
-			self._write_sys_liveness(spec_file)
-			self._write_env_liveness(spec_file)
+			writer.write(self, spec_file)
 
 		print("\nCreated specification file {name} in {dir} \n"
 			  .format(name = filename, dir = folder_path))
 
+		if instrumentation.is_enabled():
+			instrumentation.write_reports(folder_path, self.spec_name)
+
 		return full_file_path, folder_path
 
-	def _write_input(self, spec_file):
-		spec_file.write("[INPUT]\n")
-		for prop in self.env_props:
-			spec_file.write(prop + "\n")
-		spec_file.write("\n")
-
-	def _write_output(self, spec_file):
-		spec_file.write("[OUTPUT]\n")
-		for prop in self.sys_props:
-		    spec_file.write(prop + "\n")
-		spec_file.write("\n")
-
-	def _write_sys_init(self, spec_file):
-		spec_file.write("[SYS_INIT]\n")
-		for formula in self.sys_init:
-			spec_file.write(formula + "\n")
-		spec_file.write("\n")
-
-	def _write_env_init(self, spec_file):
-		spec_file.write("[ENV_INIT]\n")
-		for formula in self.env_init:
-			spec_file.write(formula + "\n")
-		spec_file.write("\n")
-
-	def _write_sys_trans(self, spec_file):
-		spec_file.write("[SYS_TRANS]\n")
-		for formula in self.sys_trans:
-			spec_file.write(formula + "\n")
-		spec_file.write("\n")
-
-	def _write_env_trans(self, spec_file):
-		spec_file.write("[ENV_TRANS]\n")
-		for formula in self.env_trans:
-			spec_file.write(formula + "\n")
-		spec_file.write("\n")
-
-	def _write_sys_liveness(self, spec_file):
-		spec_file.write("[SYS_LIVENESS]\n")
-		for formula in self.sys_liveness:
-			spec_file.write(formula + "\n")
-		spec_file.write("\n")
-
-	def _write_env_liveness(self, spec_file):
-		spec_file.write("[ENV_LIVENESS]\n")
-		for formula in self.env_liveness:
-			spec_file.write(formula + "\n")
-		spec_file.write("\n")
+	def write(self, stream = None, file_format = 'structuredslugs',
+			  buffer_size = DEFAULT_BUFFER_SIZE):
+		"""Stream the spec in a file format to a file-like object (or stdout)."""
+
+		get_writer(file_format, buffer_size).write(self, stream)
+
+
+def _is_harmless(formulas, env_props, sys_props):
+	"""
+	Whether removing formulas (section -> formulas) over props of their own
+	preserves realizability: the environment can satisfy the assumptions
+	(env_init, and env_trans from every state), whatever the system does,
+	and then the system can satisfy the requirements (sys_init, sys_trans).
+	Since every state is checked (not only the reachable ones), this is not
+	necessary, e.g., 'a -> b' in sys_trans (over the current values) is not
+	harmless. Formulas with too many values to enumerate are not, either.
+	"""
+
+	env_vars = map(_get_variable, env_props)
+	sys_vars = map(_get_variable, sys_props)
+
+	num_states = reduce(operator.mul, [len(values) for _, values
+									   in env_vars + sys_vars], 1)
+	if num_states ** 2 > _MAX_ASSIGNMENTS:
+		return False
+
+	evaluator = FormulaEvaluator(env_props + sys_props)
+	try:
+		checks = dict((section, map(evaluator.compile,
+									formulas.get(section, [])))
+					  for section in _SECTIONS)
+	except ValueError:
+		return False # e.g., nested next operators
+
+	next_env_vars = [(name + "'", values) for name, values in env_vars]
+	next_sys_vars = [(name + "'", values) for name, values in sys_vars]
+
+	try:
+		if not _can_respond(checks['env_init'], checks['sys_init'], dict(),
+							env_vars, sys_vars):
+			return False
+		return all(_can_respond(checks['env_trans'], checks['sys_trans'],
+								state, next_env_vars, next_sys_vars)
+				   for state in _iter_assignments(env_vars + sys_vars))
+	except KeyError:
+		return False # e.g., a next value in an initial condition
+
+def _can_respond(assumptions, requirements, values, env_vars, sys_vars):
+	"""
+	Whether, given some values, the environment has a choice of its
+	variables that satisfies the assumptions (whatever the system chooses),
+	and the system can satisfy the requirements after each such choice.
+	"""
+
+	sys_choices = list(_iter_assignments(sys_vars))
+
+	def holds(checks, env_values, sys_values):
+		all_values = dict(values)
+		all_values.update(env_values)
+		all_values.update(sys_values)
+		return all(check(all_values) for check in checks)
+
+	can_assume = False
+	for env_values in _iter_assignments(env_vars):
+		if all(holds(assumptions, env_values, sys_values)
+			   for sys_values in sys_choices):
+			can_assume = True
+			if not any(holds(requirements, env_values, sys_values)
+					   for sys_values in sys_choices):
+				return False
+
+	return can_assume
+
+def _get_variable(prop):
+	"""The (name, values) of a prop (or of an integer variable)."""
+
+	name, bounds = parse_declaration(prop)
+	if bounds is None:
+		return name, [False, True]
+	return name, range(bounds[0], bounds[1] + 1)
+
+def _iter_assignments(variables):
+	"""Each assignment (dict) of values to variables, i.e., (name, values)."""
+
+	names = [name for name, _ in variables]
+	for values in itertools.product(*[values for _, values in variables]):
+		yield dict(zip(names, values))
 
 
 # =========================================================
@@ -2,6 +2,7 @@
 
 from gr1_specification import GR1Specification
 from ..formula import *
+from ..ltl.syntax_tree import get_first_atom
 
 """
 Module's docstring #TODO
@@ -23,8 +24,58 @@ class InitialConditionsSpecification(GR1Specification):
         """
 
         #Activation props should all be False in new IC paradigm:
-        self.sys_init = SystemInitialConditions(spec.sys_props,
-                                                true_props = []).formulas
+        sys_init_formula = SystemInitialConditions(spec.sys_props,
+                                                   true_props = [],
+                                                   encoded_props = spec.encoded_props)
         
-        self.env_init = EnvironmentInitialConditions(spec.env_props,
-                                                     true_props).formulas
+        env_init_formula = EnvironmentInitialConditions(spec.env_props,
+                                                        true_props,
+                                                        spec.encoded_props)
+
+        self.sys_init = sys_init_formula.formulas
+        self.env_init = env_init_formula.formulas
+
+        self._add_origins(sys_init_formula)
+        self._add_origins(env_init_formula)
+
+    @classmethod
+    def from_spec_batch(cls, spec, true_props_batch, name = ''):
+        """
+        Same as set_ics_from_spec, but for many sets of true props at once
+        (e.g., variants of a mission). Returns one specification per set.
+        """
+
+        #Activation props should all be False in new IC paradigm:
+        sys_inits = gen_initial_conditions(spec.sys_props, [],
+                                           [[]], spec.encoded_props)[0][0]
+        initial_conditions = gen_initial_conditions([], spec.env_props,
+                                                    true_props_batch,
+                                                    spec.encoded_props)
+
+        sys_origins = _get_init_origins(sys_inits, spec.sys_props,
+                                        SystemInitialConditions)
+
+        ic_specs = list()
+        for _, env_init in initial_conditions:
+            ic_spec = cls(name)
+            ic_spec.sys_init = sys_inits
+            ic_spec.env_init = env_init
+            ic_spec.origins['sys_init'] = dict(sys_origins)
+            ic_spec.origins['env_init'] = _get_init_origins(
+                                                env_init, spec.env_props,
+                                                EnvironmentInitialConditions)
+            ic_specs.append(ic_spec)
+
+        return ic_specs
+
+
+def _get_init_origins(formulas, props, formula_class):
+    """The origins of initial conditions, as in formula_class.get_origins."""
+
+    props = set(props)
+    origins = dict()
+    for formula in formulas:
+        prop = get_first_atom(formula)
+        origins[formula] = (formula_class.__name__,
+                            prop if prop in props else None)
+    return origins
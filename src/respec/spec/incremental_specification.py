@@ -0,0 +1,322 @@
+#!/usr/bin/env python
+
+from gr1_specification import GR1Specification, _SECTIONS
+from goal_specification import GoalSpecification, SM_OUTCOME_SUCCESS
+from robot_specification import ActionSpecification
+from ..formula import *
+
+"""
+A specification that can be updated (goals, actions, TS transitions) without
+being rebuilt from scratch.
+
+The formulas and props of the specification are generated per element:
+  * (GOALS, None)       The goals (and their memory and success formulas)
+  * (ACTION, action)    The preconditions and outcomes of an action
+  * (TS_STATE, pi)      The formulas of the transitions out of a TS state
+  * (TOPOLOGY, None)    The formulas and props shared by all the TS states
+
+Each formula (and prop) remembers the elements that it came from (provenance).
+An update only regenerates the affected elements, and a formula is removed
+once none of the elements generates it anymore. Every update returns the
+formulas and props that were added to and removed from each section
+(SpecificationDelta). New formulas are appended, so the order of the formulas
+can be different from that of a specification built from scratch.
+
+Only the ONE_HOT encoding of the TS props is supported.
+"""
+
+GOALS = 'goals'
+ACTION = 'action'
+TS_STATE = 'ts_state'
+TOPOLOGY = 'topology'
+
+# The props, followed by the six parts of a GR(1) formula
+SPEC_SECTIONS = ['env_props', 'sys_props'] + _SECTIONS
+
+class SpecificationDelta(object):
+    """
+    The props and formulas that were added to and removed from a
+    specification, per section (e.g., 'env_props', 'sys_trans').
+
+    Attributes:
+      added     (dict of list)  The new props/formulas of each section.
+      removed   (dict of list)  The props/formulas removed from each section.
+
+    """
+
+    def __init__(self):
+        self.added = dict((section, list()) for section in SPEC_SECTIONS)
+        self.removed = dict((section, list()) for section in SPEC_SECTIONS)
+
+    def __len__(self):
+        return sum(len(self.added[section]) + len(self.removed[section])
+                   for section in SPEC_SECTIONS)
+
+    def update(self, delta):
+        """Append the changes of a later delta."""
+
+        for section in SPEC_SECTIONS:
+            self.added[section].extend(delta.added[section])
+            self.removed[section].extend(delta.removed[section])
+
+
+class IncrementalSpecification(GR1Specification):
+    """
+    A GR(1) specification that keeps track of the provenance of its formulas,
+    so that goals, actions, and TS transitions can be added and removed by
+    only regenerating the affected formulas.
+
+    Arguments:
+      ts            dict    Transition system (e.g. BDI control modes)
+      preconditions dict    Action preconditions (see ActionSpecification)
+      outcomes      list    The outcomes of actions and TS props
+      sm_outcomes   list    The outcomes of the state machine (see
+                            GoalSpecification.handle_single_liveness)
+      strict_order  bool    Whether the goals have to be achieved in order
+      mutex_encoding  str   How mutual exclusion is encoded in the TS
+
+    Attributes:
+      goals         list    The goals (in order)
+      actions       list    The actions that have been added to this spec
+
+    """
+
+    def __init__(self, name = '', ts = {}, preconditions = {},
+                 outcomes = ['completed'],
+                 sm_outcomes = [SM_OUTCOME_SUCCESS],
+                 strict_order = False,
+                 mutex_encoding = PAIRWISE):
+        super(IncrementalSpecification, self).__init__(spec_name = name,
+                                                       env_props = [],
+                                                       sys_props = [])
+
+        self.ts = dict((pi, list(adj_props)) for pi, adj_props in ts.items())
+        self.preconditions = preconditions
+        self.outcomes = outcomes
+        self.sm_outcomes = sm_outcomes
+        self.strict_order = strict_order
+        self.mutex_encoding = mutex_encoding
+
+        self.goals = list()
+        self.actions = list()
+
+        # Element -> section -> props/formulas (only non-empty elements)
+        self._elements = dict()
+        # Section -> prop/formula -> elements that generate it
+        self._provenance = dict((section, dict()) for section in SPEC_SECTIONS)
+
+        self._ts_generator = None
+        if self.ts:
+            self._update_ts(self.ts.keys(), new_states = True)
+
+    # =====================================================
+    # Elements and provenance
+    # =====================================================
+
+    def set_element(self, element, formulas):
+        """
+        Replace the formulas of an element (e.g., (ACTION, 'grasp') or any
+        other hashable key) by a list of GR1Formulas. Return the delta.
+        """
+
+        element_spec = GR1Specification()
+        element_spec.load_formulas(formulas)
+
+        return self._set_element(element, _get_sections(element_spec))
+
+    def remove_element(self, element):
+        """Remove the formulas of an element. Return the delta."""
+        return self._set_element(element, dict())
+
+    def get_element(self, element):
+        """The props and formulas of an element, per section."""
+
+        sections = self._elements.get(element, dict())
+        return dict((section, list(sections.get(section, [])))
+                    for section in SPEC_SECTIONS)
+
+    def get_provenance(self, formula, section = None):
+        """The elements that generate a formula (or prop)."""
+
+        sections = [section] if section else SPEC_SECTIONS
+
+        elements = set()
+        for section in sections:
+            elements.update(self._provenance[section].get(formula, ()))
+        return sorted(elements)
+
+    def _set_element(self, element, sections):
+
+        delta = SpecificationDelta()
+        old_sections = self._elements.pop(element, dict())
+
+        for section in SPEC_SECTIONS:
+            old_items = old_sections.get(section, [])
+            new_items = sections.get(section, [])
+            old_set, new_set = set(old_items), set(new_items)
+
+            for item in old_items:
+                if item not in new_set:
+                    self._release(section, item, element, delta)
+            for item in new_items:
+                if item not in old_set:
+                    self._acquire(section, item, element, delta)
+
+        if any(sections.values()):
+            self._elements[element] = dict((section, list(items)) for
+                                           section, items in sections.items())
+        return delta
+
+    def _acquire(self, section, item, element, delta):
+        """Add a prop/formula to a section (unless another element did)."""
+
+        owners = self._provenance[section].setdefault(item, set())
+        if not owners:
+            getattr(self, section).append(item)
+            delta.added[section].append(item)
+        owners.add(element)
+
+    def _release(self, section, item, element, delta):
+        """Remove a prop/formula once no element generates it anymore."""
+
+        owners = self._provenance[section][item]
+        owners.discard(element)
+        if not owners:
+            del self._provenance[section][item]
+            getattr(self, section).remove(item)
+            delta.removed[section].append(item)
+
+    # =====================================================
+    # Goals
+    # =====================================================
+
+    def add_goal(self, goal):
+        """Add a goal (after the existing ones). Return the delta."""
+
+        if goal in self.goals:
+            return SpecificationDelta()
+
+        self.goals.append(goal)
+        return self._update_goals()
+
+    def remove_goal(self, goal):
+        """Remove a goal. Return the delta."""
+
+        self.goals.remove(goal)
+        return self._update_goals()
+
+    def _update_goals(self):
+        """The goal formulas depend on all of the goals (and their order)."""
+
+        if not self.goals:
+            return self.remove_element((GOALS, None))
+
+        goal_spec = GoalSpecification()
+        goal_spec.handle_single_liveness(goals = self.goals,
+                                         outcomes = self.sm_outcomes,
+                                         strict_order = self.strict_order)
+
+        return self._set_element((GOALS, None), _get_sections(goal_spec))
+
+    # =====================================================
+    # Actions
+    # =====================================================
+
+    def add_action(self, action):
+        """
+        Add an action and the actions in its preconditions (if they have not
+        been added yet). Return the delta.
+        """
+
+        delta = SpecificationDelta()
+
+        action_spec = ActionSpecification(preconditions = self.preconditions)
+        action_spec._handled_actions.update(self.actions)
+
+        for pi in action_spec._get_preconditions_order(action):
+            pi_spec = ActionSpecification(preconditions = self.preconditions)
+            pi_spec._handle_single_action(pi, act_out = True,
+                                          outcomes = self.outcomes)
+
+            delta.update(self._set_element((ACTION, pi),
+                                           _get_sections(pi_spec)))
+            self.actions.append(pi)
+
+        return delta
+
+    def remove_action(self, action):
+        """
+        Remove an action (but not the actions in its preconditions).
+        Return the delta. The actions that have it among their
+        preconditions have to be removed first (ValueError otherwise).
+        """
+
+        dependents = [pi for pi in self.actions
+                      if action in (self.preconditions.get(pi) or [])]
+        if dependents:
+            raise ValueError('Cannot remove action {0}, it is a precondition '
+                             'of {1}'.format(action, dependents))
+
+        self.actions.remove(action)
+        return self.remove_element((ACTION, action))
+
+    # =====================================================
+    # Transition system (TS)
+    # =====================================================
+
+    def add_ts_edge(self, source, target):
+        """
+        Add a transition to the TS (and its states, if they are new).
+        Only the formulas of the source are regenerated, unless a state
+        is new. Then, all of the TS formulas are. Return the delta.
+        """
+
+        new_states = [pi for pi in set([source, target]) if pi not in self.ts]
+        for pi in new_states:
+            self.ts[pi] = list()
+
+        if target in self.ts[source]:
+            return SpecificationDelta()
+        self.ts[source].append(target)
+
+        if new_states:
+            return self._update_ts(self.ts.keys(), new_states = True)
+        return self._update_ts([source])
+
+    def remove_ts_edge(self, source, target):
+        """
+        Remove a transition from the TS (but not its states).
+        Only the formulas of the source are regenerated. Return the delta.
+        """
+
+        self.ts[source].remove(target)
+        return self._update_ts([source])
+
+    def _update_ts(self, states, new_states = False):
+        """Regenerate the formulas of some TS states (and the shared ones)."""
+
+        delta = SpecificationDelta()
+
+        if new_states or self._ts_generator is None:
+            self._ts_generator = TopologyFormulaGenerator(
+                                            ts = self.ts,
+                                            outcomes = self.outcomes,
+                                            mutex_encoding = self.mutex_encoding,
+                                            gen_families = False)
+            delta.update(self._set_element(
+                                    (TOPOLOGY, None),
+                                    self._ts_generator.gen_shared_formulas()))
+
+        for pi in states:
+            delta.update(self._set_element(
+                                    (TS_STATE, pi),
+                                    self._ts_generator.gen_state_formulas(
+                                                            pi, self.ts[pi])))
+        return delta
+
+
+def _get_sections(spec):
+    """The props and formulas of a specification, per section."""
+
+    return dict((section, list(getattr(spec, section)))
+                for section in SPEC_SECTIONS)
@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+
+import os
+import json
+import time
+import functools
+
+from ..formula import GR1Formula
+from ..ltl.syntax_tree import iter_chunks
+
+"""
+Opt-in instrumentation of the generation of specifications.
+
+While it is enabled, the instrumentation records, per GR1Formula class:
+  * the number of instances and the time spent constructing them,
+  * the number of formulas, their total length (characters), and the number
+    of props of the instances.
+The GR1Formulas that are constructed by another one (e.g., the families of a
+TopologyFormulaGenerator) are part of it, and so are their formulas;
+and, per section of a GR1Specification (e.g., 'sys_trans'):
+  * the number of GR1Formulas loaded and the time spent loading them, and
+  * the number of formulas, their total length, and the number of props of
+    the GR1Formulas loaded.
+
+  from respec.spec import instrumentation
+  instrumentation.enable()
+  spec = CompleteSpecification('mission', ['stand'], ['grasp'])
+  spec.write_structured_slugs_file('specs') # also writes the reports
+  print instrumentation.get_text_report()
+  instrumentation.disable()
+
+Enabling it wraps the constructors of the GR1Formula classes (that exist at
+that point) and GR1Specification.load. Disabling it restores them, so there is
+no overhead at all while it is disabled. While it is enabled, the
+specifications that are written to a file (write_structured_slugs_file) are
+followed by a JSON (.instrumentation.json) and a text (.instrumentation.txt)
+report of everything recorded so far.
+"""
+
+REPORT_EXTENSION = '.instrumentation'
+
+_CLASS_FIELDS = ['instances', 'time', 'formulas', 'chars', 'props']
+_SECTION_FIELDS = ['loads', 'time', 'formulas', 'chars', 'props']
+
+# Class name -> stats, section -> stats (each stats is a dict of the fields)
+_class_stats = dict()
+_section_stats = dict()
+
+# The original methods that are wrapped while enabled: (class, name, method)
+_wrapped = list()
+
+# The (id of the) formula whose construction is being recorded, if any
+_constructing = list()
+
+def is_enabled():
+    return bool(_wrapped)
+
+def enable():
+    """Start recording (the stats recorded so far are kept, see reset)."""
+
+    from gr1_specification import GR1Specification
+
+    if is_enabled():
+        return
+
+    for cls in [GR1Formula] + _get_subclasses(GR1Formula):
+        if '__init__' in cls.__dict__:
+            _wrap(cls, '__init__', _instrument_init)
+    _wrap(GR1Specification, 'load', _instrument_load)
+
+def disable():
+    """Stop recording and restore the original methods."""
+
+    while _wrapped:
+        cls, name, method = _wrapped.pop()
+        setattr(cls, name, method)
+
+def reset():
+    """Forget the stats recorded so far."""
+
+    _class_stats.clear()
+    _section_stats.clear()
+
+def get_stats():
+    """The stats recorded so far, per formula class and per section."""
+
+    return {'classes': dict((name, dict(stats))
+                            for name, stats in _class_stats.items()),
+            'sections': dict((section, dict(stats))
+                             for section, stats in _section_stats.items())}
+
+def get_json_report(indent = 1):
+    return json.dumps(get_stats(), indent = indent, sort_keys = True)
+
+def get_text_report():
+    """The stats as tables, sorted by time (the slowest first)."""
+
+    lines = list()
+
+    row = '{0:<40} {1:>9} {2:>10} {3:>9} {4:>11} {5:>7}'
+    lines.append(row.format('formula class', 'instances', 'time (s)',
+                            'formulas', 'chars', 'props'))
+    for name, stats in _sorted_by_time(_class_stats):
+        lines.append(row.format(name, stats['instances'],
+                                '{:.4f}'.format(stats['time']),
+                                stats['formulas'], stats['chars'],
+                                stats['props']))
+
+    lines.append('')
+
+    row = '{0:<40} {1:>9} {2:>10} {3:>9} {4:>11} {5:>7}'
+    lines.append(row.format('section', 'loads', 'time (s)',
+                            'formulas', 'chars', 'props'))
+    for section, stats in _sorted_by_time(_section_stats):
+        lines.append(row.format(section, stats['loads'],
+                                '{:.4f}'.format(stats['time']),
+                                stats['formulas'], stats['chars'],
+                                stats['props']))
+
+    return '\n'.join(lines) + '\n'
+
+def write_reports(folder_path, name):
+    """Write the JSON and text reports. Return their paths."""
+
+    base_path = os.path.join(folder_path, name + REPORT_EXTENSION)
+
+    json_path = base_path + '.json'
+    with open(json_path, 'w') as report_file:
+        report_file.write(get_json_report())
+
+    text_path = base_path + '.txt'
+    with open(text_path, 'w') as report_file:
+        report_file.write(get_text_report())
+
+    return json_path, text_path
+
+# =========================================================
+# Wrappers
+# =========================================================
+
+def _wrap(cls, name, instrument):
+
+    method = cls.__dict__[name]
+    _wrapped.append((cls, name, method))
+    setattr(cls, name, instrument(method))
+
+def _instrument_init(init):
+
+    @functools.wraps(init)
+    def instrumented_init(self, *args, **kwargs):
+
+        # Only the outermost constructor (not those called by super, nor
+        # those of the formulas that the formula constructs)
+        if _constructing:
+            return init(self, *args, **kwargs)
+
+        _constructing.append(id(self))
+        start = time.time()
+        try:
+            init(self, *args, **kwargs)
+        finally:
+            _constructing.pop()
+        elapsed = time.time() - start
+
+        stats = _get_stats(_class_stats, self.__class__.__name__,
+                           _CLASS_FIELDS)
+        formulas = _get_formulas(self)
+        stats['instances'] += 1
+        stats['time'] += elapsed
+        stats['formulas'] += len(formulas)
+        stats['chars'] += sum(map(_get_num_chars, formulas))
+        stats['props'] += len(self.sys_props) + len(self.env_props)
+
+    return instrumented_init
+
+def _instrument_load(load):
+
+    @functools.wraps(load)
+    def instrumented_load(self, formula):
+
+        start = time.time()
+        load(self, formula)
+        elapsed = time.time() - start
+
+        stats = _get_stats(_section_stats, formula.type, _SECTION_FIELDS)
+        formulas = _get_formulas(formula)
+        stats['loads'] += 1
+        stats['time'] += elapsed
+        stats['formulas'] += len(formulas)
+        stats['chars'] += sum(map(_get_num_chars, formulas))
+        stats['props'] += len(formula.sys_props) + len(formula.env_props)
+
+    return instrumented_load
+
+def _get_stats(stats_dict, key, fields):
+
+    if key not in stats_dict:
+        stats_dict[key] = dict((field, 0) for field in fields)
+        stats_dict[key]['time'] = 0.0
+    return stats_dict[key]
+
+def _get_formulas(formula):
+    """The formulas of a GR1Formula (a single formula or a list)."""
+
+    if getattr(formula, 'families', None):
+        return sum(map(_get_formulas, formula.families), [])
+
+    formulas = getattr(formula, 'formulas', None)
+    if formulas is None:
+        return []
+    if isinstance(formulas, list):
+        return formulas
+    return [formulas]
+
+def _get_num_chars(formula):
+    """The length of a formula (without rendering it as a whole)."""
+    return sum(map(len, iter_chunks(formula)))
+
+def _get_subclasses(cls):
+
+    subclasses = list()
+    for subclass in cls.__subclasses__():
+        for c in [subclass] + _get_subclasses(subclass):
+            if c not in subclasses:
+                subclasses.append(c) # once (multiple inheritance)
+    return subclasses
+
+def _sorted_by_time(stats_dict):
+    return sorted(stats_dict.items(), key = lambda item:
+                                            (-item[1]['time'], item[0]))
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+
+import os
+import mmap
+
+from ..ltl.parser import parse
+from ..ltl.registry import PropositionRegistry
+from gr1_specification import GR1Specification, _SECTIONS
+from writers import StructuredSlugsWriter
+
+"""
+Streaming reader of .structuredslugs files, e.g., to cache prebuilt fragments
+of specifications on disk and merge them later:
+
+  spec = read_structured_slugs_file('fragments/ts/ts.structuredslugs')
+  complete_spec.merge_gr1_specifications([spec])
+
+The file is read line by line (buffered, or memory-mapped), so its text is
+never in memory as a whole. Each line of a section is a proposition or a
+formula. The formulas are kept as text, unless they are parsed into syntax
+trees (see respec.ltl.parser), which is slower, but shares the subformulas
+in memory (and with the formulas that are generated afterwards).
+Either way, the spec is written back to the same file (the formulas compare
+equal to the ones that were written). Empty lines and comments (#) are skipped.
+
+The props that integer variables encode are written as comments (see
+StructuredSlugsWriter.encoding_comment), and restored in encoded_props, so
+a fragment that is read can be merged with ones that use the encoded props.
+The origins of the formulas are not in the file, so the spec has none.
+"""
+
+_PARSED_SECTIONS = frozenset(_SECTIONS)
+
+class StructuredSlugsReader(object):
+    """
+    Read specifications in the .structuredslugs format of slugs.
+    (See https://github.com/LTLMoP/slugs/blob/master/doc/input_formats.md)
+
+    Arguments:
+      parse_formulas    (bool)  Parse the formulas into syntax trees
+      use_mmap          (bool)  Memory-map files (instead of buffering)
+
+    """
+
+    extension = StructuredSlugsWriter.extension
+
+    # File section header -> spec section
+    sections = dict(('[{}]'.format(header), section)
+                    for header, section in StructuredSlugsWriter.sections)
+
+    def __init__(self, parse_formulas = False, use_mmap = False):
+        self.parse_formulas = parse_formulas
+        self.use_mmap = use_mmap
+
+    def read(self, source, spec_name = None):
+        """
+        Read a file (path) or a file-like object into a new GR1Specification.
+        By default, the spec is named after the file.
+        """
+
+        if spec_name is None:
+            spec_name = _get_spec_name(source)
+
+        sections = dict((section, list()) for section in
+                        ['env_props', 'sys_props', 'encoded_props'] + _SECTIONS)
+        memo = dict() # The subformulas in common are parsed once
+
+        for section, text in self.iter_lines(source):
+            if self.parse_formulas and section in _PARSED_SECTIONS:
+                text = parse(text, memo)
+            sections[section].append(text)
+
+        spec = GR1Specification(spec_name)
+        spec.env_props = PropositionRegistry(sections['env_props'])
+        spec.sys_props = PropositionRegistry(sections['sys_props'])
+        for section in _SECTIONS:
+            setattr(spec, section, sections[section])
+        spec.merge_encoded_propositions(dict(map(self._parse_encoding,
+                                                 sections['encoded_props'])))
+
+        return spec
+
+    def iter_lines(self, source):
+        """
+        Yield the (spec section, text) of each prop and formula, and the
+        ('encoded_props', text) of each encoding comment.
+        """
+
+        encoding_comment = StructuredSlugsWriter.encoding_comment
+
+        section = None
+        for number, line in enumerate(self._iter_raw_lines(source), 1):
+            text = line.strip()
+            if text.startswith(encoding_comment):
+                yield 'encoded_props', text[len(encoding_comment):]
+                continue
+            if not text or text.startswith('#'):
+                continue
+
+            if text.startswith('['):
+                if text not in self.sections:
+                    raise ValueError('Unknown section {0} (line {1})'
+                                     .format(text, number))
+                section = self.sections[text]
+            elif section is None:
+                raise ValueError('Line {0} is not in a section: {1}'
+                                 .format(number, text))
+            else:
+                yield section, text
+
+    def _parse_encoding(self, text):
+        """The (variable, props) of an encoding comment, e.g., 'x: a b -'."""
+
+        var, _, values = text.partition(':')
+        if not values:
+            raise ValueError('Invalid encoding comment: {}'.format(text))
+
+        return var.strip(), [None if prop == StructuredSlugsWriter.no_prop
+                             else prop for prop in values.split()]
+
+    def _iter_raw_lines(self, source):
+
+        if not isinstance(source, basestring):
+            for line in source:
+                yield line
+            return
+
+        with open(source, 'rb') as spec_file:
+            # (Empty files cannot be mapped)
+            if self.use_mmap and os.fstat(spec_file.fileno()).st_size > 0:
+                mapped_file = mmap.mmap(spec_file.fileno(), 0,
+                                        access = mmap.ACCESS_READ)
+                try:
+                    for line in iter(mapped_file.readline, ''):
+                        yield line
+                finally:
+                    mapped_file.close()
+            else:
+                for line in spec_file:
+                    yield line
+
+
+def read_structured_slugs_file(file_path, parse_formulas = False,
+                               use_mmap = False):
+    """Read a .structuredslugs file into a GR1Specification."""
+
+    return StructuredSlugsReader(parse_formulas, use_mmap).read(file_path)
+
+def _get_spec_name(source):
+    """The name of a spec file without the extension ('' if not a file)."""
+
+    path = source if isinstance(source, basestring) \
+                  else getattr(source, 'name', '')
+    if not isinstance(path, basestring) or path.startswith('<'):
+        return '' # e.g., '<stdin>'
+
+    return os.path.splitext(os.path.basename(path))[0]
@@ -1,15 +1,70 @@
 #!/usr/bin/env python
 
 import os
+import marshal
+import struct
 import yaml
 
+try:
+    # The libyaml bindings are much faster (if PyYAML was built with them)
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 from gr1_specification import GR1Specification
 from ..formula import *
 
 """
 The module contains two classes: ActionSpecification and RobotConfiguration.
+
+Robot configuration files are parsed and validated once per process. The
+result is cached (see clear_config_cache) until the file is modified.
+
+The validated configuration is also compiled into a compact binary file next
+to the YAML file (e.g., atlas_config.yamlc, like .pyc files). The compiled
+file is loaded instead of parsing the YAML file, as long as it was compiled
+from the current version of the YAML file.
 """
 
+# Config file path -> (modification time, validated config)
+_config_cache = dict()
+
+# Header of compiled configuration files: magic, format version, YAML mtime
+COMPILED_CONFIG_SUFFIX = 'c'
+COMPILED_CONFIG_VERSION = 1
+_COMPILED_CONFIG_MAGIC = 'RSPC'
+_COMPILED_CONFIG_HEADER = struct.Struct('<4sId')
+
+# The configuration elements that are compiled into integer-indexed tables
+_CONFIG_ELEMENTS = ['transition_system', 'action_preconditions']
+
+def clear_config_cache():
+    """Forget the robot configurations that have been loaded so far."""
+    _config_cache.clear()
+
+def get_required_props(actions, preconditions):
+    """
+    The props that the actions require, directly or through the
+    preconditions of their preconditions (etc.), in the order found.
+    """
+
+    required_props = list()
+    visited = set()
+
+    # Depth-first search (pre-order)
+    stack = list()
+    for action in reversed(actions):
+        stack.extend(reversed(preconditions.get(action) or []))
+
+    while stack:
+        pc = stack.pop()
+        if pc not in visited:
+            visited.add(pc)
+            required_props.append(pc)
+            stack.extend(reversed(preconditions.get(pc) or []))
+
+    return required_props
+
 class ActionSpecification(GR1Specification):
     """
     LTL Specification containing the robot safety requirements and environment
@@ -22,6 +77,12 @@ class ActionSpecification(GR1Specification):
       preconditions dict    Dictionary encoding action preconditions.
       all_actions   list    List of actions that have been added to this spec.
 
+    The preconditions form a directed acyclic graph (DAG). An action is only
+    handled once, even if it is a precondition of several other actions.
+
+    Raises:
+      ValueError            When the preconditions of an action are cyclic.
+
     """
     def __init__(self, name = '', preconditions = {}):
         super(ActionSpecification, self).__init__(spec_name = name,
@@ -30,11 +91,13 @@ class ActionSpecification(GR1Specification):
 
         self.preconditions = preconditions
         self.all_actions = list() #TODO: Property?
+        self._handled_actions = set()
 
     def handle_new_action(self, action, act_out = True,
                           outcomes = ['completed']):
         """
         Generates formulas governing the activation and completion of actions.
+        The preconditions of the action (and theirs, etc.) are handled first.
 
         Arguments:
           action    string  The action's name (plan name, not activation prop)
@@ -42,11 +105,18 @@ class ActionSpecification(GR1Specification):
           outcomes  list    The possible outcomes of this action
 
         """
+
+        # Preconditions come before the actions that depend on them
+        for pi in self._get_preconditions_order(action):
+            self._handle_single_action(pi, act_out, outcomes)
+
+    def _handle_single_action(self, action, act_out, outcomes):
+        """Generate and load the formulas of a single action."""
         
         action_formulas = list()
 
-        # First, handle the action's preconditions (recursively)
-        if action in self.preconditions.keys() and self.preconditions[action]:
+        # First, the action's preconditions formula
+        if self._get_action_preconditions(action):
             preconditions_formula = self._gen_preconditions_formula(action,
                                                                     act_out,
                                                                     outcomes) 
@@ -62,21 +132,54 @@ class ActionSpecification(GR1Specification):
 
         self._add_action(action)
 
-    def _gen_preconditions_formula(self, action, act_out, outcomes):
+    def _get_preconditions_order(self, action):
         """
-        Generates an action's preconditions formula and calls handle_new_action
-        on the preconditions of said action in a recursive fashion.
+        Topological order of the action and the actions that it (transitively)
+        depends on through preconditions, skipping those that have been handled.
+        Only preconditions that are keys of the preconditions dictionary are
+        actions. (The others, e.g., topology props, are handled elsewhere.)
         """
 
-        action_preconditions = self.preconditions[action]
-
-        #Recursively get preconditions for this action's preconditions
-        for pc in action_preconditions:
-            # Check whether this precondition has preconditions of its own
-            if pc in self.preconditions.keys():
+        if action in self._handled_actions:
+            return []
+
+        order = list()
+        visited = set(self._handled_actions)
+
+        # Iterative depth-first search (post-order)
+        path = [action]
+        stack = [iter(self._get_action_preconditions(action))]
+
+        while stack:
+            pc = next(stack[-1], None)
+            if pc is None:
+                stack.pop()
+                done = path.pop()
+                visited.add(done)
+                order.append(done)
+            elif pc in path:
+                cycle = path[path.index(pc):] + [pc]
+                raise ValueError('The preconditions of {0} are cyclic: {1}'
+                                 .format(action, ' -> '.join(cycle)))
+            elif pc not in visited and pc in self.preconditions:
                 #FIX: Actions that don't have preconditions should 
                 # also be handled! But not the topology ones ...
-                self.handle_new_action(pc, act_out, outcomes)
+                path.append(pc)
+                stack.append(iter(self._get_action_preconditions(pc)))
+
+        return order
+
+    def _get_action_preconditions(self, action):
+        """The preconditions of an action (if any)."""
+        return self.preconditions.get(action) or []
+
+    def _gen_preconditions_formula(self, action, act_out, outcomes):
+        """
+        Generates an action's preconditions formula. (The preconditions
+        themselves are handled by handle_new_action.)
+        """
+
+        action_preconditions = self.preconditions[action]
 
         if act_out:
             formula = PreconditionsFormula(action, action_preconditions)
@@ -103,6 +206,7 @@ class ActionSpecification(GR1Specification):
         return act_out_formulas
 
     def _add_action(self, action):
+        self._handled_actions.add(action)
         self.all_actions.append(action)
         self.all_actions = list(set(self.all_actions))
 
@@ -127,7 +231,11 @@ class RobotConfiguration(object):
 
     @staticmethod
     def _load_config_from_file(robot):
-        """..."""
+        """
+        Get the (validated) configuration of the robot from the process-wide
+        cache, or load it from the file if it is new or has been modified.
+        Each call returns a copy that the caller is free to modify.
+        """
         
         # Get absolute path to this module
         module_path = os.path.dirname(__file__)
@@ -135,15 +243,26 @@ class RobotConfiguration(object):
         rel_config_path = 'config/' + config_file
 
         config_file_path = os.path.join(module_path, '..', rel_config_path)
+        config_file_path = os.path.abspath(config_file_path)
 
         try:
-            with open(config_file_path, 'r') as stream:
-                config = yaml.load(stream)
-        except IOError as e:
+            mtime = os.path.getmtime(config_file_path)
+            cached_mtime, config = _config_cache.get(config_file_path,
+                                                     (None, None))
+            if cached_mtime != mtime:
+                config = _load_compiled_config(config_file_path, mtime)
+                if config is None:
+                    with open(config_file_path, 'r') as stream:
+                        config = _validate_config(yaml.load(stream,
+                                                            Loader = SafeLoader))
+                    _write_compiled_config(config_file_path, mtime, config)
+                _config_cache[config_file_path] = (mtime, config)
+        except (IOError, OSError, ValueError, yaml.YAMLError) as e:
+            # Missing, unreadable, or malformed (see _validate_config)
             print('Failed to load {0}! {1}'.format(config_file, e))
             config = dict()
         
-        return config
+        return _copy_config(config)
 
     def _extract_configs(self):
         """Extract the individual elements of a robot configuration file."""
@@ -156,3 +275,146 @@ class RobotConfiguration(object):
             ts, preconditions = {}, {}
 
         return (ts, preconditions)
+
+
+def _validate_config(config):
+    """
+    Check the structure of a robot configuration and normalize it:
+    the transition system and the action preconditions both map
+    names (str) to lists of names. Missing preconditions become [].
+    """
+
+    if config is None:
+        config = dict()
+    if not isinstance(config, dict):
+        raise ValueError('Invalid robot configuration (expected dict): {}'
+                         .format(type(config)))
+
+    config = dict(config)
+    for element in _CONFIG_ELEMENTS:
+        if element not in config:
+            continue
+        config[element] = _validate_config_element(element, config[element])
+
+    return config
+
+def _validate_config_element(element, mapping):
+
+    if not isinstance(mapping, dict):
+        raise ValueError('Invalid {0} in robot configuration (expected dict)'
+                         .format(element))
+
+    validated = dict()
+    for key, values in mapping.items():
+        values = values or []
+        if not isinstance(key, basestring) or not isinstance(values, list) or \
+           not all([isinstance(v, basestring) for v in values]):
+            raise ValueError('Invalid {0} entry in robot configuration: '
+                             '{1}: {2}'.format(element, key, values))
+        validated[str(key)] = map(str, values)
+
+    return validated
+
+def _copy_config(config):
+    """Copy the (validated) elements of a configuration and their lists."""
+
+    config = dict(config)
+    for element in _CONFIG_ELEMENTS:
+        if element in config:
+            config[element] = dict((key, list(values)) for key, values
+                                   in config[element].items())
+    return config
+
+# =============================================================================
+# Compiled (binary) configuration files
+# =============================================================================
+
+def _get_compiled_config_path(config_file_path):
+    return config_file_path + COMPILED_CONFIG_SUFFIX
+
+def _compile_config(config):
+    """
+    Convert a validated configuration into marshal-able tables. All names
+    are stored once and the elements refer to them by index, e.g.,
+    'transition_system': [(0, [0, 1]), (1, [1, 0])] for the names [a, b].
+    """
+
+    names = list()
+    index = dict()
+
+    def get_index(name):
+        if name not in index:
+            index[name] = len(names)
+            names.append(name)
+        return index[name]
+
+    tables = dict()
+    for element in _CONFIG_ELEMENTS:
+        if element in config:
+            tables[element] = [(get_index(key), map(get_index, values))
+                               for key, values in config[element].items()]
+
+    others = dict((k, v) for k, v in config.items()
+                  if k not in _CONFIG_ELEMENTS)
+
+    return (names, tables, others)
+
+def _decompile_config(compiled_config):
+    """Inverse of _compile_config."""
+
+    names, tables, others = compiled_config
+
+    config = dict(others)
+    for element, table in tables.items():
+        config[element] = dict((names[key], [names[v] for v in values])
+                               for key, values in table)
+    return config
+
+def _load_compiled_config(config_file_path, mtime):
+    """
+    Load the compiled version of a configuration file, if it exists, it has
+    the current format version, and it was compiled from the file's current
+    version (modification time). Otherwise, return None.
+    """
+
+    compiled_path = _get_compiled_config_path(config_file_path)
+
+    try:
+        with open(compiled_path, 'rb') as stream:
+            header = stream.read(_COMPILED_CONFIG_HEADER.size)
+            magic, version, source_mtime = _COMPILED_CONFIG_HEADER.unpack(header)
+            if magic != _COMPILED_CONFIG_MAGIC or \
+               version != COMPILED_CONFIG_VERSION or source_mtime != mtime:
+                return None
+            compiled_config = marshal.load(stream)
+    except (IOError, OSError, struct.error, EOFError, ValueError, TypeError):
+        # Missing, stale, or unreadable compiled files are simply ignored
+        return None
+
+    try:
+        return _decompile_config(compiled_config)
+    except Exception:
+        # So are the ones that have the wrong shape (e.g., a bad name index),
+        # since the file is only a cache of the YAML file
+        return None
+
+def _write_compiled_config(config_file_path, mtime, config):
+    """
+    Compile a validated configuration next to its YAML file. Failures (e.g.,
+    a read-only directory) are ignored, since the file is only a cache.
+    """
+
+    compiled_path = _get_compiled_config_path(config_file_path)
+    temp_path = '{0}.{1}.tmp'.format(compiled_path, os.getpid())
+
+    try:
+        data = marshal.dumps(_compile_config(config))
+        header = _COMPILED_CONFIG_HEADER.pack(_COMPILED_CONFIG_MAGIC,
+                                              COMPILED_CONFIG_VERSION, mtime)
+        with open(temp_path, 'wb') as stream:
+            stream.write(header)
+            stream.write(data)
+        os.rename(temp_path, compiled_path) # atomic (POSIX)
+    except (IOError, OSError, ValueError):
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
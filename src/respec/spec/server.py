@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+
+import os
+import re
+import sys
+import json
+import importlib
+import BaseHTTPServer
+
+from StringIO import StringIO
+
+from writers import StructuredSlugsWriter
+
+"""
+A long-running (local) server that generates specifications.
+
+The modules that define a robot's CompleteSpecification (e.g., the atlas
+example) are imported once, when the server starts. Their robot configuration
+and shared specification fragments (see SpecificationFragments, if the module
+has it), as well as the caches of the formula classes, then stay warm between
+requests. So a request only costs the generation of what is specific to it.
+
+Requests are JSON objects that are POSTed to /spec:
+
+  {"module": "atlas_specification",     (optional if there is one module)
+   "name": "mission",
+   "initial_conditions": ["stand"],
+   "goals": ["grasp_object"],
+   "options": {"strict_order": false},  (keyword arguments, optional)
+   "output": "text"}                    (or "file", optional)
+
+The response is {"name": ..., "structuredslugs": ...} with the text of the
+specification, or {"name": ..., "path": ...} with the path of the file
+(written in the output directory of the server, so the name of a "file" request
+may only have letters, digits, '_' and '-'). Failed requests get a
+response with status 400 (500 for unexpected errors) and {"error": ...}.
+GET /status returns the loaded modules and the number of requests handled.
+
+The server only listens on localhost (by default) and handles one request at
+a time, since the formula caches are not meant to be shared between threads.
+
+Usage: python -m respec.spec.server atlas_specification --path examples
+"""
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+OUTPUT_TEXT = 'text'
+OUTPUT_FILE = 'file'
+
+# The names of the specs that are written to files (no paths)
+_FILE_NAME_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+
+class SpecificationGenerator(object):
+    """
+    Generate the specifications that are requested, with warm caches.
+
+    Arguments:
+      modules       list    Modules (or their names) defining CompleteSpecification
+      output_dir    str     Where the files of OUTPUT_FILE requests are written
+
+    """
+
+    def __init__(self, modules, output_dir = '.'):
+
+        self.modules = dict()
+        for module in modules:
+            if isinstance(module, basestring):
+                module = importlib.import_module(module)
+            self.modules[module.__name__.split('.')[-1]] = module
+
+        self.output_dir = output_dir
+        self.num_requests = 0
+
+        self._fragments = dict()
+
+    def handle(self, request):
+        """Generate the specification of a request (dict). Returns a dict."""
+
+        request = _to_str(request)
+        if not isinstance(request, dict):
+            raise ValueError('Invalid request (expected JSON object)')
+
+        module = self._get_module(request.get('module'))
+        options = dict(request.get('options') or {})
+
+        try:
+            name = request['name']
+            initial_conditions = request['initial_conditions']
+            goals = request['goals']
+        except KeyError as e:
+            raise ValueError('Missing request field: {}'.format(e))
+
+        output = request.get('output', OUTPUT_TEXT)
+        if output not in (OUTPUT_TEXT, OUTPUT_FILE):
+            raise ValueError('Unknown output: {}'.format(output))
+        if output == OUTPUT_FILE and not (isinstance(name, basestring) and
+                                          _FILE_NAME_PATTERN.match(name)):
+            raise ValueError('Invalid name for a file: {!r} (expected letters, '
+                             'digits, _ and -)'.format(name))
+
+        fragments = self._get_fragments(module, options)
+        if fragments is not None:
+            options['fragments'] = fragments
+
+        spec = module.CompleteSpecification(name, initial_conditions, goals,
+                                            **options)
+        self.num_requests += 1
+
+        if output == OUTPUT_TEXT:
+            stream = StringIO()
+            StructuredSlugsWriter().write(spec, stream)
+            return {'name': name, 'structuredslugs': stream.getvalue()}
+        else:
+            path, _ = spec.write_structured_slugs_file(self.output_dir)
+            return {'name': name, 'path': os.path.abspath(path)}
+
+    def get_status(self):
+        return {'modules': sorted(self.modules.keys()),
+                'requests': self.num_requests}
+
+    def _get_module(self, name):
+
+        if name is None and len(self.modules) == 1:
+            return self.modules.values()[0]
+        if name not in self.modules:
+            raise ValueError('Unknown module: {0} (expected one of {1})'
+                             .format(name, sorted(self.modules.keys())))
+        return self.modules[name]
+
+    def _get_fragments(self, module, options):
+        """The shared fragments of a module, per action_outcomes (if any)."""
+
+        if not hasattr(module, 'SpecificationFragments'):
+            return None
+
+        action_outcomes = options.get('action_outcomes')
+        key = (module.__name__, tuple(action_outcomes or ()))
+
+        if key not in self._fragments:
+            if action_outcomes is None:
+                fragments = module.SpecificationFragments()
+            else:
+                fragments = module.SpecificationFragments(action_outcomes)
+            self._fragments[key] = fragments
+
+        return self._fragments[key]
+
+
+class SpecificationRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Pass JSON requests to the generator of the server."""
+
+    def do_GET(self):
+
+        if self.path == '/status':
+            self._send_json(200, self.server.generator.get_status())
+        else:
+            self._send_json(404, {'error': 'Not found: ' + self.path})
+
+    def do_POST(self):
+
+        if self.path != '/spec':
+            self._send_json(404, {'error': 'Not found: ' + self.path})
+            return
+
+        try:
+            length = int(self.headers.getheader('Content-Length') or 0)
+            request = json.loads(self.rfile.read(length))
+            response = self.server.generator.handle(request)
+        except (ValueError, TypeError, NotImplementedError) as e:
+            # Invalid JSON, request, or spec inputs
+            self._send_json(400, {'error': str(e)})
+        except Exception as e:
+            self._send_json(500, {'error': '{0}: {1}'.format(
+                                            e.__class__.__name__, e)})
+        else:
+            self._send_json(200, response)
+
+    def _send_json(self, status, response):
+
+        body = json.dumps(response)
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            BaseHTTPServer.BaseHTTPRequestHandler.log_message(self, format,
+                                                              *args)
+
+def make_server(generator, host = DEFAULT_HOST, port = DEFAULT_PORT,
+                verbose = False):
+    """An HTTP server for a SpecificationGenerator (port 0: any free port)."""
+
+    server = BaseHTTPServer.HTTPServer((host, port), SpecificationRequestHandler)
+    server.generator = generator
+    server.verbose = verbose
+
+    return server
+
+def _to_str(obj):
+    """Convert the (unicode) strings of decoded JSON to str."""
+
+    if isinstance(obj, unicode):
+        return str(obj)
+    elif isinstance(obj, list):
+        return map(_to_str, obj)
+    elif isinstance(obj, dict):
+        return dict((_to_str(k), _to_str(v)) for k, v in obj.items())
+    return obj
+
+# =========================================================
+# Entry point
+# =========================================================
+
+def main(): #pragma: no cover
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description = 'ReSpeC spec server')
+    parser.add_argument('modules', nargs = '+',
+                        help = 'modules with a CompleteSpecification class')
+    parser.add_argument('--path', action = 'append', default = [],
+                        help = 'directory to import the modules from')
+    parser.add_argument('--host', default = DEFAULT_HOST)
+    parser.add_argument('--port', type = int, default = DEFAULT_PORT)
+    parser.add_argument('--output-dir', default = '.')
+    parser.add_argument('--verbose', action = 'store_true')
+    args = parser.parse_args()
+
+    sys.path[:0] = map(os.path.abspath, args.path)
+
+    generator = SpecificationGenerator(args.modules, args.output_dir)
+    server = make_server(generator, args.host, args.port, args.verbose)
+
+    print('Serving specifications on {0}:{1}'.format(*server.server_address))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__": #pragma: no cover
+    main()
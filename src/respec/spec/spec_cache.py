@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+
+import os
+import hashlib
+
+from writers import StructuredSlugsWriter
+
+"""
+Content-addressed on-disk cache of generated specifications.
+
+Specifications (.structuredslugs files) are stored in a cache directory under
+a hash of the inputs that they were generated from, e.g., the initial
+conditions, the goals, the outcomes, and the robot configuration:
+
+  cache = SpecificationCache()
+  key = get_spec_key(initial_conditions, goals, outcomes,
+                     config.ts, config.preconditions)
+  path = cache.write_structured_slugs_file(
+              key, lambda: CompleteSpecification(name, initial_conditions, goals))
+
+A repeated request only costs a hash and a stat, because the specification is
+not even constructed (formulas are generated upon construction). When the total
+size of the cached files exceeds max_size, the least recently used ones are
+removed. Since the key does not cover the code that generates the formulas,
+the cache has to be cleared when that code changes (or SPEC_CACHE_VERSION be
+incremented).
+"""
+
+# Part of every key; increment it to invalidate all of the cached specs
+SPEC_CACHE_VERSION = 1
+
+DEFAULT_SPEC_CACHE_DIR = os.path.join(os.path.expanduser('~'),
+                                      '.cache', 'respec', 'specs')
+DEFAULT_SPEC_CACHE_SIZE = 100 * 1024 * 1024 # bytes
+
+# The inputs other than containers (whose repr does not depend on the process)
+_SCALAR_TYPES = (str, int, long, float, bool, type(None))
+
+def get_spec_key(*inputs, **named_inputs):
+    """
+    Hash the inputs of a specification. Dictionaries and sets are hashed
+    independently of the order of their elements, lists and tuples are not.
+    Other inputs have to be strings, numbers, booleans or None (a TypeError
+    is raised otherwise, since e.g. the repr of an object includes its id).
+    """
+
+    canonical_inputs = (SPEC_CACHE_VERSION, _canonical(inputs),
+                        _canonical(named_inputs))
+
+    return hashlib.sha1(repr(canonical_inputs)).hexdigest()
+
+def _canonical(obj):
+    """A representation of an input that does not depend on hash order."""
+
+    if isinstance(obj, dict):
+        return ('dict', tuple(sorted((_canonical(key), _canonical(value))
+                                     for key, value in obj.items())))
+    elif isinstance(obj, (set, frozenset)):
+        return ('set', tuple(sorted(_canonical(element) for element in obj)))
+    elif isinstance(obj, (list, tuple)):
+        return ('list', tuple(_canonical(element) for element in obj))
+    elif isinstance(obj, unicode):
+        return obj.encode('utf-8')
+    elif isinstance(obj, _SCALAR_TYPES):
+        return obj
+    raise TypeError('Cannot hash an input of type {0} into a spec key: {1!r}'
+                    .format(type(obj).__name__, obj))
+
+class SpecificationCache(object):
+    """
+    A directory of .structuredslugs files, named after the keys of the specs.
+
+    Arguments:
+      cache_dir     str     The cache directory (created if missing)
+      max_size      int     The maximum total size of the files (in bytes)
+
+    """
+
+    extension = StructuredSlugsWriter.extension
+
+    def __init__(self, cache_dir = DEFAULT_SPEC_CACHE_DIR,
+                 max_size = DEFAULT_SPEC_CACHE_SIZE):
+
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+    def get_path(self, key):
+        return os.path.join(self.cache_dir, key + self.extension)
+
+    def get(self, key):
+        """The path of the cached spec (marked as recently used) or None."""
+
+        path = self.get_path(key)
+        try:
+            os.utime(path, None)
+        except OSError:
+            return None
+        return path
+
+    def put(self, key, spec):
+        """Write a spec to the cache, evict old specs and return the path."""
+
+        path = self.get_path(key)
+        temp_path = '{0}.{1}.tmp'.format(path, os.getpid())
+
+        try:
+            with open(temp_path, 'w') as spec_file:
+                StructuredSlugsWriter().write(spec, spec_file)
+            os.rename(temp_path, path) # atomic (POSIX)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        self.evict(keep = [path])
+
+        return path
+
+    def write_structured_slugs_file(self, key, build_spec):
+        """
+        Return the path of the cached spec. On a miss, call build_spec
+        (e.g., a CompleteSpecification constructor) and cache the result.
+        """
+
+        path = self.get(key)
+        if path is None:
+            path = self.put(key, build_spec())
+        return path
+
+    def evict(self, keep = []):
+        """
+        Remove the least recently used specs until the total size of the cache
+        is at most max_size (never the ones in keep). Return how many were removed.
+        """
+
+        entries = list()
+        total_size = 0
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith(self.extension):
+                continue
+            path = os.path.join(self.cache_dir, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue # removed by another process
+            entries.append((stat.st_mtime, path, stat.st_size))
+            total_size += stat.st_size
+
+        removed = 0
+        for _, path, size in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            if path in keep:
+                continue
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+            total_size -= size
+
+        return removed
+
+    def clear(self):
+        """Remove all of the cached specs."""
+
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith(self.extension):
+                os.remove(os.path.join(self.cache_dir, filename))
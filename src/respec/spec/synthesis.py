@@ -0,0 +1,280 @@
+#!/usr/bin/env python
+
+import os
+import json
+import time
+import signal
+import hashlib
+import tempfile
+import threading
+import subprocess
+
+from multiprocessing.pool import ThreadPool
+
+from writers import StructuredSlugsWriter
+
+"""
+Run a synthesizer (e.g., slugs) on many specifications in parallel.
+
+Each specification is written to a .structuredslugs file, and the synthesizer
+command is run on it in a bounded pool of worker processes, with a timeout.
+The results are cached by the hash of the specification (and the command),
+in memory and, optionally, in a directory (one JSON file per result), so a
+specification that has not changed is not synthesized again.
+
+The command is a list of arguments, in which '{input}' is replaced by the path
+of the file, e.g., '--spec={input}' (or the path is appended). The files are
+named after the spec and its hash (e.g., 'mission.3f2a....structuredslugs'),
+so specs with the same name do not overwrite each other, and a spec that is
+run again reuses its file (the work directory does not keep growing). A command that times out is stopped with all
+of the processes that it started. slugs itself reads .slugsin files, so
+for slugs the command is a script that first runs its structuredslugs compiler.
+Whether a specification is realizable is read from the output of the command
+(e.g., 'RESULT: Specification is realizable.').
+
+  runner = SynthesisRunner([sys.executable, 'synthesize.py', '{input}'],
+                           work_dir = '/tmp/specs', max_workers = 8)
+  for result in runner.run(specs):
+      print result.name, result.realizable, result.wall_time
+"""
+
+INPUT_PLACEHOLDER = '{input}'
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_TIMEOUT = 60.0 # seconds
+
+class SynthesisResult(object):
+    """
+    The outcome of running the synthesizer on a specification.
+
+    Attributes:
+      name          str     The name of the specification
+      spec_path     str     The path of the .structuredslugs file
+      key           str     The hash of the specification and the command
+      realizable    bool    Whether the spec is realizable (None if unknown)
+      returncode    int     The exit status of the command (None if not run)
+      output        str     The standard output of the command
+      error         str     The standard error of the command (or why it
+                            could not be run)
+      wall_time     float   How long the synthesizer ran (in seconds)
+      timed_out     bool    Whether the synthesizer was stopped (timeout)
+      cached        bool    Whether the result comes from the cache
+
+    """
+
+    _fields = ['key', 'realizable', 'returncode', 'output', 'error',
+               'wall_time', 'timed_out']
+
+    def __init__(self, name, spec_path, key):
+        self.name = name
+        self.spec_path = spec_path
+        self.key = key
+
+        self.realizable = None
+        self.returncode = None
+        self.output = ''
+        self.error = ''
+        self.wall_time = 0.0
+        self.timed_out = False
+        self.cached = False
+
+    @property
+    def succeeded(self):
+        """Whether the synthesizer ran to completion."""
+        return self.returncode == 0 and not self.timed_out
+
+    def to_dict(self):
+        return dict((field, getattr(self, field)) for field in self._fields)
+
+    @classmethod
+    def from_dict(cls, name, spec_path, fields):
+        result = cls(name, spec_path, fields['key'])
+        for field in cls._fields:
+            setattr(result, field, fields[field])
+        result.cached = True
+        return result
+
+
+class SynthesisRunner(object):
+    """
+    Write specifications and synthesize them in parallel.
+
+    Arguments:
+      command       list    The synthesizer command (see INPUT_PLACEHOLDER)
+      work_dir      str     Where the specification files are written
+      max_workers   int     The maximum number of concurrent synthesizers
+      timeout       float   Seconds after which a synthesizer is stopped
+      cache_dir     str     Where results are cached (in memory only if None)
+
+    """
+
+    def __init__(self, command, work_dir = '.',
+                 max_workers = DEFAULT_MAX_WORKERS,
+                 timeout = DEFAULT_TIMEOUT,
+                 cache_dir = None):
+
+        self.command = list(command)
+        self.work_dir = work_dir
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache_dir = cache_dir
+
+        self._results = dict() # Key -> result fields (a dict)
+        self._lock = threading.Lock()
+
+        for folder in [work_dir, cache_dir]:
+            if folder and not os.path.exists(folder):
+                os.makedirs(folder)
+
+    def run(self, specs):
+        """Synthesize the specifications. Returns the results (in order)."""
+
+        jobs = [self._write_spec(spec) for spec in specs]
+
+        pool = ThreadPool(max(1, min(self.max_workers, len(jobs))))
+        try:
+            return pool.map(self._run_job, jobs)
+        finally:
+            pool.close()
+            pool.join()
+
+    def _write_spec(self, spec):
+        """
+        Write a spec file and hash it (and the command). The file is written
+        under a temporary name, and then renamed after the hash.
+        """
+
+        fd, temp_path = tempfile.mkstemp(suffix = '.tmp', dir = self.work_dir)
+        try:
+            with os.fdopen(fd, 'w') as spec_file:
+                StructuredSlugsWriter().write(spec, spec_file)
+
+            key = hashlib.sha1(json.dumps(self.command))
+            with open(temp_path, 'rb') as spec_file:
+                for block in iter(lambda: spec_file.read(1 << 16), ''):
+                    key.update(block)
+            key = key.hexdigest()
+
+            file_name = '.'.join(filter(None, [spec.spec_name, key]))
+            spec_path = os.path.join(self.work_dir, file_name +
+                                     StructuredSlugsWriter.extension)
+            os.rename(temp_path, spec_path) # atomic (POSIX), same content
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        return spec.spec_name, spec_path, key
+
+    def _run_job(self, job):
+
+        name, spec_path, key = job
+
+        fields = self._get_cached_result(key)
+        if fields is not None:
+            return SynthesisResult.from_dict(name, spec_path, fields)
+
+        result = self._synthesize(name, spec_path, key)
+
+        # Timeouts and failures to run the command are not cached
+        if result.returncode is not None and not result.timed_out:
+            self._cache_result(result)
+
+        return result
+
+    def _synthesize(self, name, spec_path, key):
+
+        result = SynthesisResult(name, spec_path, key)
+
+        if any(INPUT_PLACEHOLDER in arg for arg in self.command):
+            command = [arg.replace(INPUT_PLACEHOLDER, spec_path)
+                       for arg in self.command]
+        else:
+            command = self.command + [spec_path]
+
+        start = time.time()
+        try:
+            # In a process group of its own, so that it can be stopped with
+            # its children (e.g., a compiler and then the synthesizer)
+            process = subprocess.Popen(command, stdout = subprocess.PIPE,
+                                       stderr = subprocess.PIPE,
+                                       preexec_fn = os.setsid)
+        except OSError as e:
+            result.error = 'Failed to run {0}: {1}'.format(command[0], e)
+            return result
+
+        def stop():
+            result.timed_out = True
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except OSError:
+                pass # it has just finished
+
+        timer = threading.Timer(self.timeout, stop)
+        timer.start()
+        try:
+            result.output, result.error = process.communicate()
+        finally:
+            timer.cancel()
+
+        result.wall_time = time.time() - start
+        result.returncode = process.returncode
+        if not result.timed_out:
+            result.realizable = _parse_realizability(result.output +
+                                                     result.error)
+
+        return result
+
+    def _get_cached_result(self, key):
+
+        with self._lock:
+            if key in self._results:
+                return self._results[key]
+
+        if self.cache_dir is None:
+            return None
+
+        try:
+            with open(self._get_cache_path(key)) as cache_file:
+                fields = json.load(cache_file)
+        except (IOError, ValueError):
+            return None
+
+        fields = dict((str(k), v.encode('utf-8') if isinstance(v, unicode)
+                       else v) for k, v in fields.items())
+        with self._lock:
+            self._results[key] = fields
+        return fields
+
+    def _cache_result(self, result):
+
+        fields = result.to_dict()
+        with self._lock:
+            self._results[result.key] = fields
+
+        if self.cache_dir is None:
+            return
+
+        cache_path = self._get_cache_path(result.key)
+        temp_path = '{0}.{1}.tmp'.format(cache_path, threading.current_thread().ident)
+        try:
+            with open(temp_path, 'w') as cache_file:
+                json.dump(fields, cache_file)
+            os.rename(temp_path, cache_path) # atomic (POSIX)
+        except (IOError, OSError, ValueError):
+            # The results can still be used, they just are not persisted
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _get_cache_path(self, key):
+        return os.path.join(self.cache_dir, key + '.json')
+
+
+def _parse_realizability(output):
+    """Whether the output says that the spec is (un)realizable, or None."""
+
+    output = output.lower()
+    if 'unrealizable' in output:
+        return False
+    elif 'realizable' in output:
+        return True
+    return None
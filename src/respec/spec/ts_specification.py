@@ -16,24 +16,50 @@ class TransitionSystemSpecification(GR1Specification):
     docstring for TransitionSystemSpecification
 
     Arguments:
-      ts    dict    Dictionary encoding a transition system (TS).
+      ts        dict    Dictionary encoding a transition system (TS).
+      encoding  str     ONE_HOT (default) or INTEGER. With INTEGER, the
+                        activation and completion props of the TS states
+                        are encoded by two integer variables (ts_a, ts_c),
+                        which scales better for large TSs.
+      mutex_encoding  str   How mutual exclusion is encoded (ONE_HOT only),
+                        see MUTEX_ENCODINGS. Defaults to PAIRWISE.
+      initial_props list    The props that are initially True (e.g., the
+                        initial conditions). Only used with goal_props.
+      goal_props    list    If given (even if empty), the TS is pruned to the
+                        states that matter for reaching the goal props from
+                        the initial props (see get_relevant_ts_props).
 
     """
     def __init__(self, name = '', ts = {}, 
                  props_of_interest = [], 
-                 outcomes = ['completed']):
+                 outcomes = ['completed'],
+                 encoding = ONE_HOT,
+                 mutex_encoding = PAIRWISE,
+                 initial_props = [],
+                 goal_props = None):
         super(TransitionSystemSpecification, self).__init__(spec_name = name,
                                                             env_props = [],
                                                             sys_props = [])
         
         self.ts = self._get_ts_of_interest(ts, props_of_interest)
-        self._prepare_formulas_from_ts(act_out = True, outcomes = outcomes)
+        if goal_props is not None:
+            relevant_props = get_relevant_ts_props(self.ts, initial_props,
+                                                   goal_props)
+            self.ts = self._get_ts_of_interest(self.ts, relevant_props)
+        self._prepare_formulas_from_ts(act_out = True, outcomes = outcomes,
+                                       encoding = encoding,
+                                       mutex_encoding = mutex_encoding)
 
     def _prepare_formulas_from_ts(self, act_out = True,
-                                  outcomes = ['completed']):
+                                  outcomes = ['completed'],
+                                  encoding = ONE_HOT,
+                                  mutex_encoding = PAIRWISE):
         
         if act_out:
-            formulas_from_ts = self._gen_act_out_topology_formulas(outcomes)
+            formulas_from_ts = self._gen_act_out_topology_formulas(
+                                                            outcomes,
+                                                            encoding,
+                                                            mutex_encoding)
         else:
             raise NotImplementedError('TS formulas for the vanilla GR(1) ' +
                                       'paradigm have not been implemented yet!')
@@ -41,34 +67,22 @@ class TransitionSystemSpecification(GR1Specification):
         # Finally, load the formulas (and props) into the GR1 Specification
         self.load_formulas(formulas_from_ts)
 
-    def _gen_act_out_topology_formulas(self, outcomes):
-
-        trans_relation_formula = TransitionRelationFormula(ts = self.ts)
-        topology_mutex_formula = TopologyMutexFormula(ts = self.ts)
-        single_step_formula = SingleStepChangeFormula(
-                                            ts = self.ts,
-                                            outcomes = outcomes)
-        persistence_formula = TopologyOutcomePersistenceFormula(
-                                            ts = self.ts,
-                                            outcomes = outcomes)
-        fairness_condition = TopologyFairnessConditionsFormula(
-                                            ts = self.ts,
-                                            outcomes = outcomes)
-        constraints_formula = TopologyOutcomeConstraintFormula(
-                                            ts = self.ts,
-                                            outcomes = outcomes)
-        mutex_formula = OutcomeMutexFormula(sys_props = self.ts.keys(),
-                                            outcomes = outcomes)
-        deactivation_formula = PropositionDeactivationFormula(
-                                            sys_props = self.ts.keys(),
-                                            outcomes = outcomes)
-
-        topology_formulas = [trans_relation_formula, topology_mutex_formula,
-                             single_step_formula, persistence_formula,
-                             fairness_condition, constraints_formula, 
-                             mutex_formula, deactivation_formula]
-
-        return topology_formulas
+    def _gen_act_out_topology_formulas(self, outcomes, encoding = ONE_HOT,
+                                       mutex_encoding = PAIRWISE):
+        """
+        The formulas of TransitionRelationFormula, TopologyMutexFormula,
+        SingleStepChangeFormula, TopologyOutcomePersistenceFormula,
+        TopologyFairnessConditionsFormula, TopologyOutcomeConstraintFormula,
+        OutcomeMutexFormula, and PropositionDeactivationFormula, generated
+        in a single pass over the TS.
+        """
+
+        generator = TopologyFormulaGenerator(ts = self.ts,
+                                             outcomes = outcomes,
+                                             encoding = encoding,
+                                             mutex_encoding = mutex_encoding)
+
+        return generator.families
 
     @staticmethod
     def _get_ts_of_interest(original_ts, props_of_interest):
@@ -83,3 +97,46 @@ class TransitionSystemSpecification(GR1Specification):
                 transitions = original_ts[pi]
                 ts[pi] = [t for t in transitions if t in props_of_interest]
         return ts
+
+
+def get_relevant_ts_props(ts, initial_props, goal_props):
+    """
+    The TS states that are reachable from the initial states and from which
+    a goal state is reachable, as well as the initial states themselves.
+    The props that are not in the TS are ignored. Without initial (or goal)
+    states, all of the states are considered reachable (or to reach a goal).
+    The states are returned in a deterministic (sorted) order.
+    """
+
+    initial_states = [pi for pi in initial_props if pi in ts]
+    goal_states = [pi for pi in goal_props if pi in ts]
+
+    reverse_ts = dict((pi, list()) for pi in ts)
+    for pi, adj_props in ts.items():
+        for adj_prop in adj_props:
+            reverse_ts.setdefault(adj_prop, list()).append(pi)
+
+    relevant = set(ts)
+    if initial_states:
+        relevant &= _get_reachable_states(ts, initial_states)
+    if goal_states:
+        relevant &= _get_reachable_states(reverse_ts, goal_states)
+    relevant.update(initial_states)
+
+    return sorted(relevant)
+
+def _get_reachable_states(ts, states):
+    """The states that are reachable from the given ones (breadth-first)."""
+
+    reachable = set(states)
+    frontier = list(states)
+    while frontier:
+        next_frontier = list()
+        for pi in frontier:
+            for adj_prop in ts.get(pi, []):
+                if adj_prop not in reachable:
+                    reachable.add(adj_prop)
+                    next_frontier.append(adj_prop)
+        frontier = next_frontier
+
+    return reachable
@@ -0,0 +1,365 @@
+#!/usr/bin/env python
+
+import sys
+import json
+
+from ..ltl.syntax_tree import iter_chunks
+from ..ltl.parser import parse_declaration
+from ..ltl.slugsin import SlugsInTranslator
+from ..ltl.gr1c import Gr1cTranslator
+
+"""
+Streaming writers of GR(1) specifications.
+
+A writer renders the propositions and the formulas of each section to any
+file-like object (a file, sys.stdout, the stdin of a synthesis process, etc.)
+through a BufferedSink. The sections are consumed lazily, so they can also be
+generators that produce formulas on the fly. Then, the memory used for writing
+is bounded by the size of the buffer.
+
+The sections are the attributes of a GR1Specification (or the keys of a
+dictionary): env_props, sys_props, sys_init, env_init, sys_trans, env_trans,
+sys_liveness, and env_liveness. Missing sections are written empty.
+
+The writers share the streaming (SpecificationWriter) and are registered
+per file format, so that the same spec can be written for different GR(1)
+synthesizers (see get_writer and GR1Specification.write_file):
+  * 'structuredslugs': The .structuredslugs format (for slugs' compiler.py)
+  * 'slugsin': The .slugsin format that compiler.py converts it to (which
+    saves slugs the conversion step)
+  * 'gr1c': The input format of gr1c
+  * 'json': The arguments of TuLiP's GRSpec as a JSON object
+
+"""
+
+# Size (in characters) of the buffer between a writer and its stream
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+class BufferedSink(object):
+    """
+    Collect chunks of text and write them to a file-like object in blocks
+    of (at least) buffer_size characters, i.e., with few write calls.
+
+    Arguments:
+      stream        (file-like)     Anything with a write method
+      buffer_size   (int)           The size of the blocks
+
+    """
+
+    def __init__(self, stream, buffer_size = DEFAULT_BUFFER_SIZE):
+        self.stream = stream
+        self.buffer_size = buffer_size
+
+        self._chunks = list()
+        self._size = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+    def write(self, chunk):
+        self._chunks.append(chunk)
+        self._size += len(chunk)
+        if self._size >= self.buffer_size:
+            self._write_buffer()
+
+    def flush(self):
+        """Write the buffered text and flush the stream (if possible)."""
+
+        self._write_buffer()
+        if hasattr(self.stream, 'flush'):
+            self.stream.flush()
+
+    def _write_buffer(self):
+        if self._chunks:
+            self.stream.write(''.join(self._chunks))
+            self._chunks = list()
+            self._size = 0
+
+
+class SpecificationWriter(object):
+    """
+    The base class of the writers, which only have to yield the text of a
+    spec in chunks (iter_chunks). The chunks are written through a sink.
+
+    Arguments:
+      buffer_size   (int)   Size of the buffer between writer and stream
+
+    """
+
+    # The name of the format (see get_writer) and the file extension
+    file_format = None
+    extension = None
+
+    def __init__(self, buffer_size = DEFAULT_BUFFER_SIZE):
+        self.buffer_size = buffer_size
+
+    def write(self, spec, stream = None):
+        """Write a spec (or dictionary of sections) to a stream (or stdout)."""
+
+        if stream is None:
+            stream = sys.stdout
+
+        with BufferedSink(stream, self.buffer_size) as sink:
+            for chunk in self.iter_chunks(spec):
+                sink.write(chunk)
+
+    def iter_chunks(self, spec):
+        """Yield the text of a spec in chunks (without building it)."""
+        raise NotImplementedError()
+
+    def _get_props(self, spec):
+        """
+        The env_props and sys_props of a spec, as lists, e.g., for the
+        translators, which need the integer variables before the formulas.
+        """
+
+        return dict((section, list(get_section(spec, section)))
+                    for section in ['env_props', 'sys_props'])
+
+
+class StructuredSlugsWriter(SpecificationWriter):
+    """
+    Write specifications in the .structuredslugs format of slugs.
+    (See https://github.com/LTLMoP/slugs/blob/master/doc/input_formats.md)
+
+    Arguments:
+      buffer_size   (int)   Size of the buffer between writer and stream
+
+    """
+
+    file_format = 'structuredslugs'
+    extension = '.structuredslugs'
+
+    # File sections (in order) and the corresponding spec sections
+    sections = [('INPUT', 'env_props'),
+                ('OUTPUT', 'sys_props'),
+                ('SYS_INIT', 'sys_init'),
+                ('ENV_INIT', 'env_init'),
+                ('SYS_TRANS', 'sys_trans'),
+                ('ENV_TRANS', 'env_trans'),
+                ('SYS_LIVENESS', 'sys_liveness'),
+                ('ENV_LIVENESS', 'env_liveness')]
+
+    # The props that integer variables encode (see encoded_props) are
+    # written as comments before the sections, e.g., '# ENCODING ts_a: r1_a -'
+    # for ts_a = 0 (r1_a) and ts_a = 1 (none), so that they can be read back
+    encoding_comment = '# ENCODING '
+    no_prop = '-'
+
+    def iter_chunks(self, spec):
+        """Yield the text of a spec in chunks (without building it)."""
+
+        encoded_props = dict(get_section(spec, 'encoded_props'))
+        for var, values in sorted(encoded_props.items()):
+            yield '{0}{1}: {2}\n'.format(self.encoding_comment, var, ' '.join(
+                  self.no_prop if prop is None else prop for prop in values))
+        if encoded_props:
+            yield '\n'
+
+        for header, section in self.sections:
+            yield '[{}]\n'.format(header)
+            for formula in get_section(spec, section):
+                for chunk in iter_chunks(formula):
+                    yield chunk
+                yield '\n'
+            yield '\n'
+
+
+class SlugsInWriter(StructuredSlugsWriter):
+    """
+    Write specifications in the .slugsin format of slugs, i.e., formulas in
+    prefix notation over Boolean variables (see respec.ltl.slugsin).
+
+    The integer variables are blasted into bits. A variable that does not use
+    all of the values of its bits is constrained to its range in the initial
+    conditions and the safety formulas of its side (environment or system),
+    which come after the formulas of the spec.
+
+    Arguments:
+      buffer_size   (int)   Size of the buffer between writer and stream
+
+    """
+
+    file_format = 'slugsin'
+    extension = '.slugsin'
+
+    def iter_chunks(self, spec):
+        """Yield the text of a spec in chunks (without building it)."""
+
+        props = self._get_props(spec)
+        translator = SlugsInTranslator(props['env_props'] + props['sys_props'])
+        range_formulas = self._gen_range_formulas(translator, props)
+
+        for header, section in self.sections:
+            yield '[{}]\n'.format(header)
+
+            if section in props:
+                for prop in props[section]:
+                    for variable in translator.translate_prop(prop):
+                        yield variable
+                        yield '\n'
+            else:
+                formulas = get_section(spec, section)
+                for formula in formulas:
+                    for chunk in translator.iter_chunks(formula):
+                        yield chunk
+                    yield '\n'
+                for formula in range_formulas.get(section, []):
+                    yield formula
+                    yield '\n'
+            yield '\n'
+
+    def _gen_range_formulas(self, translator, props):
+        """The range constraints of the integer variables, per section."""
+
+        range_formulas = dict()
+        for prop_section, side in [('env_props', 'env'), ('sys_props', 'sys')]:
+            for prop in props[prop_section]:
+                name, bounds = parse_declaration(prop)
+                if bounds is None:
+                    continue
+                variable = translator.variables[name]
+                for section, primed in [(side + '_init', False),
+                                        (side + '_trans', True)]:
+                    formula = variable.get_range_formula(primed)
+                    if formula is not None:
+                        range_formulas.setdefault(section, []).append(formula)
+        return range_formulas
+
+
+class Gr1cWriter(SpecificationWriter):
+    """
+    Write specifications in the input format of gr1c (see respec.ltl.gr1c).
+    (See https://github.com/slivingston/gr1c/blob/master/doc/spc_format.md)
+
+    The formulas of a section are conjoined, one per line, and the temporal
+    operators of gr1c are added to the safety ([]) and liveness ([]<>) ones.
+
+    Arguments:
+      buffer_size   (int)   Size of the buffer between writer and stream
+
+    """
+
+    file_format = 'gr1c'
+    extension = '.spc'
+
+    # File sections (in order), the corresponding spec sections, and the
+    # temporal operator of their formulas
+    sections = [('ENVINIT', 'env_init', ''),
+                ('ENVTRANS', 'env_trans', '[]'),
+                ('ENVGOAL', 'env_liveness', '[]<>'),
+                ('SYSINIT', 'sys_init', ''),
+                ('SYSTRANS', 'sys_trans', '[]'),
+                ('SYSGOAL', 'sys_liveness', '[]<>')]
+
+    def iter_chunks(self, spec):
+        """Yield the text of a spec in chunks (without building it)."""
+
+        props = self._get_props(spec)
+        translator = Gr1cTranslator(props['env_props'] + props['sys_props'])
+
+        for header, section in [('ENV', 'env_props'), ('SYS', 'sys_props')]:
+            yield '{}:'.format(header)
+            for prop in props[section]:
+                yield ' '
+                yield translator.translate_prop(prop)
+            yield ';\n'
+        yield '\n'
+
+        for header, section, operator in self.sections:
+            yield '{}:'.format(header)
+            separator = ' '
+            for formula in get_section(spec, section):
+                yield separator
+                separator = '\n  & '
+                if operator:
+                    yield operator + '('
+                for chunk in translator.iter_chunks(formula):
+                    yield chunk
+                if operator:
+                    yield ')'
+            yield ';\n'
+
+
+class JSONWriter(SpecificationWriter):
+    """
+    Write specifications as a JSON object of the arguments of TuLiP's GRSpec
+    (env_vars, sys_vars, env_init, env_safety, env_prog, sys_init, etc.)
+    The variables map to 'boolean' or to the bounds of integer variables, and
+    the formulas are in the syntax of gr1c (see respec.ltl.gr1c).
+    (See https://tulip-control.sourceforge.io/api-doc/tulip.spec.html)
+
+    Arguments:
+      buffer_size   (int)   Size of the buffer between writer and stream
+
+    """
+
+    file_format = 'json'
+    extension = '.json'
+
+    # The keys (in order) and the corresponding spec sections
+    sections = [('env_init', 'env_init'),
+                ('env_safety', 'env_trans'),
+                ('env_prog', 'env_liveness'),
+                ('sys_init', 'sys_init'),
+                ('sys_safety', 'sys_trans'),
+                ('sys_prog', 'sys_liveness')]
+
+    def iter_chunks(self, spec):
+        """Yield the text of a spec in chunks (without building it)."""
+
+        props = self._get_props(spec)
+        translator = Gr1cTranslator(props['env_props'] + props['sys_props'])
+
+        yield '{'
+        for key, section in [('env_vars', 'env_props'),
+                             ('sys_vars', 'sys_props')]:
+            yield '\n {}: {{'.format(json.dumps(key))
+            separator = ''
+            for prop in props[section]:
+                name, bounds = parse_declaration(prop)
+                yield '{0}\n  {1}: {2}'.format(separator, json.dumps(name),
+                                               json.dumps(bounds or 'boolean'))
+                separator = ','
+            yield '},'
+
+        for i, (key, section) in enumerate(self.sections):
+            yield '\n {}: ['.format(json.dumps(key))
+            separator = ''
+            for formula in get_section(spec, section):
+                yield separator
+                yield '\n  '
+                yield json.dumps(translator.translate(formula))
+                separator = ','
+            yield ']' if i == len(self.sections) - 1 else '],'
+        yield '\n}\n'
+
+
+# The writers of the file formats (see register_writer)
+WRITERS = dict((writer_class.file_format, writer_class) for writer_class
+               in [StructuredSlugsWriter, SlugsInWriter, Gr1cWriter, JSONWriter])
+
+def register_writer(writer_class):
+    """Make a writer (a SpecificationWriter) available by its file format."""
+
+    WRITERS[writer_class.file_format] = writer_class
+    return writer_class
+
+def get_writer(file_format, buffer_size = DEFAULT_BUFFER_SIZE):
+    """A writer of a file format (e.g., 'structuredslugs' or 'gr1c')."""
+
+    if file_format not in WRITERS:
+        raise ValueError('Unknown file format: {0} (expected one of {1})'
+                         .format(file_format, sorted(WRITERS.keys())))
+
+    return WRITERS[file_format](buffer_size)
+
+def get_section(spec, section):
+    """A section of a spec (or of a dictionary of sections), [] if missing."""
+
+    if isinstance(spec, dict):
+        return spec.get(section, [])
+    return getattr(spec, section, [])
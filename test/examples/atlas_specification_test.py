@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+import os
+import sys
+from StringIO import StringIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'examples'))
+
+from atlas_specification import CompleteSpecification, \
+                                SpecificationFragments, \
+                                build_complete_specifications
+
+import unittest
+
+
+def get_text(spec):
+    stream = StringIO()
+    spec.write_structured_slugs(stream)
+    return stream.getvalue()
+
+
+class BuildCompleteSpecificationsTests(unittest.TestCase):
+    """Specifications that share fragments are the same as separate ones."""
+
+    def setUp(self):
+
+        self.requests = [(['stand'], ['grasp_object']),
+                         (['stand'], ['walk']),
+                         (['stand_prep'], ['pickup_object', 'manipulate']),
+                         (['stand'], ['grasp_object'])]
+
+    def tearDown(self):
+
+        del self.requests
+
+    def test_shared_fragments(self):
+
+        for kwargs in [dict(), dict(action_outcomes = ['completed'],
+                                    strict_order = False)]:
+            specs = build_complete_specifications('sweep', self.requests,
+                                                  **kwargs)
+
+            self.assertEqual(len(self.requests), len(specs))
+            for i, (spec, (initial_conditions, goals)) in \
+                    enumerate(zip(specs, self.requests)):
+                separate_spec = CompleteSpecification('sweep_{}'.format(i),
+                                                      initial_conditions,
+                                                      goals, **kwargs)
+                self.assertEqual('sweep_{}'.format(i), spec.spec_name)
+                self.assertEqual(get_text(separate_spec), get_text(spec))
+
+    def test_action_outcomes_of_the_fragments(self):
+
+        fragments = SpecificationFragments(['completed'])
+
+        spec = CompleteSpecification('spec', ['stand'], ['grasp_object'],
+                                     fragments = fragments)
+        separate_spec = CompleteSpecification('spec', ['stand'],
+                                              ['grasp_object'],
+                                              action_outcomes = ['completed'])
+        self.assertEqual(get_text(separate_spec), get_text(spec))
+
+        self.assertRaises(ValueError, CompleteSpecification, 'spec',
+                          ['stand'], ['grasp_object'],
+                          action_outcomes = ['completed', 'failed'],
+                          fragments = fragments)
+
+
+# =============================================================================
+# Entry point
+# =============================================================================
+
+if __name__ == '__main__':
+    # Run all tests
+    unittest.main()
@@ -77,6 +77,22 @@ class ActionFormulaGenerationTests(unittest.TestCase):
         self.assertEqual('env_trans', formula.type)
         self.assertItemsEqual(expected_formulas, formula.formulas)
 
+    def test_mutex_formula_sequential_encoding(self):
+
+        formula = OutcomeMutexFormula(['dance'],
+                                      ['completed', 'failed', 'preempted'],
+                                      mutex_encoding = SEQUENTIAL)
+
+        expected_formulas = ['next(dance_c) -> next(dance_out_s0)',
+                             'next(dance_f) -> next(dance_out_s1)',
+                             'next(dance_out_s0) -> next(dance_out_s1)',
+                             'next(dance_f) -> ! next(dance_out_s0)',
+                             'next(dance_p) -> ! next(dance_out_s1)']
+
+        self.assertItemsEqual(expected_formulas, formula.formulas)
+        self.assertItemsEqual(['dance_c', 'dance_f', 'dance_p',
+                               'dance_out_s0', 'dance_out_s1'], formula.env_props)
+
     def test_mutex_single_outcome(self):
 
         formula = OutcomeMutexFormula(['dance'], outcomes = ['completed'])
@@ -268,6 +284,17 @@ class TSFormulaGenerationTests(unittest.TestCase):
 
         self.assertItemsEqual(formula.formulas, expected_formulas)
 
+    def test_topology_mutex_formula_binary_encoding(self):
+
+        formula = TopologyMutexFormula(self.ts, mutex_encoding = BINARY)
+
+        aux_props = [pi for pi in formula.env_props if '_mutex_b' in pi]
+
+        # At least one (a disjunction) and at most one (3 implications)
+        self.assertEqual(4, len(formula.formulas))
+        self.assertEqual(2, len(aux_props))
+        self.assertEqual(5, len(formula.env_props))
+
     def test_transition_relation_formula(self):
 
         formula = TransitionRelationFormula(self.ts)
@@ -424,6 +451,151 @@ class TSFormulaGenerationTests(unittest.TestCase):
 
         self.assertItemsEqual([expected_formula], formula.formulas)
 
+    def test_topology_formula_generator(self):
+        """The single-pass generator matches the individual formulas."""
+
+        for encoding in [ONE_HOT, INTEGER]:
+
+            generator = TopologyFormulaGenerator(ts = self.ts,
+                                                 outcomes = self.outcomes,
+                                                 encoding = encoding)
+
+            expected_families = [
+                TransitionRelationFormula(self.ts, encoding),
+                TopologyMutexFormula(self.ts, encoding),
+                SingleStepChangeFormula(self.ts, self.outcomes, encoding),
+                TopologyOutcomePersistenceFormula(self.ts, self.outcomes,
+                                                  encoding),
+                TopologyFairnessConditionsFormula(self.ts, self.outcomes,
+                                                  encoding),
+                TopologyOutcomeConstraintFormula(self.ts, self.outcomes,
+                                                 encoding),
+                OutcomeMutexFormula([], self.outcomes, self.ts, encoding),
+                PropositionDeactivationFormula([], self.outcomes, self.ts,
+                                               encoding)]
+
+            self.assertEqual(len(expected_families), len(generator.families))
+
+            for expected, family in zip(expected_families, generator.families):
+                self.assertEqual(expected.type, family.type)
+                self.assertEqual(expected.formulas, family.formulas)
+                self.assertItemsEqual(expected.env_props, family.env_props)
+                self.assertItemsEqual(expected.sys_props, family.sys_props)
+                self.assertEqual(expected.encoded_props, family.encoded_props)
+
+
+class IntegerEncodingTests(unittest.TestCase):
+    """Test the topology formulas when TS props are integer variables"""
+
+    def setUp(self):
+        """Gets called before every test case."""
+
+        self.ts = {'r1': ['r1', 'r2', 'r3'],
+                   'r2': ['r2'],
+                   'r3': ['r3', 'r1']}
+
+    def tearDown(self):
+        """Gets called after every test case."""
+
+        del self.ts
+
+    def test_unknown_encoding_raises_exception(self):
+
+        self.assertRaises(ValueError, ActivationOutcomesFormula,
+                          sys_props = [], ts = self.ts, encoding = 'gray')
+
+    def test_integer_variables(self):
+
+        formula = ActivationOutcomesFormula(sys_props = ['dance'],
+                                            outcomes = ['completed', 'failed'],
+                                            ts = self.ts,
+                                            encoding = INTEGER)
+
+        expected_encoded_props = {'ts_a': ['r1_a', 'r2_a', 'r3_a', None],
+                                  'ts_c': ['r1_c', 'r2_c', 'r3_c']}
+
+        self.assertDictEqual(expected_encoded_props, formula.encoded_props)
+        self.assertItemsEqual(['dance_a', 'ts_a:0...3'], formula.sys_props)
+        self.assertItemsEqual(['dance_c', 'dance_f', 'r1_f', 'r2_f', 'r3_f',
+                               'ts_c:0...2'], formula.env_props)
+        self.assertItemsEqual(['(ts_c = 1)', 'r2_f'],
+                              formula.outcome_props['r2'])
+
+    def test_topology_mutex_formula(self):
+
+        formula = TopologyMutexFormula(self.ts, encoding = INTEGER)
+
+        self.assertEqual('env_trans', formula.type)
+        self.assertItemsEqual(list(), formula.formulas)
+        self.assertItemsEqual(['ts_c:0...2'], formula.env_props)
+
+    def test_transition_relation_formula(self):
+
+        formula = TransitionRelationFormula(self.ts, encoding = INTEGER)
+
+        expected_formulas = [
+            'next(ts_c = 0) -> (next(ts_a = 0) | next(ts_a = 1) | ' + \
+                               'next(ts_a = 2) | next(ts_a = 3))',
+            'next(ts_c = 1) -> (next(ts_a = 1) | next(ts_a = 3))',
+            'next(ts_c = 2) -> (next(ts_a = 2) | next(ts_a = 0) | ' + \
+                               'next(ts_a = 3))']
+
+        self.assertItemsEqual(expected_formulas, formula.formulas)
+
+    def test_single_step_change_formula(self):
+
+        formula = SingleStepChangeFormula(self.ts, encoding = INTEGER)
+
+        expected_formula = '((ts_c = 1) & (ts_a = 1)) -> next(ts_c = 1)'
+
+        self.assertIn(expected_formula, formula.formulas)
+        self.assertEqual(6, len(formula.formulas))
+
+    def test_topology_outcome_constraint(self):
+
+        formula = TopologyOutcomeConstraintFormula(self.ts,
+                                                   ['completed', 'failed'],
+                                                   encoding = INTEGER)
+
+        self.assertIn('(! (ts_c = 0) & ! (ts_a = 0)) -> next(! (ts_c = 0))',
+                      formula.formulas)
+        self.assertIn('(! r1_f & ! (ts_a = 0)) -> next(! r1_f)',
+                      formula.formulas)
+
+    def test_topology_fairness_conditions(self):
+
+        formula = TopologyFairnessConditionsFormula(self.ts, encoding = INTEGER)
+
+        expected_formula = '((((ts_a = 0) & next(ts_c = 0)) | ' + \
+                              '((ts_a = 1) & next(ts_c = 1)) | ' + \
+                              '((ts_a = 2) & next(ts_c = 2))) | (ts_a = 3))'
+
+        self.assertItemsEqual([expected_formula], formula.formulas)
+
+    def test_deactivation_formula(self):
+
+        formula = PropositionDeactivationFormula(sys_props = [],
+                                                 ts = self.ts,
+                                                 encoding = INTEGER)
+
+        self.assertIn('((ts_a = 2) & next(ts_c = 2)) -> next(! (ts_a = 2))',
+                      formula.formulas)
+
+    def test_initial_conditions(self):
+
+        encoded_props = {'ts_a': ['r1_a', 'r2_a', 'r3_a', None],
+                         'ts_c': ['r1_c', 'r2_c', 'r3_c']}
+
+        sys_init = SystemInitialConditions(['dance_a', 'ts_a:0...3'],
+                                           true_props = [],
+                                           encoded_props = encoded_props)
+        env_init = EnvironmentInitialConditions(['dance_c', 'ts_c:0...2'],
+                                                true_props = ['r2'],
+                                                encoded_props = encoded_props)
+
+        self.assertItemsEqual(['! dance_a', '(ts_a = 3)'], sys_init.formulas)
+        self.assertItemsEqual(['! dance_c', '(ts_c = 1)'], env_init.formulas)
+
 
 class GoalFormulaGenerationTests(unittest.TestCase):
     """Test the generation of Activation-Outcomes liveness requirements"""
@@ -556,6 +728,31 @@ class ICFormulaGenerationTests(unittest.TestCase):
 
         self.assertItemsEqual(expected_formula, formula.formulas)
 
+    def test_initial_conditions_batch(self):
+
+        sys_props = ['dance_a', 'sleep_a', 'ts_a:0...3']
+        env_props = ['dance_c', 'sleep_c', 'ts_c:0...2', 'dance_f']
+        encoded_props = {'ts_a': ['r1_a', 'r2_a', 'r3_a', None],
+                         'ts_c': ['r1_c', 'r2_c', 'r3_c']}
+        batch = [['dance', 'r3'], [], ['sleep', 'r1', 'r2']]
+
+        initial_conditions = gen_initial_conditions(sys_props, env_props,
+                                                    batch, encoded_props)
+
+        self.assertEqual(len(batch), len(initial_conditions))
+        for true_props, (sys_init, env_init) in zip(batch, initial_conditions):
+            self.assertEqual(SystemInitialConditions(sys_props, true_props,
+                                                     encoded_props).formulas,
+                             sys_init)
+            self.assertEqual(EnvironmentInitialConditions(env_props, true_props,
+                                                          encoded_props).formulas,
+                             env_init)
+
+        self.assertEqual(['dance_a', '! sleep_a', '(ts_a = 2)'],
+                         initial_conditions[0][0])
+        self.assertEqual(['! dance_c', 'sleep_c', '! dance_f', '(ts_c = 0)'],
+                         initial_conditions[2][1])
+
 # =============================================================================
 # Entry point
 # =============================================================================
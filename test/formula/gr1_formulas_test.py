@@ -1,8 +1,10 @@
 #!/usr/bin/env python
 
 import os
+import itertools
 
 from respec.formula.gr1_formulas import *
+from respec.ltl.syntax_tree import *
 
 import unittest
 
@@ -59,13 +61,152 @@ class FormulaGenerationTests(unittest.TestCase):
         adj_relation = formula.gen_sys_trans_formulas()
 
         expected_adj_relation = [
-            "y1 -> (next(y1 & ! y3 & ! y2) | next(y2 & ! y1 & ! y3))",
+            "y1 -> (next(y1 & ! y2 & ! y3) | next(y2 & ! y1 & ! y3))",
             "y2 -> (next(y2 & ! y1 & ! y3) | next(y3 & ! y1 & ! y2))",
             "y3 -> (next(y3 & ! y1 & ! y2) | next(y2 & ! y1 & ! y3))"
         ]
 
         self.assertItemsEqual(adj_relation, expected_adj_relation)
 
+    def test_phi_props_are_memoized(self):
+
+        formula = GR1Formula(self.env_props, self.sys_props)
+
+        phi = formula._gen_phi_prop('y2')
+
+        self.assertIn(phi, ['(y2 & ! y1 & ! y3)', '(y2 & ! y3 & ! y1)'])
+        self.assertIs(phi, formula._gen_phi_prop('y2'))
+        self.assertIn(formula._gen_phi_prop('x1'), ['(x1 & ! x2)'])
+        self.assertRaises(ValueError, formula._gen_phi_prop, 'z')
+
+    def test_phi_props_after_new_props(self):
+
+        formula = GR1Formula(self.env_props, ['y1', 'y2'])
+
+        self.assertEqual('(y1 & ! y2)', formula._gen_phi_prop('y1'))
+
+        formula.gen_memory_prop('y1') # adds a system prop
+
+        self.assertEqual('(y1 & ! y2 & ! y1_m)', formula._gen_phi_prop('y1'))
+
+    def test_phi_props_after_same_length_edits(self):
+
+        formula = GR1Formula(self.env_props, ['y1', 'y2'])
+
+        self.assertEqual('(y1 & ! y2)', formula._gen_phi_prop('y1'))
+
+        formula.sys_props[1] = 'y3' # in place, same length
+        self.assertEqual('(y1 & ! y3)', formula._gen_phi_prop('y1'))
+
+        formula.sys_props = ['y1', 'y4'] # a plain list
+        self.assertEqual('(y1 & ! y4)', formula._gen_phi_prop('y1'))
+        formula.sys_props[1] = 'y5'
+        self.assertEqual('(y1 & ! y5)', formula._gen_phi_prop('y1'))
+
+    def test_phi_props_without_memoization(self):
+
+        formula = GR1Formula(self.env_props, self.sys_props)
+        formula.cache_phi_props = False
+
+        phi = formula._gen_phi_prop('y3')
+
+        self.assertEqual(formula._build_phi_prop('y3'), phi)
+        self.assertFalse(getattr(formula, '_phi_cache', None))
+
+
+class MutexEncodingTests(unittest.TestCase):
+    """The (linear-size) encodings allow exactly one of the props."""
+
+    def setUp(self):
+
+        self.props = ['y1', 'y2', 'y3', 'y4', 'y5', 'y6', 'y7']
+
+    def tearDown(self):
+
+        del self.props
+
+    def _assert_exactly_one(self, encoding):
+
+        formula = GR1Formula(env_props = [], sys_props = list(self.props))
+        mutex = formula.gen_mutex_formulas(self.props, False,
+                                           encoding = encoding)
+        aux_props = formula.sys_props[len(self.props):]
+
+        for values in itertools.product([False, True], repeat = len(self.props)):
+            assignment = dict(zip(self.props, values))
+            satisfiable = any(_holds(mutex, dict(assignment, **dict(zip(aux_props, aux))))
+                              for aux in itertools.product([False, True],
+                                                           repeat = len(aux_props)))
+            self.assertEqual(satisfiable, sum(values) == 1)
+
+        return mutex, aux_props
+
+    def test_sequential(self):
+
+        mutex, aux_props = self._assert_exactly_one(SEQUENTIAL)
+
+        self.assertEqual(len(aux_props), len(self.props) - 1)
+        self.assertEqual(len(mutex), 3 * len(self.props) - 4 + 1)
+
+    def test_commander(self):
+
+        mutex, aux_props = self._assert_exactly_one(COMMANDER)
+
+        self.assertItemsEqual(aux_props, ['y1_mutex_c0_0', 'y1_mutex_c0_1',
+                                          'y1_mutex_c0_2'])
+
+    def test_binary(self):
+
+        mutex, aux_props = self._assert_exactly_one(BINARY)
+
+        self.assertItemsEqual(aux_props, ['y1_mutex_b0', 'y1_mutex_b1',
+                                          'y1_mutex_b2'])
+        self.assertEqual(mutex[0], '(y1 | y2 | y3 | y4 | y5 | y6 | y7)')
+        self.assertIn('y6 -> (y1_mutex_b0 & ! y1_mutex_b1 & y1_mutex_b2)', mutex)
+
+    def test_auto(self):
+
+        formula = GR1Formula(env_props = [], sys_props = [])
+
+        small = formula.gen_mutex_formulas(self.props[:3], True,
+                                           encoding = AUTO)
+        large = formula.gen_mutex_formulas(self.props, True, encoding = AUTO,
+                                           aux_prefix = 'y', aux_props = 'env_props')
+
+        self.assertIn('next(y1) <-> (! next(y2) & ! next(y3))', small)
+        self.assertIn('next(y7) -> (! next(y_b0) & next(y_b1) & next(y_b2))', large)
+        self.assertItemsEqual(formula.env_props, ['y_b0', 'y_b1', 'y_b2'])
+        self.assertItemsEqual(formula.sys_props, [])
+
+    def test_unknown_encoding(self):
+
+        formula = GR1Formula(env_props = [], sys_props = [])
+
+        self.assertRaises(ValueError, formula.gen_mutex_formulas,
+                          self.props, True, 'one-of-a-kind')
+
+
+def _holds(formulas, assignment):
+    """Evaluate the conjunction of (non-temporal) formulas."""
+
+    def evaluate(node):
+        if node.op == ATOM:
+            return assignment[node.args]
+        args = map(evaluate, node.args)
+        if node.op == NEG:
+            return not args[0]
+        elif node.op == CONJ:
+            return all(args)
+        elif node.op == DISJ:
+            return any(args)
+        elif node.op == IMPLIES:
+            return not args[0] or args[1]
+        elif node.op == IFF:
+            return args[0] == args[1]
+        return args[0] # PAREN
+
+    return all(evaluate(atom(f)) for f in formulas)
+
 
 class SystemLivenessTests(unittest.TestCase):
 
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+
+import itertools
+
+from respec.ltl import ltl as LTL
+from respec.ltl.evaluator import FormulaEvaluator
+
+import unittest
+
+
+class FormulaEvaluatorTests(unittest.TestCase):
+
+    def setUp(self):
+
+        self.evaluator = FormulaEvaluator(['a', 'b', 'x:0...3'])
+
+    def tearDown(self):
+
+        del self.evaluator
+
+    def test_boolean_operators(self):
+
+        formulas = {'a & ! b': lambda a, b: a and not b,
+                    '! a | b': lambda a, b: not a or b,
+                    'a -> ! b': lambda a, b: not a or not b,
+                    '! a <-> b': lambda a, b: (not a) == b,
+                    '! (a & b)': lambda a, b: not (a and b)}
+
+        for formula, expected in formulas.items():
+            holds = self.evaluator.compile(formula)
+            for a, b in itertools.product([False, True], repeat = 2):
+                self.assertEqual(expected(a, b), holds({'a': a, 'b': b}))
+
+        self.assertTrue(self.evaluator.compile('TRUE')({}))
+        self.assertFalse(self.evaluator.compile('FALSE')({}))
+
+    def test_next_and_integer_variables(self):
+
+        holds = self.evaluator.compile(LTL.implication('a',
+                                                       LTL.next(LTL.eq('x', 2))))
+
+        self.assertTrue(holds({'a': True, "x'": 2}))
+        self.assertFalse(holds({'a': True, "x'": 3}))
+        self.assertTrue(holds({'a': False, "x'": 3}))
+
+        self.assertRaises(ValueError, self.evaluator.compile, 'x = 5')
+
+
+# =============================================================================
+# Entry point
+# =============================================================================
+
+if __name__ == '__main__':
+    # Run all tests
+    unittest.main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+
+from respec.ltl import ltl as LTL
+from respec.ltl.gr1c import Gr1cTranslator
+
+import unittest
+
+
+class Gr1cTranslatorTests(unittest.TestCase):
+
+    def setUp(self):
+
+        self.translator = Gr1cTranslator(['a', 'b', 'x:0...3'])
+
+    def tearDown(self):
+
+        del self.translator
+
+    def test_boolean_operators(self):
+
+        translate = self.translator.translate
+
+        self.assertEqual('(a & b & !c)',
+                         translate(LTL.conj(['a', 'b', LTL.neg('c')])))
+        self.assertEqual('!(a | b)', translate(LTL.neg(LTL.disj(['a', 'b']))))
+        self.assertEqual('(a -> (b <-> c))',
+                         translate(LTL.implication('a', LTL.iff('b', 'c'))))
+        self.assertEqual('True', translate('TRUE'))
+
+    def test_next_operator(self):
+
+        translate = self.translator.translate
+
+        self.assertEqual("((a & !b) -> c')", translate('(a & ! b) -> next(c)'))
+        self.assertEqual("(a' | !b')",
+                         translate(LTL.next(LTL.disj(['a', LTL.neg('b')]))))
+        self.assertRaises(ValueError, translate, LTL.next(LTL.next('a')))
+
+    def test_integer_variables(self):
+
+        translate = self.translator.translate
+
+        self.assertEqual('x [0,3]', self.translator.translate_prop('x:0...3'))
+        self.assertEqual('a', self.translator.translate_prop('a'))
+
+        self.assertEqual("(!(x = 1) -> (x' = 2))",
+                         translate(LTL.implication(LTL.neg(LTL.eq('x', 1)),
+                                                   LTL.next(LTL.eq('x', 2)))))
+        self.assertRaises(ValueError, translate, LTL.eq('x', 4))
+        self.assertRaises(ValueError, translate, LTL.eq('y', 0))
+
+
+# =============================================================================
+# Entry point
+# =============================================================================
+
+if __name__ == '__main__':
+    # Run all tests
+    unittest.main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+
+import pickle
+
+from respec.ltl import ltl as LTL
+from respec.ltl.syntax_tree import *
+
+import unittest
+
+
+class OperatorRenderingTests(unittest.TestCase):
+    """The operators render the same text as the old string concatenation."""
+
+    def test_boolean_operators(self):
+
+        self.assertEqual('(a & b & c)', str(LTL.conj(['a', 'b', 'c'])))
+        self.assertEqual('(a | b)', str(LTL.disj(['a', 'b'])))
+        self.assertEqual('! a', str(LTL.neg('a')))
+        self.assertEqual('a -> b', str(LTL.implication('a', 'b')))
+        self.assertEqual('a <-> b', str(LTL.iff('a', 'b')))
+        self.assertEqual('(a)', str(LTL.paren('a')))
+
+    def test_single_term_is_passed_through(self):
+
+        self.assertEqual('a', LTL.conj(['a']))
+        self.assertEqual('a', LTL.disj(['a']))
+
+    def test_next_operator(self):
+
+        self.assertEqual('next(a)', str(LTL.next('a')))
+        self.assertEqual('next(! a)', str(LTL.next(LTL.neg('a'))))
+        self.assertEqual('next(a & b)', str(LTL.next(LTL.conj(['a', 'b']))))
+        self.assertEqual('next(a & b)', str(LTL.next('(a & b)')))
+        # Same quirk as before: the text starts with '(' and ends with ')'
+        lhs_rhs = LTL.implication(LTL.conj(['a', 'b']), LTL.disj(['c', 'd']))
+        self.assertEqual('next(a & b) -> (c | d)', str(LTL.next(lhs_rhs)))
+
+    def test_nested_formula(self):
+
+        formula = LTL.implication(LTL.conj(['r1_c', LTL.conj(['r1_a', '! r2_a'])]),
+                                  LTL.disj([LTL.next('r1_c'), LTL.next('r1_f')]))
+
+        expected = '(r1_c & (r1_a & ! r2_a)) -> (next(r1_c) | next(r1_f))'
+
+        self.assertEqual(expected, str(formula))
+        self.assertEqual(expected, render(formula))
+        self.assertEqual(expected, ''.join(iter_chunks(formula)))
+
+
+class HashConsingTests(unittest.TestCase):
+    """Identical subtrees are the same (immutable) object."""
+
+    def test_structural_sharing(self):
+
+        phi_1 = LTL.conj(['r1_a', LTL.neg('r2_a'), LTL.neg('r3_a')])
+        phi_2 = LTL.conj(['r1_a', LTL.neg('r2_a'), LTL.neg('r3_a')])
+
+        self.assertIs(phi_1, phi_2)
+        self.assertIs(LTL.next(phi_1), LTL.next(phi_2))
+        self.assertIs(phi_1.args[1], LTL.neg('r2_a'))
+
+    def test_equality_and_hash_like_strings(self):
+
+        formula = LTL.implication('a', LTL.next('b'))
+
+        self.assertEqual(formula, 'a -> next(b)')
+        self.assertEqual('a -> next(b)', formula)
+        self.assertNotEqual(formula, 'a -> b')
+        self.assertEqual(hash('a -> next(b)'), hash(formula))
+        self.assertIn('a -> next(b)', set([formula]))
+        self.assertItemsEqual(['a -> next(b)'], [formula])
+
+    def test_equality_does_not_render(self):
+
+        formula = LTL.conj(['a', LTL.next('b')])
+        other = LTL.conj(['a', 'b'])
+        map(hash, [formula, other]) # Rendered once (the hashes are kept)
+
+        renders = list()
+        original_str = FormulaNode.__str__
+        FormulaNode.__str__ = lambda node: renders.append(node) or \
+                                           original_str(node)
+        try:
+            self.assertEqual(formula, LTL.conj(['a', LTL.next('b')]))
+            self.assertNotEqual(formula, other)
+            self.assertNotEqual(formula, '(a & b)')
+            self.assertEqual([], renders)
+
+            # Only the candidates (same hash) are compared as text
+            self.assertEqual(formula, '(a & next(b))')
+            self.assertEqual([formula], renders)
+        finally:
+            FormulaNode.__str__ = original_str
+
+    def test_string_concatenation(self):
+
+        formula = LTL.neg('a')
+
+        self.assertEqual('! a\n', formula + '\n')
+        self.assertEqual('[] ! a', '[] ' + formula)
+
+    def test_nodes_are_immutable(self):
+
+        formula = LTL.neg('a')
+
+        self.assertRaises(AttributeError, setattr, formula, 'op', CONJ)
+
+    def test_pickled_nodes_are_reinterned(self):
+
+        formula = LTL.disj([LTL.neg('a'), 'b'])
+
+        self.assertIs(formula, pickle.loads(pickle.dumps(formula)))
+
+
+class IntegerComparisonTests(unittest.TestCase):
+    """Integer variables and the substitution of props by comparisons."""
+
+    def test_integer_comparison(self):
+
+        self.assertEqual('(ts_c = 2)', LTL.eq('ts_c', 2))
+        self.assertEqual('next(ts_c = 2)', LTL.next(LTL.eq('ts_c', 2)))
+        self.assertEqual('! (ts_c = 2)', LTL.neg(LTL.eq('ts_c', 2)))
+
+    def test_substitution(self):
+
+        formula = LTL.implication(LTL.conj(['r1_c', LTL.neg('r2_c')]),
+                                  LTL.next('r1_c'))
+        substitutions = {'r1_c': LTL.eq('ts_c', 0), 'r2_c': LTL.eq('ts_c', 1)}
+
+        expected = '((ts_c = 0) & ! (ts_c = 1)) -> next(ts_c = 0)'
+
+        self.assertEqual(expected, LTL.substitute(formula, substitutions))
+        self.assertEqual('(ts_c = 0)', LTL.substitute('r1_c', substitutions))
+        self.assertEqual('! r1_c', LTL.substitute('! r1_c', substitutions))
+        self.assertIs(formula, LTL.substitute(formula, {'x': 'y'}))
+
+
+class CanonicalizationTests(unittest.TestCase):
+    """Formulas that are equal up to reordering have the same canonical form."""
+
+    def test_commutative_operators(self):
+
+        formula_1 = LTL.implication(LTL.conj(['b', LTL.neg('a'), 'b']),
+                                    LTL.iff(LTL.next('d'), 'c'))
+        formula_2 = LTL.implication(LTL.conj([LTL.neg('a'), 'b']),
+                                    LTL.iff('c', LTL.next('d')))
+
+        self.assertIs(canonicalize(formula_1), canonicalize(formula_2))
+        self.assertEqual('(! a & b) -> c <-> next(d)', canonicalize(formula_1))
+
+    def test_order_matters_elsewhere(self):
+
+        self.assertNotEqual(canonicalize(LTL.implication('a', 'b')),
+                            canonicalize(LTL.implication('b', 'a')))
+        self.assertEqual('a', canonicalize(LTL.disj(['a', 'a'])))
+        self.assertEqual('b & a', canonicalize('b & a'))
+
+
+class AtomTests(unittest.TestCase):
+
+    def test_distinct_atoms(self):
+
+        formula = LTL.implication(LTL.conj(['a', LTL.neg('b')]),
+                                  LTL.disj([LTL.next('a'), LTL.eq('c', 1)]))
+
+        self.assertItemsEqual(['a', 'b', 'c = 1'], iter_atoms(formula))
+        self.assertEqual(['a -> b'], list(iter_atoms('a -> b')))
+
+    def test_first_atom(self):
+
+        formula = LTL.implication(LTL.next(LTL.neg('a')), LTL.conj(['b', 'c']))
+
+        self.assertEqual('a', get_first_atom(formula))
+        self.assertEqual('c = 1', get_first_atom(LTL.eq('c', 1)))
+        self.assertEqual('a -> b', get_first_atom('a -> b'))
+
+    def test_count_nodes(self):
+
+        shared = LTL.conj(['a', 'b'])
+        formula = LTL.disj([shared, LTL.next(shared)])
+
+        # disj, conj, a, b, next (the conjunction is only counted once)
+        self.assertEqual(5, count_nodes(formula))
+        self.assertEqual(1, count_nodes('a -> b'))
+
+
+# =============================================================================
+# Entry point
+# =============================================================================
+
+if __name__ == '__main__':
+    # Run all tests
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+
+from respec.ltl import ltl as LTL
+from respec.ltl.parser import parse, parse_declaration
+from respec.ltl.syntax_tree import render
+
+import unittest
+
+
+class ParserTests(unittest.TestCase):
+    """Parsing the text of a formula returns a formula with the same text."""
+
+    def test_round_trip(self):
+
+        formulas = [LTL.implication(LTL.conj(['r1_c', LTL.neg('r2_a')]),
+                                    LTL.disj([LTL.next('r1_c'),
+                                              LTL.next('r1_f')])),
+                    LTL.iff(LTL.next('r1_c'), LTL.neg(LTL.next('r1_a'))),
+                    LTL.next(LTL.conj(['a', LTL.neg('b')])),
+                    LTL.neg(LTL.disj(['a', LTL.conj(['b', 'c'])])),
+                    LTL.implication('a', LTL.implication('b', 'c')),
+                    LTL.paren(LTL.neg('a')),
+                    'TRUE']
+
+        for formula in formulas:
+            self.assertEqual(render(formula), render(parse(render(formula))))
+
+        # The nodes are interned, so the very same formula is returned
+        self.assertIs(formulas[0], parse(render(formulas[0])))
+        self.assertIs(formulas[2], parse(render(formulas[2])))
+
+    def test_integer_comparisons(self):
+
+        self.assertIs(LTL.eq('ts_c', 3), parse('(ts_c = 3)'))
+        self.assertIs(LTL.next(LTL.eq('ts_a', 0)), parse('next(ts_a = 0)'))
+        self.assertIs(LTL.neg(LTL.eq('x', 1)), parse('! (x=1)'))
+
+    def test_precedence(self):
+
+        self.assertIs(LTL.implication(LTL.conj(['a', 'b']), 'c'),
+                      parse('(a & b) -> c'))
+        self.assertIs(LTL.disj([LTL.conj(['a', 'b']), 'c']),
+                      parse('a & b | c'))
+        self.assertIs(LTL.conj([LTL.neg('a'), LTL.next('b')]),
+                      parse("! a & b'"))
+
+    def test_errors(self):
+
+        for text in ['', 'a &', '(a & b', 'a b', 'a $ b', 'x = y', '-> a']:
+            self.assertRaises(ValueError, parse, text)
+
+    def test_declarations(self):
+
+        self.assertEqual(('x', (0, 3)), parse_declaration('x:0...3'))
+        self.assertEqual(('x', (2, 5)), parse_declaration('x : 2 ... 5'))
+        self.assertEqual(('r1_a', None), parse_declaration('r1_a'))
+        self.assertRaises(ValueError, parse_declaration, 'x:3...2')
+
+
+# =============================================================================
+# Entry point
+# =============================================================================
+
+if __name__ == '__main__':
+    # Run all tests
+    unittest.main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+
+import copy
+import pickle
+
+from respec.ltl import ltl as LTL
+from respec.ltl.registry import PropositionRegistry, FormulaStore
+
+import unittest
+
+
+class PropositionRegistryTests(unittest.TestCase):
+    """An insertion-ordered set of propositions that is also a list."""
+
+    def setUp(self):
+
+        self.registry = PropositionRegistry(['b', 'a', 'b', 'c'])
+
+    def tearDown(self):
+
+        del self.registry
+
+    def test_order_without_duplicates(self):
+
+        self.assertEqual(['b', 'a', 'c'], self.registry)
+        self.assertIsInstance(self.registry, list)
+
+    def test_adding_props(self):
+
+        self.registry.append('a')
+        self.registry.append('d')
+        self.registry.extend(['c', 'e', 'e'])
+        self.registry.insert(0, 'f')
+        self.registry += ['b', 'g']
+
+        self.assertEqual(['f', 'b', 'a', 'c', 'd', 'e', 'g'], self.registry)
+
+    def test_concatenation(self):
+
+        registry = self.registry + ['c', 'd']
+
+        self.assertIsInstance(registry, PropositionRegistry)
+        self.assertEqual(['b', 'a', 'c', 'd'], registry)
+        self.assertEqual(['b', 'a', 'c'], self.registry)
+
+    def test_membership_after_removal(self):
+
+        self.registry.remove('a')
+        self.assertNotIn('a', self.registry)
+
+        self.assertEqual('c', self.registry.pop())
+        self.assertNotIn('c', self.registry)
+
+        del self.registry[0]
+        self.assertNotIn('b', self.registry)
+        self.assertEqual([], self.registry)
+
+        self.registry.append('a')
+        self.assertIn('a', self.registry)
+
+    def test_item_assignment(self):
+
+        self.registry[0] = 'z'
+        self.registry[1:] = ['y', 'z']
+
+        self.assertEqual(['z', 'y'], self.registry)
+        self.assertNotIn('b', self.registry)
+
+    def test_version(self):
+
+        versions = [self.registry.version]
+        for modify in [lambda r: r.append('d'),
+                       lambda r: r.__setitem__(0, 'e'), # same length
+                       lambda r: r.sort(),
+                       lambda r: r.reverse(),
+                       lambda r: r.remove('e')]:
+            modify(self.registry)
+            versions.append(self.registry.version)
+
+        self.assertEqual(sorted(set(versions)), versions)
+
+        # Adding props that are already there changes nothing
+        self.registry.extend(['a', 'c'])
+        self.registry.append('d')
+        self.assertEqual(versions[-1], self.registry.version)
+
+    def test_copies(self):
+
+        for registry in [copy.copy(self.registry),
+                         pickle.loads(pickle.dumps(self.registry))]:
+            registry.append('d')
+            self.assertIsInstance(registry, PropositionRegistry)
+            self.assertEqual(['b', 'a', 'c', 'd'], registry)
+            self.assertIn('d', registry)
+            self.assertNotIn('d', self.registry)
+
+
+class FormulaStoreTests(unittest.TestCase):
+    """Formulas without duplicates (exact or up to reordering)."""
+
+    def setUp(self):
+
+        self.formulas = [LTL.conj(['a', 'b']), '(a & b)', LTL.conj(['b', 'a']),
+                         LTL.iff('a', 'b'), LTL.iff('b', 'a'), 'c']
+
+    def tearDown(self):
+
+        del self.formulas
+
+    def test_exact_duplicates(self):
+
+        store = FormulaStore(self.formulas)
+
+        self.assertEqual(['(a & b)', '(b & a)', 'a <-> b', 'b <-> a', 'c'],
+                         store)
+        self.assertEqual(1, store.duplicates)
+
+        store.append('c')
+        store.extend(['c', 'd'])
+
+        self.assertEqual(3, store.duplicates)
+        self.assertEqual(6, len(store))
+
+    def test_canonical_duplicates(self):
+
+        store = FormulaStore(self.formulas, canonical = True)
+
+        self.assertEqual(['(a & b)', 'a <-> b', 'c'], store)
+        self.assertEqual(3, store.duplicates)
+        self.assertIn(LTL.disj(['c']), store)
+
+    def test_copies(self):
+
+        store = FormulaStore(self.formulas, canonical = True)
+
+        for copied_store in [copy.copy(store), pickle.loads(pickle.dumps(store))]:
+            self.assertTrue(copied_store.canonical)
+            self.assertEqual(store.duplicates, copied_store.duplicates)
+            self.assertEqual(store, copied_store)
+
+
+# =============================================================================
+# Entry point
+# =============================================================================
+
+if __name__ == '__main__':
+    # Run all tests
+    unittest.main()
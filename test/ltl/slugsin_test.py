@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+
+import itertools
+
+from respec.ltl import ltl as LTL
+from respec.ltl.slugsin import IntegerVariable, SlugsInTranslator
+
+import unittest
+
+
+def evaluate_prefix(formula, values):
+    """Evaluate a .slugsin formula, given the values of its variables."""
+
+    tokens = iter(formula.split())
+
+    def evaluate():
+        token = next(tokens)
+        if token == '!':
+            return not evaluate()
+        if token in ['&', '|', '^']:
+            lhs, rhs = evaluate(), evaluate()
+            return {'&': lhs and rhs, '|': lhs or rhs, '^': lhs != rhs}[token]
+        if token in ['0', '1']:
+            return token == '1'
+        return values[token]
+
+    return evaluate()
+
+
+class IntegerVariableTests(unittest.TestCase):
+
+    def test_bits(self):
+
+        self.assertEqual(['x@0.0.5', 'x@1', 'x@2'],
+                         IntegerVariable('x', (0, 5)).bits)
+        self.assertEqual(['y@0.2.3'], IntegerVariable('y', (2, 3)).bits)
+        self.assertEqual(['z@0.0.0'], IntegerVariable('z', (0, 0)).bits)
+
+    def test_comparisons_and_ranges(self):
+        """Check every value of the bits, for a few ranges."""
+
+        for bounds in [(0, 1), (0, 2), (0, 5), (0, 8), (3, 12)]:
+            variable = IntegerVariable('x', bounds)
+            range_formula = variable.get_range_formula()
+
+            for bits in itertools.product([False, True],
+                                          repeat = len(variable.bits)):
+                values = dict(zip(variable.bits, bits))
+                value = bounds[0] + sum(bit << i for i, bit in enumerate(bits))
+                in_range = value <= bounds[1]
+
+                if range_formula is None:
+                    self.assertTrue(in_range)
+                else:
+                    self.assertEqual(in_range,
+                                     evaluate_prefix(range_formula, values))
+
+                for other in range(bounds[0], bounds[1] + 1):
+                    self.assertEqual(other == value, evaluate_prefix(
+                                     variable.get_comparison(other), values))
+
+        self.assertRaises(ValueError, variable.get_comparison, 13)
+
+    def test_primed(self):
+
+        variable = IntegerVariable('x', (0, 2))
+
+        self.assertEqual("& x@0.0.2' ! x@1'", variable.get_comparison(1, True))
+        self.assertEqual("| ! x@1' ! x@0.0.2'", variable.get_range_formula(True))
+
+
+class SlugsInTranslatorTests(unittest.TestCase):
+
+    def setUp(self):
+
+        self.translator = SlugsInTranslator(['a', 'b', 'x:0...3'])
+
+    def tearDown(self):
+
+        del self.translator
+
+    def test_boolean_operators(self):
+
+        translate = self.translator.translate
+
+        self.assertEqual('& & a b c', translate(LTL.conj(['a', 'b', 'c'])))
+        self.assertEqual('| a ! b', translate(LTL.disj(['a', LTL.neg('b')])))
+        self.assertEqual('| ! a b', translate(LTL.implication('a', 'b')))
+        self.assertEqual('! ^ a b', translate(LTL.iff('a', 'b')))
+        self.assertEqual('1', translate('TRUE'))
+        self.assertEqual('0', translate(LTL.next('FALSE')))
+
+    def test_next_operator(self):
+
+        translate = self.translator.translate
+
+        self.assertEqual("| ! & a ! b c'", translate('(a & ! b) -> next(c)'))
+        self.assertEqual("& a' b'", translate(LTL.next(LTL.conj(['a', 'b']))))
+        self.assertEqual("& a' b'", translate(LTL.next('(a & b)')))
+        self.assertRaises(ValueError, translate, LTL.next(LTL.next('a')))
+
+    def test_text_of_next_of_implication(self):
+        """The formula is rendered as 'next(a & b) -> (c | d)'."""
+
+        formula = LTL.next(LTL.implication(LTL.conj(['a', 'b']),
+                                           LTL.disj(['c', 'd'])))
+
+        self.assertEqual("| ! & a' b' | c d", self.translator.translate(formula))
+
+    def test_integer_variables(self):
+
+        translate = self.translator.translate
+
+        self.assertEqual(['x@0.0.3', 'x@1'],
+                         self.translator.translate_prop('x:0...3'))
+        self.assertEqual(['a'], self.translator.translate_prop('a'))
+
+        self.assertEqual("| ! a & ! x@0.0.3' x@1'",
+                         translate(LTL.implication('a', LTL.next(LTL.eq('x', 2)))))
+        self.assertRaises(ValueError, translate, LTL.eq('x', 4))
+        self.assertRaises(ValueError, translate, LTL.eq('y', 0))
+        self.assertRaises(ValueError, translate, 'x')
+
+
+# =============================================================================
+# Entry point
+# =============================================================================
+
+if __name__ == '__main__':
+    # Run all tests
+    unittest.main()
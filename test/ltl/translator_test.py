@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+
+from respec.ltl import ltl as LTL
+from respec.ltl.syntax_tree import NEG, CONJ, DISJ, IMPLIES, IFF
+from respec.ltl.translator import FormulaTranslator
+
+import unittest
+
+
+class FunctionalTranslator(FormulaTranslator):
+    """Formulas as nested function calls, e.g., and(a, not(b))."""
+
+    _names = {NEG: 'not', CONJ: 'and', DISJ: 'or', IMPLIES: 'implies',
+              IFF: 'iff'}
+
+    def get_operator(self, op, num_args):
+        return self._names[op] + '(', ', ', ')'
+
+    def translate_name(self, name, primed):
+        return 'next_' + name if primed else name
+
+    def translate_comparison(self, variable, value, primed):
+        return 'eq({0}, {1})'.format(self.translate_name(variable.name, primed),
+                                     value)
+
+
+class FormulaTranslatorTests(unittest.TestCase):
+    """A translator only defines the operators and the atoms."""
+
+    def setUp(self):
+
+        self.translator = FunctionalTranslator(['a', 'b', 'x:0...3'])
+
+    def tearDown(self):
+
+        del self.translator
+
+    def test_operators(self):
+
+        translate = self.translator.translate
+
+        self.assertEqual('and(a, b, not(c))',
+                         translate(LTL.conj(['a', 'b', LTL.neg('c')])))
+        self.assertEqual('implies(a, iff(b, c))',
+                         translate('a -> (b <-> c)'))
+        self.assertEqual('FALSE', translate('FALSE'))
+
+    def test_atoms(self):
+
+        translate = self.translator.translate
+
+        self.assertEqual('or(next_a, eq(next_x, 2))',
+                         translate(LTL.next(LTL.disj(['a', LTL.eq('x', 2)]))))
+        self.assertEqual('and(next_a, next_b)', translate(LTL.next('(a & b)')))
+        self.assertRaises(ValueError, translate, 'x')
+        self.assertRaises(ValueError, translate, 'y = 1')
+        self.assertRaises(ValueError, translate, 'x = 4')
+
+    def test_abstract_operators(self):
+
+        self.assertRaises(NotImplementedError, FormulaTranslator().translate,
+                          '! a')
+
+
+# =============================================================================
+# Entry point
+# =============================================================================
+
+if __name__ == '__main__':
+    # Run all tests
+    unittest.main()
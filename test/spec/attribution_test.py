@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+
+import json
+
+from respec.formula import *
+from respec.ltl import ltl as LTL
+from respec.spec import GR1Specification, TransitionSystemSpecification, \
+                        ActionSpecification
+from respec.spec.attribution import *
+from respec.spec.attribution import get_file_size
+
+import unittest
+
+
+class FormulaOriginTests(unittest.TestCase):
+
+    def setUp(self):
+
+        self.ts = {'r1': ['r1', 'r2'], 'r2': ['r2', 'r1']}
+
+    def test_origins_of_loaded_formulas(self):
+
+        spec = GR1Specification()
+        spec.load(ActionOutcomeConstraintsFormula(['dance', 'sleep']))
+
+        origins = [spec.origins['env_trans'][f] for f in spec.env_trans]
+
+        self.assertItemsEqual(origins,
+                              [('ActionOutcomeConstraintsFormula', 'dance'),
+                               ('ActionOutcomeConstraintsFormula', 'sleep')])
+
+    def test_origins_of_topology_families(self):
+
+        spec = TransitionSystemSpecification(ts = self.ts,
+                                             outcomes = ['completed', 'failed'])
+
+        origins = set(spec.origins['env_trans'][f] for f in spec.env_trans)
+
+        for cls in [SingleStepChangeFormula, TopologyMutexFormula,
+                    TopologyOutcomePersistenceFormula, OutcomeMutexFormula,
+                    TopologyOutcomeConstraintFormula]:
+            self.assertIn((cls.__name__, 'r1'), origins)
+            self.assertIn((cls.__name__, 'r2'), origins)
+
+        for f in spec.sys_trans:
+            self.assertIn(spec.origins['sys_trans'][f][0],
+                          ['TransitionRelationFormula',
+                           'PropositionDeactivationFormula'])
+
+    def test_origins_of_preconditions(self):
+
+        spec = ActionSpecification(preconditions = {'grasp': ['r1']})
+        spec.handle_new_action('grasp')
+
+        formula = PreconditionsFormula('grasp', ['r1']).formulas[0]
+
+        self.assertEqual(spec.origins['sys_trans'][formula],
+                         ('PreconditionsFormula', 'grasp'))
+
+    def test_origins_are_merged(self):
+
+        ts_spec = TransitionSystemSpecification(ts = self.ts)
+
+        spec = GR1Specification()
+        spec.merge_gr1_specifications([ts_spec])
+
+        self.assertEqual(spec.origins, ts_spec.origins)
+
+    def test_origins_survive_the_integer_encoding(self):
+
+        ts_spec = TransitionSystemSpecification(ts = self.ts,
+                                                encoding = INTEGER)
+        other_spec = GR1Specification(env_props = ['r2_c'], sys_props = ['x'])
+        other_spec.load(PreconditionsFormula('x', ['r2']))
+
+        spec = GR1Specification()
+        spec.merge_gr1_specifications([other_spec, ts_spec])
+
+        self.assertIn('! (ts_c = 1) -> ! x_a', spec.sys_trans)
+        self.assertEqual(spec.origins['sys_trans']['! (ts_c = 1) -> ! x_a'],
+                         ('PreconditionsFormula', 'x'))
+        for f in spec.sys_trans:
+            self.assertIn(f, spec.origins['sys_trans'])
+
+
+class AttributionTests(unittest.TestCase):
+
+    def setUp(self):
+
+        self.spec = TransitionSystemSpecification(
+                                    name = 'spec',
+                                    ts = {'r1': ['r1', 'r2'],
+                                          'r2': ['r2', 'r1', 'r3'],
+                                          'r3': ['r3']},
+                                    outcomes = ['completed', 'failed'])
+        self.spec.sys_liveness = [LTL.next('r3_c')] # no origin
+
+    def test_attribution_adds_up(self):
+
+        formulas = sum(len(getattr(self.spec, section)) for section in
+                       ['sys_init', 'env_init', 'sys_trans', 'env_trans',
+                        'sys_liveness', 'env_liveness'])
+        formula_bytes = sum(len(str(f)) + 1 for section in
+                            ['sys_trans', 'env_trans', 'sys_liveness',
+                             'env_liveness']
+                            for f in getattr(self.spec, section))
+
+        for group_by in [ORIGIN, CLASS, ELEMENT]:
+            groups = get_attribution(self.spec, group_by)
+
+            self.assertEqual(sum(g['formulas'] for g in groups), formulas)
+            self.assertEqual(sum(g['bytes'] for g in groups), formula_bytes)
+            self.assertEqual([g['bytes'] for g in groups],
+                             sorted([g['bytes'] for g in groups],
+                                    reverse = True))
+
+        self.assertLess(formula_bytes, get_file_size(self.spec))
+
+    def test_attribution_per_class(self):
+
+        groups = dict((g['class'], g)
+                      for g in get_attribution(self.spec, CLASS))
+
+        self.assertEqual(groups[None]['formulas'], 1)
+        self.assertEqual(groups[None]['sections'], ['sys_liveness'])
+        self.assertEqual(groups['SingleStepChangeFormula']['formulas'], 6)
+        self.assertEqual(groups['SingleStepChangeFormula']['sections'],
+                         ['env_trans'])
+        self.assertGreater(groups['SingleStepChangeFormula']['nodes'], 6)
+
+    def test_attribution_per_element(self):
+
+        groups = dict((g['element'], g)
+                      for g in get_attribution(self.spec, ELEMENT))
+        self.assertItemsEqual(groups.keys(), ['r1', 'r2', 'r3', None])
+
+        # One formula per transition
+        groups = dict(((g['class'], g['element']), g)
+                      for g in get_attribution(self.spec, ORIGIN))
+        self.assertEqual(groups[('SingleStepChangeFormula', 'r1')]['formulas'],
+                         2)
+        self.assertEqual(groups[('SingleStepChangeFormula', 'r2')]['formulas'],
+                         3)
+        self.assertEqual(groups[('SingleStepChangeFormula', 'r3')]['formulas'],
+                         1)
+
+    def test_reports(self):
+
+        report = json.loads(get_json_report(self.spec, CLASS))
+        self.assertEqual(report['file_bytes'], get_file_size(self.spec))
+        self.assertEqual(len(report['groups']),
+                         len(get_attribution(self.spec, CLASS)))
+
+        lines = get_text_report(self.spec, ORIGIN, limit = 3).splitlines()
+        self.assertTrue(lines[0].startswith('spec: '))
+        self.assertEqual(len(lines), 1 + 1 + 3 + 1) # title, header, ..., more
+        self.assertTrue(lines[-1].endswith('more)'))
+
+    def test_unknown_grouping(self):
+
+        self.assertRaises(ValueError, get_attribution, self.spec, 'section')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,7 +4,9 @@ import os
 
 import unittest
 
+from respec.ltl import ltl as LTL
 from respec.spec import GR1Specification
+from respec.formula import GR1Formula
 
 class SpecificationTests(unittest.TestCase):
 
@@ -64,3 +66,92 @@ class SpecificationTests(unittest.TestCase):
 									  self.name + ".structuredslugs")
 
 		self.failUnless(os.path.isfile(full_file_path))
+
+	def test_merged_props_keep_their_order(self):
+
+		other_spec = GR1Specification('other', env_props = ['z', 'x'],
+									  sys_props = ['y3', 'y1'])
+
+		self.spec.merge_gr1_specifications([other_spec])
+
+		self.assertEqual(['x', 'z'], self.spec.env_props)
+		self.assertEqual(['y1', 'y2', 'y3'], self.spec.sys_props)
+		# The input lists are not modified
+		self.assertEqual(['x'], self.env_props)
+		self.assertEqual(['z', 'x'], other_spec.env_props)
+
+	def test_merged_duplicate_formulas(self):
+
+		formula = GR1Formula(env_props = ['x'], sys_props = ['y1'])
+		formula.formulas = ['x -> y1', 'x -> y1', 'y1 -> x']
+		formula.type = 'sys_trans'
+
+		other_spec = GR1Specification('other', [], [])
+		other_spec.load(formula)
+
+		self.spec.load(formula)
+		self.spec.merge_gr1_specifications([other_spec])
+
+		self.assertEqual(['x -> y1', 'y1 -> x'], self.spec.sys_trans)
+		self.assertEqual(3, self.spec.count_duplicate_formulas()['sys_trans'])
+		self.assertEqual(0, self.spec.count_duplicate_formulas()['env_trans'])
+
+	def test_cone_of_influence(self):
+
+		spec = GR1Specification('coi', env_props = ['x', 'z', 'ts_c:0...2'],
+								sys_props = ['y1', 'y2', 'w', 'v'])
+		spec.sys_liveness = ['y1']
+		spec.sys_init = ['! y1', '! w']
+		spec.env_init = ['! x', '! z']
+		spec.sys_trans = [LTL.implication('x', LTL.next('y1')),
+						  LTL.implication('z', LTL.next('w')),
+						  LTL.implication(LTL.eq('ts_c', 1), 'y2')]
+		spec.env_trans = ['next(x) -> ! y2', 'FALSE']
+		spec.encoded_props = {'ts_c': ['r1', 'r2', 'r3']}
+
+		removed = spec.reduce_to_cone_of_influence()
+
+		self.assertEqual(['x', 'ts_c:0...2'], spec.env_props)
+		self.assertEqual(['y1', 'y2'], spec.sys_props)
+		self.assertEqual(['! y1'], spec.sys_init)
+		self.assertEqual(['! x'], spec.env_init)
+		self.assertEqual(['x -> next(y1)', '(ts_c = 1) -> y2'], spec.sys_trans)
+		self.assertEqual(['next(x) -> ! y2', 'FALSE'], spec.env_trans)
+		self.assertIn('ts_c', spec.encoded_props)
+
+		self.assertEqual({'env_props': 1, 'sys_props': 2, 'sys_init': 1,
+						  'env_init': 1, 'sys_trans': 1, 'env_trans': 0,
+						  'sys_liveness': 0, 'env_liveness': 0}, removed)
+
+	def test_cone_of_influence_keeps_harmful_formulas(self):
+
+		spec = GR1Specification('coi', env_props = ['x', 'u', 'q', 'z'],
+								sys_props = ['y', 'p', 'w:0...2'])
+		spec.sys_liveness = ['y']
+		spec.sys_trans = ['x -> next(y)',
+						  'next(q)',						# Not up to the system
+						  'next(w = 1) | next(w = 2)']		# Harmless
+		spec.env_trans = ['u & ! u',						# Unsatisfiable
+						  'next(z) | ! next(z)']			# Harmless
+		spec.env_init = ['! q']
+
+		removed = spec.reduce_to_cone_of_influence()
+
+		self.assertEqual(['x', 'u', 'q'], spec.env_props)
+		self.assertEqual(['y'], spec.sys_props)
+		self.assertEqual(['x -> next(y)', 'next(q)'], spec.sys_trans)
+		self.assertEqual(['u & ! u'], spec.env_trans)
+		self.assertEqual(['! q'], spec.env_init)
+		self.assertEqual(1, removed['env_props'])
+		self.assertEqual(2, removed['sys_props'])
+
+	def test_default_props_are_not_shared(self):
+
+		spec_1 = GR1Specification()
+		spec_1.merge_env_propositions(['x'])
+		spec_1.merge_sys_propositions(['y'])
+
+		spec_2 = GR1Specification()
+
+		self.assertEqual([], spec_2.env_props)
+		self.assertEqual([], spec_2.sys_props)
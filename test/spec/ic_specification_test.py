@@ -43,6 +43,23 @@ class ICSpecificationTests(unittest.TestCase):
         self.assertItemsEqual(actual_seq = self.spec.env_init,
                               expected_seq = expected_env_init)
 
+    def test_ics_from_spec_batch(self):
+
+        other_spec = ActionSpecification()
+        other_spec.handle_new_action(action = 'foo')
+        other_spec.handle_new_action(action = 'bar')
+
+        batch = [['foo'], ['bar'], ['foo', 'bar']]
+
+        ic_specs = InitialConditionsSpecification.from_spec_batch(other_spec,
+                                                                  batch)
+
+        self.assertEqual(len(batch), len(ic_specs))
+        for true_props, ic_spec in zip(batch, ic_specs):
+            self.spec.set_ics_from_spec(other_spec, true_props)
+            self.assertEqual(self.spec.sys_init, ic_spec.sys_init)
+            self.assertEqual(self.spec.env_init, ic_spec.env_init)
+
 # =============================================================================
 # Entry point
 # =============================================================================
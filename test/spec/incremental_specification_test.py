@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+
+from respec.ltl.syntax_tree import canonicalize
+from respec.spec import *
+
+import unittest
+
+
+class IncrementalSpecificationTests(unittest.TestCase):
+    """Updates have the same result as building the specification anew."""
+
+    def setUp(self):
+
+        self.outcomes = ['completed', 'failed']
+        self.ts = {'r1': ['r1', 'r2'],
+                   'r2': ['r2', 'r1', 'r3'],
+                   'r3': ['r3']}
+        self.preconditions = {'grasp': ['look'],
+                              'look': [],
+                              'walk': ['r1']}
+
+        self.spec = IncrementalSpecification(ts = self.ts,
+                                             preconditions = self.preconditions,
+                                             outcomes = self.outcomes)
+
+    def tearDown(self):
+
+        del self.outcomes, self.ts, self.preconditions, self.spec
+
+    def _assert_same_spec(self, expected_spec):
+
+        for section in SPEC_SECTIONS:
+            self.assertItemsEqual(
+                            map(canonicalize, getattr(expected_spec, section)),
+                            map(canonicalize, getattr(self.spec, section)))
+
+    def _build_action_spec(self, actions):
+
+        action_spec = ActionSpecification(preconditions = self.preconditions)
+        for action in actions:
+            action_spec.handle_new_action(action, outcomes = self.outcomes)
+        return action_spec
+
+    def test_ts(self):
+
+        ts_spec = TransitionSystemSpecification(ts = self.ts,
+                                                outcomes = self.outcomes)
+        self._assert_same_spec(ts_spec)
+
+    def test_add_and_remove_ts_edge(self):
+
+        delta = self.spec.add_ts_edge('r3', 'r1')
+
+        self.ts['r3'].append('r1')
+        self._assert_same_spec(TransitionSystemSpecification(
+                                    ts = self.ts, outcomes = self.outcomes))
+        self.assertEqual(['next(r3_c) -> (next(! r1_a & ! r2_a & ! r3_a) | '
+                          'next(! r1_a & ! r2_a & r3_a) | '
+                          'next(! r2_a & ! r3_a & r1_a))'],
+                         map(str, map(canonicalize, delta.added['sys_trans'])))
+        self.assertEqual(1, len(delta.removed['sys_trans']))
+        self.assertEqual([], delta.added['env_props'])
+
+        self.spec.remove_ts_edge('r3', 'r1')
+
+        self.ts['r3'].remove('r1')
+        self._assert_same_spec(TransitionSystemSpecification(
+                                    ts = self.ts, outcomes = self.outcomes))
+
+    def test_add_ts_state(self):
+
+        delta = self.spec.add_ts_edge('r3', 'r4')
+
+        self.ts['r3'].append('r4')
+        self.ts['r4'] = []
+        self._assert_same_spec(TransitionSystemSpecification(
+                                    ts = self.ts, outcomes = self.outcomes))
+        self.assertItemsEqual(['r4_c', 'r4_f'], delta.added['env_props'])
+
+    def test_add_and_remove_action(self):
+
+        self.spec = IncrementalSpecification(preconditions = self.preconditions,
+                                             outcomes = self.outcomes)
+
+        delta = self.spec.add_action('grasp')
+
+        self._assert_same_spec(self._build_action_spec(['grasp']))
+        self.assertEqual(['look', 'grasp'], self.spec.actions)
+        self.assertItemsEqual(['look_a', 'grasp_a'], delta.added['sys_props'])
+
+        self.assertEqual(0, len(self.spec.add_action('look')))
+
+        delta = self.spec.remove_action('grasp')
+
+        self._assert_same_spec(self._build_action_spec(['look']))
+        self.assertItemsEqual(['grasp_a'], delta.removed['sys_props'])
+        self.assertEqual([], delta.added['sys_trans'])
+
+    def test_remove_precondition_of_action(self):
+
+        self.spec = IncrementalSpecification(preconditions = self.preconditions,
+                                             outcomes = self.outcomes)
+        self.spec.add_action('grasp')
+
+        self.assertRaises(ValueError, self.spec.remove_action, 'look')
+
+        # Nothing was removed
+        self._assert_same_spec(self._build_action_spec(['grasp']))
+        self.assertEqual(['look', 'grasp'], self.spec.actions)
+
+        self.spec.remove_action('grasp')
+        self.spec.remove_action('look')
+        self.assertEqual([], self.spec.actions)
+        self.assertEqual([], self.spec.sys_props)
+
+    def test_add_and_remove_goal(self):
+
+        self.spec = IncrementalSpecification(strict_order = True)
+
+        self.spec.add_goal('grasp')
+        delta = self.spec.add_goal('walk')
+
+        goal_spec = GoalSpecification()
+        goal_spec.handle_single_liveness(['grasp', 'walk'], strict_order = True)
+        self._assert_same_spec(goal_spec)
+        self.assertItemsEqual(['walk_a', 'walk_m'], delta.added['sys_props'])
+
+        self.spec.remove_goal('grasp')
+
+        goal_spec = GoalSpecification()
+        goal_spec.handle_single_liveness(['walk'], strict_order = True)
+        self._assert_same_spec(goal_spec)
+
+        self.spec.remove_goal('walk')
+
+        self._assert_same_spec(GR1Specification())
+
+    def test_provenance(self):
+
+        self.spec.add_action('walk')
+
+        self.assertEqual([(TOPOLOGY, None)],
+                         self.spec.get_provenance('r1_f', 'env_props'))
+        self.assertEqual([(ACTION, 'walk'), (TOPOLOGY, None)],
+                         self.spec.get_provenance('r1_c'))
+
+        self.spec.remove_action('walk')
+
+        self.assertIn('r1_c', self.spec.env_props)
+        self.assertEqual([(TOPOLOGY, None)], self.spec.get_provenance('r1_c'))
+
+
+if __name__ == '__main__':
+    # Run all tests
+    unittest.main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+
+import os
+import json
+import shutil
+import tempfile
+
+from respec.formula import ActionOutcomeConstraintsFormula, \
+                           PreconditionsFormula, TransitionRelationFormula, \
+                           TopologyFormulaGenerator
+from respec.ltl.syntax_tree import render
+from respec.spec import GR1Specification
+from respec.spec import instrumentation
+
+import unittest
+
+
+class InstrumentationTests(unittest.TestCase):
+
+    def setUp(self):
+
+        instrumentation.reset()
+        self.original_init = TransitionRelationFormula.__dict__['__init__']
+        self.original_load = GR1Specification.__dict__['load']
+
+    def tearDown(self):
+
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def _build_spec(self):
+
+        spec = GR1Specification('spec')
+        spec.load(TransitionRelationFormula({'r1': ['r1', 'r2'],
+                                             'r2': ['r2']}))
+        spec.load(ActionOutcomeConstraintsFormula(['grasp']))
+        spec.load(PreconditionsFormula('grasp', ['r1']))
+        return spec
+
+    def test_disabled_by_default(self):
+
+        self.assertFalse(instrumentation.is_enabled())
+
+        self._build_spec()
+
+        self.assertEqual(instrumentation.get_stats(),
+                         {'classes': {}, 'sections': {}})
+
+    def test_enable_and_disable(self):
+
+        instrumentation.enable()
+        self.assertTrue(instrumentation.is_enabled())
+        self.assertIsNot(TransitionRelationFormula.__dict__['__init__'],
+                         self.original_init)
+
+        instrumentation.disable()
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertIs(TransitionRelationFormula.__dict__['__init__'],
+                      self.original_init)
+        self.assertIs(GR1Specification.__dict__['load'], self.original_load)
+
+    def test_stats_per_class(self):
+
+        instrumentation.enable()
+        self._build_spec()
+        walk_formula = ActionOutcomeConstraintsFormula(['walk'])
+        grasp_formula = ActionOutcomeConstraintsFormula(['grasp'])
+
+        classes = instrumentation.get_stats()['classes']
+
+        # Only the outermost constructor is recorded (not the super classes)
+        self.assertItemsEqual(classes.keys(),
+                              ['TransitionRelationFormula',
+                               'ActionOutcomeConstraintsFormula',
+                               'PreconditionsFormula'])
+
+        stats = classes['ActionOutcomeConstraintsFormula']
+        self.assertEqual(stats['instances'], 3)
+        self.assertEqual(stats['formulas'], 3)
+        self.assertEqual(stats['props'], 6) # (grasp|walk)_(a|c)
+        self.assertEqual(stats['chars'],
+                         len(render(walk_formula.formulas[0])) +
+                         len(render(grasp_formula.formulas[0])) * 2)
+        self.assertGreaterEqual(stats['time'], 0)
+
+    def test_nested_formulas(self):
+
+        instrumentation.enable()
+        generator = TopologyFormulaGenerator({'r1': ['r1', 'r2'],
+                                              'r2': ['r2']})
+
+        classes = instrumentation.get_stats()['classes']
+
+        # The families (GR1Formulas) are part of the generator
+        self.assertEqual(classes.keys(), ['TopologyFormulaGenerator'])
+        self.assertEqual(classes['TopologyFormulaGenerator']['formulas'],
+                         sum(len(f.formulas) for f in generator.families))
+
+    def test_stats_per_section(self):
+
+        instrumentation.enable()
+        spec = self._build_spec()
+
+        sections = instrumentation.get_stats()['sections']
+
+        self.assertItemsEqual(sections.keys(), ['sys_trans', 'env_trans'])
+        self.assertEqual(sections['sys_trans']['loads'], 2)
+        self.assertEqual(sections['sys_trans']['formulas'],
+                         len(spec.sys_trans))
+        self.assertEqual(sections['env_trans']['loads'], 1)
+
+        # The props of each GR1Formula loaded (even if the spec has them)
+        get_num_props = lambda f: len(f.sys_props) + len(f.env_props)
+        instrumentation.disable()
+        self.assertEqual(sections['sys_trans']['props'],
+                         get_num_props(TransitionRelationFormula(
+                                       {'r1': ['r1', 'r2'], 'r2': ['r2']})) +
+                         get_num_props(PreconditionsFormula('grasp', ['r1'])))
+        self.assertEqual(sections['env_trans']['props'], get_num_props(
+                         ActionOutcomeConstraintsFormula(['grasp'])))
+
+    def test_reports(self):
+
+        instrumentation.enable()
+        spec = self._build_spec()
+
+        folder_path = tempfile.mkdtemp()
+        try:
+            spec.write_structured_slugs_file(folder_path)
+
+            spec_folder = os.path.join(folder_path, 'spec')
+            with open(os.path.join(spec_folder,
+                                   'spec.instrumentation.json')) as f:
+                self.assertEqual(json.load(f), instrumentation.get_stats())
+            with open(os.path.join(spec_folder,
+                                   'spec.instrumentation.txt')) as f:
+                self.assertEqual(f.read(), instrumentation.get_text_report())
+        finally:
+            shutil.rmtree(folder_path)
+
+    def test_text_report_is_sorted_by_time(self):
+
+        instrumentation.enable()
+        self._build_spec()
+
+        lines = instrumentation.get_text_report().splitlines()
+        table = lines[1:lines.index('')]
+        times = [float(line.split()[2]) for line in table]
+
+        self.assertEqual(len(table), 3)
+        self.assertEqual(times, sorted(times, reverse = True))
+
+        # Both tables have a props column
+        section_header = lines[lines.index('') + 1]
+        self.assertEqual(section_header.split()[-1], 'props')
+
+
+if __name__ == '__main__':
+    unittest.main()
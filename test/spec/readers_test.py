@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+
+import os
+import shutil
+import tempfile
+from StringIO import StringIO
+
+from respec.formula import *
+from respec.formula.activation_outcomes import INTEGER
+from respec.ltl import ltl as LTL
+from respec.ltl.syntax_tree import FormulaNode
+from respec.spec import GR1Specification
+from respec.spec.readers import StructuredSlugsReader, \
+                                read_structured_slugs_file
+
+import unittest
+
+
+def get_text(spec):
+    stream = StringIO()
+    spec.write_structured_slugs(stream)
+    return stream.getvalue()
+
+
+class StructuredSlugsReaderTests(unittest.TestCase):
+
+    def setUp(self):
+
+        ts = {'r1': ['r1', 'r2', 'r3'],
+              'r2': ['r2'],
+              'r3': ['r3', 'r1']}
+
+        self.spec = GR1Specification('readers')
+        self.spec.load_formulas(TopologyFormulaGenerator(ts, ['completed',
+                                                               'failed']).families)
+        self.spec.load(ActionFairnessConditionsFormula(['grasp'],
+                                                       ['completed', 'failed']))
+        self.spec.load(SystemInitialConditions(['r1', 'r2', 'r3'], ['r1']))
+
+        self.int_spec = GR1Specification('readers')
+        self.int_spec.load_formulas(TopologyFormulaGenerator(
+                                    ts, ['completed'], INTEGER).families)
+
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+
+        shutil.rmtree(self.temp_dir)
+        del self.spec, self.int_spec
+
+    def test_round_trip(self):
+
+        for spec in [self.spec, self.int_spec]:
+            text = get_text(spec)
+
+            for parse_formulas in [False, True]:
+                reader = StructuredSlugsReader(parse_formulas)
+                spec_read = reader.read(StringIO(text))
+
+                self.assertEqual(text, get_text(spec_read))
+                self.assertEqual(spec.encoded_props, spec_read.encoded_props)
+                self.assertEqual(spec.env_props, spec_read.env_props)
+                self.assertEqual(spec.sys_trans, spec_read.sys_trans)
+
+    def test_parsed_formulas(self):
+
+        spec_read = StructuredSlugsReader(parse_formulas = True).read(
+                                                StringIO(get_text(self.spec)))
+
+        for formula in spec_read.sys_trans + spec_read.env_liveness:
+            self.assertIsInstance(formula, FormulaNode)
+
+        # The nodes are the interned ones of the generated formulas
+        self.assertIs(self.spec.sys_trans[0], spec_read.sys_trans[0])
+
+    def test_files(self):
+
+        file_path, _ = self.int_spec.write_structured_slugs_file(self.temp_dir)
+
+        for use_mmap in [False, True]:
+            spec_read = read_structured_slugs_file(file_path,
+                                                   use_mmap = use_mmap)
+            self.assertEqual('readers', spec_read.spec_name)
+            self.assertEqual(get_text(self.int_spec), get_text(spec_read))
+
+        # An empty file (which cannot be memory-mapped) is an empty spec
+        empty_path = os.path.join(self.temp_dir, 'empty.structuredslugs')
+        open(empty_path, 'w').close()
+        spec_read = read_structured_slugs_file(empty_path, use_mmap = True)
+        self.assertEqual('empty', spec_read.spec_name)
+        self.assertEqual([], spec_read.sys_props)
+
+    def test_merge(self):
+        """Fragments that are read can be merged with generated ones."""
+
+        spec_read = StructuredSlugsReader().read(StringIO(get_text(self.spec)))
+
+        spec = GR1Specification('merged')
+        spec.merge_gr1_specifications([spec_read, self.spec])
+
+        self.assertEqual(get_text(self.spec), get_text(spec))
+        self.assertEqual(len(self.spec.sys_trans),
+                         spec.count_duplicate_formulas()['sys_trans'])
+
+    def test_merge_encoded_props(self):
+        """A fragment that is read keeps encoding the props it encoded."""
+
+        spec_read = StructuredSlugsReader().read(
+                                            StringIO(get_text(self.int_spec)))
+
+        one_hot_spec = GR1Specification('one_hot', ['r1_c'], [])
+        one_hot_spec.env_liveness = ['r1_c']
+
+        spec = GR1Specification('merged')
+        spec.merge_gr1_specifications([spec_read, one_hot_spec])
+
+        self.assertEqual(self.int_spec.encoded_props, spec.encoded_props)
+        self.assertIn(LTL.eq('ts_c', 0), spec.env_liveness)
+        self.assertEqual('(ts_c = 0)', str(LTL.eq('ts_c', 0)))
+        self.assertNotIn('r1_c', spec.env_props)
+        self.assertNotIn('r1_c', spec.env_liveness)
+
+    def test_comments_and_errors(self):
+
+        text = ("# A comment\n[INPUT]\nx\n\n[OUTPUT]\n  y\n"
+                "[SYS_TRANS]\n# x -> y\nx -> next(y)\n")
+        spec_read = StructuredSlugsReader(parse_formulas = True).read(
+                                                                StringIO(text))
+
+        self.assertEqual(['x'], spec_read.env_props)
+        self.assertEqual(['y'], spec_read.sys_props)
+        self.assertEqual([LTL.implication('x', LTL.next('y'))],
+                         spec_read.sys_trans)
+
+        reader = StructuredSlugsReader()
+        self.assertRaises(ValueError, reader.read, StringIO('x\n[INPUT]\n'))
+        self.assertRaises(ValueError, reader.read, StringIO('[INPUTS]\nx\n'))
+        self.assertRaises(ValueError, reader.read,
+                          StringIO('# ENCODING x a b\n[INPUT]\n'))
+
+
+# =============================================================================
+# Entry point
+# =============================================================================
+
+if __name__ == '__main__':
+    # Run all tests
+    unittest.main()
@@ -1,8 +1,19 @@
 #!/usr/bin/env python
 
+import os
+import marshal
+import shutil
+import tempfile
 import unittest
 
+from respec.spec import robot_specification
 from respec.spec.robot_specification import *
+from respec.spec.robot_specification import _config_cache, _validate_config, \
+                                            _load_compiled_config, \
+                                            _write_compiled_config, \
+                                            _get_compiled_config_path, \
+                                            _COMPILED_CONFIG_HEADER, \
+                                            _COMPILED_CONFIG_MAGIC
 
 
 class ActionSpecificationTests(unittest.TestCase):
@@ -141,8 +152,56 @@ class ActionSpecificationTests(unittest.TestCase):
                               expected_seq = [expected_formula_4])
 
 
+    def test_shared_preconditions_are_handled_once(self):
+
+        self.spec.preconditions = {'fu': ['bar', 'baz'],
+                                   'bar': ['foo'],
+                                   'baz': ['foo'],
+                                   'foo': []}
+
+        self.spec.handle_new_action('fu')
+        self.spec.handle_new_action('bar') # already handled
+
+        expected_order = ['foo', 'bar', 'baz', 'fu']
+
+        # 3 preconditions + 4 deactivation
+        self.assertEqual(len(self.spec.sys_trans), 7)
+        self.assertItemsEqual(self.spec.all_actions, expected_order)
+        self.assertEqual(self.spec.sys_trans.count('! foo_c -> ! bar_a'), 1)
+
+    def test_preconditions_order(self):
+
+        self.spec.preconditions = {'fu': ['bar', 'baz', 'stand'],
+                                   'bar': ['foo'],
+                                   'baz': ['foo'],
+                                   'foo': []}
+
+        order = self.spec._get_preconditions_order('fu')
+
+        self.assertEqual(order, ['foo', 'bar', 'baz', 'fu'])
+
+    def test_cyclic_preconditions_raise_exception(self):
+
+        self.spec.preconditions = {'fu': ['bar'],
+                                   'bar': ['foo'],
+                                   'foo': ['fu']}
+
+        self.assertRaises(ValueError, self.spec.handle_new_action, 'fu')
+        self.assertItemsEqual(self.spec.all_actions, [])
+
+    def test_required_props(self):
+
+        preconditions = {'fu': ['bar', 'baz', 'stand'],
+                         'bar': ['foo'],
+                         'baz': ['foo', 'bar'],
+                         'foo': ['manipulate']}
+
+        self.assertEqual(['bar', 'foo', 'manipulate', 'baz', 'stand'],
+                         get_required_props(['fu', 'run'], preconditions))
+        self.assertEqual([], get_required_props(['run'], preconditions))
+
     def test_handle_recursive_preconditions_with_multiple_outcomes(self):
-        
+
         pass #TODO
 
 
@@ -179,6 +238,162 @@ class ConfigurationTests(unittest.TestCase):
     	self.assertItemsEqual(self.config.ts, dict())
     	self.assertItemsEqual(self.config.preconditions, dict())
 
+    def test_malformed_config_file(self):
+
+        config_folder = os.path.join(
+                            os.path.dirname(robot_specification.__file__),
+                            '..', 'config')
+
+        # Not a dict, a TS that is not a mapping, and invalid YAML
+        for text in ['- a\n- b\n', 'transition_system: [a, b]\n',
+                     'transition_system: {a: [b\n']:
+            config_file_path = os.path.join(config_folder,
+                                            'malformed_test_config.yaml')
+            with open(config_file_path, 'w') as config_file:
+                config_file.write(text)
+            try:
+                clear_config_cache()
+                self.config = RobotConfiguration(robot = 'malformed_test')
+            finally:
+                os.remove(config_file_path)
+                clear_config_cache()
+
+            self.assertEqual(dict(), self.config._full_config)
+            self.assertEqual(dict(), self.config.ts)
+            self.assertEqual(dict(), self.config.preconditions)
+
+    def test_config_is_cached(self):
+
+        clear_config_cache()
+        config_1 = RobotConfiguration(robot = self.robot)
+        self.assertEqual(1, len(_config_cache))
+
+        config_1.ts['stand'].append('fly')
+        config_1.preconditions['new_action'] = []
+
+        config_2 = RobotConfiguration(robot = self.robot)
+        self.assertEqual(1, len(_config_cache))
+
+        self.assertEqual(self.config.ts, config_2.ts)
+        self.assertEqual(self.config.preconditions, config_2.preconditions)
+        self.assertIsNot(config_1.ts, config_2.ts)
+
+    def test_config_validation(self):
+
+        config = {'transition_system': {'a': ['a', 'b'], 'b': ['b']},
+                  'action_preconditions': {'fu': ['bar'], 'bar': None}}
+
+        validated = _validate_config(config)
+
+        self.assertEqual(validated['action_preconditions']['bar'], [])
+        self.assertEqual(validated['transition_system'],
+                         config['transition_system'])
+        self.assertEqual(_validate_config(None), dict())
+        self.assertRaises(ValueError, _validate_config, ['a', 'b'])
+        self.assertRaises(ValueError, _validate_config,
+                          {'transition_system': {'a': 'b'}})
+        self.assertRaises(ValueError, _validate_config,
+                          {'action_preconditions': {'fu': [1, 2]}})
+
+class CompiledConfigurationTests(unittest.TestCase):
+    """Test the compiled (binary) version of configuration files."""
+
+    def setUp(self):
+        """Gets called before every test case."""
+
+        self.folder = tempfile.mkdtemp()
+        self.config_file_path = os.path.join(self.folder, 'test_config.yaml')
+        self.compiled_path = _get_compiled_config_path(self.config_file_path)
+        
+        self.config = {'transition_system': {'a': ['a', 'b'], 'b': ['b']},
+                       'action_preconditions': {'fu': ['bar', 'a'],
+                                                'bar': []},
+                       'comment': 'not an element'}
+
+    def tearDown(self):
+        """Gets called after every test case."""
+
+        shutil.rmtree(self.folder)
+        del self.config
+
+    def test_round_trip(self):
+
+        _write_compiled_config(self.config_file_path, 42.0, self.config)
+
+        self.assertTrue(os.path.exists(self.compiled_path))
+        self.assertEqual(self.config,
+                         _load_compiled_config(self.config_file_path, 42.0))
+
+    def test_stale_compiled_config_is_ignored(self):
+
+        _write_compiled_config(self.config_file_path, 42.0, self.config)
+
+        self.assertIsNone(_load_compiled_config(self.config_file_path, 43.0))
+
+    def test_corrupted_compiled_config_is_ignored(self):
+
+        with open(self.compiled_path, 'wb') as stream:
+            stream.write('RSPC garbage')
+
+        self.assertIsNone(_load_compiled_config(self.config_file_path, 42.0))
+        self.assertIsNone(_load_compiled_config(self.config_file_path + 'x',
+                                                42.0))
+
+    def test_compiled_config_of_wrong_shape_is_ignored(self):
+
+        names = ['a', 'b']
+        for compiled_config in [(names, {'transition_system': [(0, [5])]}, {}),
+                                (names, {'transition_system': 3}, {}),
+                                (names, {'transition_system': [(0, [1])]}, 7),
+                                (names, None, {}),
+                                'not a tuple']:
+            _write_raw_compiled_config(self.compiled_path, 42.0,
+                                       compiled_config)
+            self.assertIsNone(_load_compiled_config(self.config_file_path,
+                                                    42.0))
+
+    def test_robot_configuration_ignores_bad_compiled_config(self):
+
+        clear_config_cache()
+        config_1 = RobotConfiguration(robot = 'atlas')
+
+        config_file_path = os.path.abspath(os.path.join(
+                            os.path.dirname(robot_specification.__file__),
+                            '..', 'config', 'atlas_config.yaml'))
+        compiled_path = _get_compiled_config_path(config_file_path)
+        try:
+            # A valid header (current mtime) and a bad index table
+            _write_raw_compiled_config(compiled_path,
+                                       os.path.getmtime(config_file_path),
+                                       (['stand'], {'transition_system':
+                                                    [(0, [1, 2])]}, {}))
+            clear_config_cache()
+            config_2 = RobotConfiguration(robot = 'atlas') # from the YAML
+
+            self.assertEqual(config_1._full_config, config_2._full_config)
+        finally:
+            # (It is compiled again the next time)
+            os.remove(compiled_path)
+            clear_config_cache()
+
+    def test_robot_configuration_from_compiled_config(self):
+
+        clear_config_cache()
+        config_1 = RobotConfiguration(robot = 'atlas') # compiles (if needed)
+        clear_config_cache()
+        config_2 = RobotConfiguration(robot = 'atlas') # loads compiled file
+
+        self.assertEqual(config_1._full_config, config_2._full_config)
+
+def _write_raw_compiled_config(compiled_path, mtime, compiled_config):
+    """Write a compiled config file (valid header) with any payload."""
+
+    with open(compiled_path, 'wb') as stream:
+        stream.write(_COMPILED_CONFIG_HEADER.pack(_COMPILED_CONFIG_MAGIC,
+                                                  COMPILED_CONFIG_VERSION,
+                                                  mtime))
+        stream.write(marshal.dumps(compiled_config))
+
 # =============================================================================
 # Entry point
 # =============================================================================
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+
+import sys
+import json
+import shutil
+import tempfile
+import threading
+import urllib2
+
+from respec.spec import GR1Specification
+from respec.spec.server import SpecificationGenerator, make_server
+
+import unittest
+
+
+class CompleteSpecification(GR1Specification):
+    """A stand-in for a robot's CompleteSpecification (see the examples)."""
+
+    def __init__(self, name, initial_conditions, goals, negate = False,
+                 fragments = None):
+        super(CompleteSpecification, self).__init__(name, initial_conditions,
+                                                    goals)
+
+        literal = (lambda prop: '! ' + prop) if negate else str
+        self.sys_init = map(literal, goals)
+        self.fragments = fragments
+
+class SpecificationFragments(object):
+
+    instances = 0
+
+    def __init__(self, action_outcomes = ['completed']):
+        SpecificationFragments.instances += 1
+
+
+class SpecificationGeneratorTests(unittest.TestCase):
+
+    def setUp(self):
+
+        self.output_dir = tempfile.mkdtemp()
+        self.generator = SpecificationGenerator([sys.modules[__name__]],
+                                                self.output_dir)
+
+    def tearDown(self):
+
+        shutil.rmtree(self.output_dir)
+        del self.output_dir, self.generator
+
+    def test_text_output(self):
+
+        response = self.generator.handle({u'name': u'spec',
+                                          u'initial_conditions': [u'x'],
+                                          u'goals': [u'y'],
+                                          u'options': {u'negate': True}})
+
+        self.assertEqual('spec', response['name'])
+        self.assertIn('[INPUT]\nx\n\n[OUTPUT]\ny\n\n[SYS_INIT]\n! y\n\n',
+                      response['structuredslugs'])
+
+    def test_file_output(self):
+
+        response = self.generator.handle({'name': 'spec', 'output': 'file',
+                                          'initial_conditions': [],
+                                          'goals': ['y']})
+
+        with open(response['path']) as spec_file:
+            self.assertIn('[SYS_INIT]\ny\n', spec_file.read())
+
+    def test_fragments_are_shared(self):
+
+        instances = SpecificationFragments.instances
+
+        for goal in ['a', 'b', 'c']:
+            self.generator.handle({'name': 'spec', 'initial_conditions': [],
+                                   'goals': [goal]})
+
+        self.assertEqual(instances + 1, SpecificationFragments.instances)
+        self.assertEqual(3, self.generator.get_status()['requests'])
+
+    def test_invalid_requests(self):
+
+        self.assertRaises(ValueError, self.generator.handle, ['spec'])
+        self.assertRaises(ValueError, self.generator.handle, {'name': 'spec'})
+        self.assertRaises(ValueError, self.generator.handle,
+                          {'name': 'spec', 'initial_conditions': [],
+                           'goals': [], 'module': 'other'})
+        self.assertRaises(ValueError, self.generator.handle,
+                          {'name': 'spec', 'initial_conditions': [],
+                           'goals': [], 'output': 'fax'})
+
+    def test_invalid_file_names(self):
+
+        for name in ['../spec', '/tmp/spec', 'spec.txt', '', 'a b', None]:
+            self.assertRaises(ValueError, self.generator.handle,
+                              {'name': name, 'initial_conditions': [],
+                               'goals': ['y'], 'output': 'file'})
+
+        self.assertEqual(0, self.generator.get_status()['requests'])
+
+
+class ServerTests(unittest.TestCase):
+
+    def setUp(self):
+
+        generator = SpecificationGenerator([sys.modules[__name__]])
+        self.server = make_server(generator, port = 0)
+        self.url = 'http://{0}:{1}'.format(*self.server.server_address)
+
+        self.thread = threading.Thread(target = self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+        del self.server, self.url, self.thread
+
+    def _post(self, request):
+
+        try:
+            response = urllib2.urlopen(self.url + '/spec', json.dumps(request))
+            return response.getcode(), json.load(response)
+        except urllib2.HTTPError as e:
+            return e.code, json.load(e)
+
+    def test_requests(self):
+
+        status, response = self._post({'name': 'spec', 'goals': ['y'],
+                                       'initial_conditions': ['x']})
+
+        self.assertEqual(200, status)
+        self.assertIn('[SYS_INIT]\ny\n', response['structuredslugs'])
+
+        status, response = self._post({'name': 'spec'})
+
+        self.assertEqual(400, status)
+        self.assertIn('initial_conditions', response['error'])
+
+        status, response = self._post({'name': '../../spec', 'goals': ['y'],
+                                       'initial_conditions': [],
+                                       'output': 'file'})
+
+        self.assertEqual(400, status)
+        self.assertIn('Invalid name', response['error'])
+
+        status = json.load(urllib2.urlopen(self.url + '/status'))
+
+        self.assertEqual({'modules': ['server_test'], 'requests': 1}, status)
+
+
+if __name__ == '__main__':
+    # Run all tests
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+
+import os
+import shutil
+import tempfile
+
+from respec.spec import GR1Specification
+from respec.spec.spec_cache import SpecificationCache, get_spec_key
+
+import unittest
+
+
+class SpecificationKeyTests(unittest.TestCase):
+
+    def test_key_of_equal_inputs(self):
+
+        key = get_spec_key(['stand'], ['grasp'], {'a': ['a', 'b'], 'b': ['b']})
+
+        self.assertEqual(key, get_spec_key(['stand'], ['grasp'],
+                                           {'b': ['b'], 'a': ['a', 'b']}))
+        self.assertEqual(key, get_spec_key([u'stand'], [u'grasp'],
+                                           {'a': ('a', 'b'), 'b': ['b']}))
+
+    def test_key_of_different_inputs(self):
+
+        key = get_spec_key(['stand'], ['grasp', 'walk'])
+
+        self.assertNotEqual(key, get_spec_key(['stand'], ['walk', 'grasp']))
+        self.assertNotEqual(key, get_spec_key(['stand'], goals = ['grasp', 'walk']))
+        self.assertNotEqual(key, get_spec_key(['stand', 'grasp', 'walk']))
+
+    def test_key_of_unsupported_inputs(self):
+
+        self.assertEqual(get_spec_key(1, 2.5, True, None, 'a'),
+                         get_spec_key(1, 2.5, True, None, u'a'))
+
+        self.assertRaises(TypeError, get_spec_key, object())
+        self.assertRaises(TypeError, get_spec_key, ['stand'], {'a': [object()]})
+        self.assertRaises(TypeError, get_spec_key, goals = lambda: 'grasp')
+
+
+class SpecificationCacheTests(unittest.TestCase):
+
+    def setUp(self):
+
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = SpecificationCache(self.cache_dir, max_size = 200)
+        self.builds = list()
+
+    def tearDown(self):
+
+        shutil.rmtree(self.cache_dir)
+        del self.cache_dir, self.cache, self.builds
+
+    def _build_spec(self, name = 'spec'):
+
+        self.builds.append(name)
+        spec = GR1Specification(name, ['x'], ['y'])
+        spec.sys_trans = ['x -> next(y)']
+        return spec
+
+    def test_miss_and_hit(self):
+
+        key = get_spec_key('spec')
+
+        self.assertIsNone(self.cache.get(key))
+
+        path = self.cache.write_structured_slugs_file(key, self._build_spec)
+        self.assertEqual(path, self.cache.write_structured_slugs_file(
+                                                        key, self._build_spec))
+
+        self.assertEqual(['spec'], self.builds)
+        with open(path) as spec_file:
+            self.assertIn('[SYS_TRANS]\nx -> next(y)\n', spec_file.read())
+
+    def test_least_recently_used_specs_are_evicted(self):
+
+        # Each file is 118 bytes long, so only one fits in the cache
+        paths = [self.cache.get_path(str(i)) for i in range(2)]
+        for i, path in enumerate(paths):
+            self.cache.put(str(i), self._build_spec(str(i)))
+            os.utime(path, (i, i))
+
+        self.assertFalse(os.path.exists(paths[0]))
+        self.assertTrue(os.path.exists(paths[1]))
+
+        self.cache.max_size = 1000
+        self.cache.put('0', self._build_spec())
+        os.utime(paths[0], (2, 2))
+        self.cache.get('1') # now more recent than '0'
+
+        self.cache.max_size = 200
+        self.assertEqual(1, self.cache.evict())
+        self.assertEqual([os.path.basename(paths[1])], os.listdir(self.cache_dir))
+
+    def test_clear(self):
+
+        self.cache.put('0', self._build_spec())
+        self.cache.clear()
+
+        self.assertEqual([], os.listdir(self.cache_dir))
+
+
+if __name__ == '__main__':
+    # Run all tests
+    unittest.main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+
+import os
+import sys
+import shutil
+import tempfile
+
+from respec.spec import GR1Specification
+from respec.spec.synthesis import SynthesisRunner
+
+import unittest
+
+# A stand-in for slugs: realizable unless the spec has a FALSE formula, and
+# never done if it has a 'sleep' output (nor is the child process that it then
+# starts, which holds its output open). It logs the specs that it is run on.
+FAKE_SYNTHESIZER = '''
+import sys, time, subprocess
+path, log_path = sys.argv[1].replace('--spec=', ''), sys.argv[2]
+text = open(path).read()
+open(log_path, 'a').write(path + '\\n')
+if 'sleep' in text:
+    subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+    time.sleep(30)
+if 'FALSE' in text:
+    sys.stderr.write('RESULT: Specification is unrealizable.\\n')
+else:
+    sys.stderr.write('RESULT: Specification is realizable.\\n')
+'''
+
+class SynthesisRunnerTests(unittest.TestCase):
+
+    def setUp(self):
+
+        self.temp_dir = tempfile.mkdtemp()
+        self.work_dir = os.path.join(self.temp_dir, 'specs')
+        self.cache_dir = os.path.join(self.temp_dir, 'results')
+        self.log_path = os.path.join(self.temp_dir, 'log')
+
+        self.synthesizer = os.path.join(self.temp_dir, 'synthesizer.py')
+        with open(self.synthesizer, 'w') as synthesizer_file:
+            synthesizer_file.write(FAKE_SYNTHESIZER)
+
+        self.command = [sys.executable, self.synthesizer, '{input}',
+                        self.log_path]
+
+    def tearDown(self):
+
+        shutil.rmtree(self.temp_dir)
+
+    def _get_runner(self, **kwargs):
+        return SynthesisRunner(self.command, self.work_dir, max_workers = 2,
+                               cache_dir = self.cache_dir, **kwargs)
+
+    def _get_runs(self):
+        if not os.path.exists(self.log_path):
+            return []
+        with open(self.log_path) as log_file:
+            return log_file.read().split()
+
+    def _build_spec(self, name, realizable = True, outputs = ['y']):
+
+        spec = GR1Specification(name, ['x'], outputs)
+        spec.sys_trans = ['x -> next(y)']
+        spec.sys_liveness = ['y'] if realizable else ['FALSE']
+        return spec
+
+    def test_run(self):
+
+        specs = [self._build_spec('spec_a'),
+                 self._build_spec('spec_b', realizable = False),
+                 self._build_spec('spec_c', outputs = ['y', 'z'])]
+
+        results = self._get_runner().run(specs)
+
+        self.assertEqual([r.name for r in results],
+                         ['spec_a', 'spec_b', 'spec_c'])
+        self.assertEqual([r.realizable for r in results], [True, False, True])
+        for result in results:
+            self.assertTrue(result.succeeded)
+            self.assertFalse(result.cached)
+            self.assertGreater(result.wall_time, 0)
+            self.assertTrue(os.path.isfile(result.spec_path))
+
+        self.assertItemsEqual(self._get_runs(), [r.spec_path for r in results])
+
+    def test_results_are_cached(self):
+
+        runner = self._get_runner()
+        first = runner.run([self._build_spec('spec_a')])[0]
+
+        # Same spec (in memory, then on disk): not synthesized again
+        second = runner.run([self._build_spec('spec_a')])[0]
+        third = self._get_runner().run([self._build_spec('spec_a')])[0]
+
+        self.assertEqual(len(self._get_runs()), 1)
+        for result in [second, third]:
+            self.assertTrue(result.cached)
+            self.assertEqual(result.realizable, True)
+            self.assertEqual(result.key, first.key)
+            self.assertEqual(result.wall_time, first.wall_time)
+
+        # A change to the spec is synthesized
+        changed = runner.run([self._build_spec('spec_a', outputs = ['y', 'z'])])
+        self.assertFalse(changed[0].cached)
+        self.assertNotEqual(changed[0].key, first.key)
+        self.assertEqual(len(self._get_runs()), 2)
+
+    def test_specs_with_the_same_name(self):
+
+        specs = [self._build_spec('spec_a'),
+                 self._build_spec('spec_a', realizable = False),
+                 self._build_spec(''), self._build_spec('', realizable = False)]
+
+        results = self._get_runner().run(specs)
+
+        self.assertEqual([r.realizable for r in results],
+                         [True, False, True, False])
+        self.assertEqual(len(set(r.spec_path for r in results)), 4)
+        self.assertTrue(os.path.basename(results[0].spec_path)
+                        .startswith('spec_a.'))
+
+    def test_spec_files_are_reused(self):
+
+        runner = self._get_runner()
+        for _ in range(3):
+            result = runner.run([self._build_spec('spec_a')])[0]
+            self.assertTrue(os.path.isfile(result.spec_path))
+
+        self._get_runner().run([self._build_spec('spec_a')])
+
+        self.assertEqual([os.path.basename(result.spec_path)],
+                         os.listdir(self.work_dir))
+
+    def test_input_inside_argument(self):
+
+        self.command[2] = '--spec={input}'
+        result = self._get_runner().run([self._build_spec('spec_a')])[0]
+
+        self.assertTrue(result.succeeded)
+        self.assertEqual(self._get_runs(), [result.spec_path])
+
+    def test_timeout(self):
+
+        spec = self._build_spec('spec_a', outputs = ['y', 'sleep'])
+
+        result = self._get_runner(timeout = 0.5).run([spec])[0]
+
+        self.assertTrue(result.timed_out)
+        self.assertFalse(result.succeeded)
+        self.assertIsNone(result.realizable)
+        self.assertLess(result.wall_time, 10)
+
+        # Timeouts are not cached
+        self._get_runner(timeout = 0.5).run([spec])
+        self.assertEqual(len(self._get_runs()), 2)
+
+    def test_missing_synthesizer(self):
+
+        runner = SynthesisRunner([os.path.join(self.temp_dir, 'missing')],
+                                 self.work_dir)
+        result = runner.run([self._build_spec('spec_a')])[0]
+
+        self.assertIsNone(result.returncode)
+        self.assertIsNone(result.realizable)
+        self.assertIn('Failed to run', result.error)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,7 @@
 
 import unittest
 
+from respec.ltl import ltl as LTL
 from respec.spec.ts_specification import *
 
 class SpecificationConstructionTests(unittest.TestCase):
@@ -40,6 +41,35 @@ class SpecificationConstructionTests(unittest.TestCase):
         
         self.assertItemsEqual(ts_of_interest, self.spec.ts)
 
+    def test_relevant_ts_props(self):
+
+        ts = {'prep': ['prep', 'stand'],
+              'stand': ['stand', 'walk', 'manipulate'],
+              'walk': ['walk'],
+              'manipulate': ['manipulate', 'stand'],
+              'stuck': ['stuck']}
+
+        self.assertEqual(['manipulate', 'stand'],
+                         get_relevant_ts_props(ts, ['stand', 'x'],
+                                               ['manipulate', 'grasp']))
+        self.assertEqual(['manipulate', 'prep', 'stand'],
+                         get_relevant_ts_props(ts, ['prep'], ['manipulate']))
+        self.assertEqual(['manipulate', 'stand', 'walk'],
+                         get_relevant_ts_props(ts, ['stand'], []))
+        self.assertEqual(['manipulate', 'prep', 'stand', 'walk'],
+                         get_relevant_ts_props(ts, [], ['walk']))
+        self.assertEqual(['stuck'],
+                         get_relevant_ts_props(ts, ['stuck'], ['walk']))
+
+    def test_pruned_ts(self):
+
+        spec = TransitionSystemSpecification(ts = self.ts,
+                                             initial_props = ['r3'],
+                                             goal_props = ['r1'])
+
+        self.assertEqual({'r1': ['r1', 'r3'], 'r3': ['r3', 'r1']}, spec.ts)
+        self.assertNotIn('r2_a', spec.sys_props)
+
     def test_formulas_in_env_trans(self):
 
         expected_formula_1a = 'next(r1_c) <-> (! next(r2_c) & ! next(r3_c))'
@@ -143,6 +173,40 @@ class SpecificationConstructionTests(unittest.TestCase):
         self.assertItemsEqual(actual_seq = self.spec.env_liveness,
                               expected_seq = [expected_env_liveness])
 
+    def test_integer_encoding(self):
+
+        spec = TransitionSystemSpecification(ts = self.ts,
+                                             outcomes = ['completed', 'failed'],
+                                             encoding = INTEGER)
+
+        self.assertItemsEqual(['ts_a:0...3'], spec.sys_props)
+        self.assertItemsEqual(['ts_c:0...2', 'r1_f', 'r2_f', 'r3_f'],
+                              spec.env_props)
+        self.assertIn('ts_a', spec.encoded_props)
+        self.assertIn('ts_c', spec.encoded_props)
+
+        self.assertEqual(len(self.spec.sys_trans), len(spec.sys_trans))
+        # The topology mutex formulas (3) are not needed anymore
+        self.assertEqual(len(self.spec.env_trans) - 3, len(spec.env_trans))
+
+    def test_integer_encoding_of_props_in_merged_spec(self):
+
+        ts_spec = TransitionSystemSpecification(ts = self.ts,
+                                                encoding = INTEGER)
+
+        other_spec = GR1Specification(env_props = ['r2_c', 'x_c'],
+                                      sys_props = ['x_a'])
+        other_spec.sys_trans = [LTL.implication(LTL.neg('r2_c'),
+                                                LTL.neg('x_a'))]
+
+        spec = GR1Specification(env_props = [], sys_props = [])
+        spec.merge_gr1_specifications([other_spec, ts_spec])
+
+        self.assertIn('! (ts_c = 1) -> ! x_a', spec.sys_trans)
+        self.assertNotIn('r2_c', spec.env_props)
+        self.assertIn('x_c', spec.env_props)
+
+
 # =============================================================================
 # Entry point
 # =============================================================================
@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+
+import json
+import shutil
+import tempfile
+from StringIO import StringIO
+
+from respec.ltl import ltl as LTL
+from respec.spec import GR1Specification
+from respec.spec.writers import *
+
+import unittest
+
+
+class CountingStream(object):
+    """A file-like object that remembers each write call."""
+
+    def __init__(self):
+        self.writes = list()
+
+    def write(self, text):
+        self.writes.append(text)
+
+    def getvalue(self):
+        return ''.join(self.writes)
+
+
+class BufferedSinkTests(unittest.TestCase):
+
+    def test_writes_in_blocks(self):
+
+        stream = CountingStream()
+
+        with BufferedSink(stream, buffer_size = 10) as sink:
+            for chunk in ['abc', 'def', 'ghij', 'k', 'lm']:
+                sink.write(chunk)
+
+        self.assertEqual(['abcdefghij', 'klm'], stream.writes)
+
+    def test_nothing_to_write(self):
+
+        stream = CountingStream()
+        BufferedSink(stream).flush()
+
+        self.assertEqual([], stream.writes)
+
+
+class StructuredSlugsWriterTests(unittest.TestCase):
+
+    def setUp(self):
+
+        self.expected = ("[INPUT]\nx\n\n"
+                         "[OUTPUT]\ny1\ny2\n\n"
+                         "[SYS_INIT]\n! y1\n\n"
+                         "[ENV_INIT]\n\n"
+                         "[SYS_TRANS]\nx -> next(y1)\nnext(y2) -> ! x\n\n"
+                         "[ENV_TRANS]\n\n"
+                         "[SYS_LIVENESS]\ny2\n\n"
+                         "[ENV_LIVENESS]\n\n")
+
+    def tearDown(self):
+
+        del self.expected
+
+    def test_spec(self):
+
+        spec = GR1Specification('writer', ['x'], ['y1', 'y2'])
+        spec.sys_init = ['! y1']
+        spec.sys_trans = [LTL.implication('x', LTL.next('y1')),
+                          'next(y2) -> ! x']
+        spec.sys_liveness = ['y2']
+
+        stream = StringIO()
+        spec.write_structured_slugs(stream)
+
+        self.assertEqual(self.expected, stream.getvalue())
+
+    def test_generators(self):
+
+        def gen_sys_trans():
+            yield 'x -> next(y1)'
+            yield LTL.implication(LTL.next('y2'), LTL.neg('x'))
+
+        sections = {'env_props': iter(['x']),
+                    'sys_props': (y for y in ['y1', 'y2']),
+                    'sys_init': iter(['! y1']),
+                    'sys_trans': gen_sys_trans(),
+                    'sys_liveness': iter(['y2'])}
+
+        stream = CountingStream()
+        StructuredSlugsWriter().write(sections, stream)
+
+        self.assertEqual(self.expected, stream.getvalue())
+        self.assertEqual(1, len(stream.writes))
+
+
+class SlugsInWriterTests(unittest.TestCase):
+    """The output is what slugs' compiler.py makes of the structuredslugs."""
+
+    def test_boolean_spec(self):
+
+        spec = GR1Specification('writer', ['x'], ['y1', 'y2'])
+        spec.sys_init = ['! y1']
+        spec.sys_trans = [LTL.implication('x', LTL.next('y1')),
+                          'next(y2) -> ! x']
+        spec.sys_liveness = ['y2']
+
+        expected = ("[INPUT]\nx\n\n"
+                    "[OUTPUT]\ny1\ny2\n\n"
+                    "[SYS_INIT]\n! y1\n\n"
+                    "[ENV_INIT]\n\n"
+                    "[SYS_TRANS]\n| ! x y1'\n| ! y2' ! x\n\n"
+                    "[ENV_TRANS]\n\n"
+                    "[SYS_LIVENESS]\ny2\n\n"
+                    "[ENV_LIVENESS]\n\n")
+
+        stream = StringIO()
+        spec.write_slugsin(stream)
+
+        self.assertEqual(expected, stream.getvalue())
+
+    def test_integer_variables(self):
+
+        spec = GR1Specification('writer', ['a'], ['x:0...2', 'y'])
+        spec.sys_init = [LTL.eq('x', 0)]
+        spec.sys_trans = [LTL.implication('a', LTL.next(LTL.eq('x', 2)))]
+        spec.sys_liveness = ['y']
+        spec.env_liveness = ['a']
+
+        # 2 bits, where 3 (both bits) is out of the range
+        expected = ("[INPUT]\na\n\n"
+                    "[OUTPUT]\nx@0.0.2\nx@1\ny\n\n"
+                    "[SYS_INIT]\n& ! x@0.0.2 ! x@1\n| ! x@1 ! x@0.0.2\n\n"
+                    "[ENV_INIT]\n\n"
+                    "[SYS_TRANS]\n| ! a & ! x@0.0.2' x@1'\n"
+                    "| ! x@1' ! x@0.0.2'\n\n"
+                    "[ENV_TRANS]\n\n"
+                    "[SYS_LIVENESS]\ny\n\n"
+                    "[ENV_LIVENESS]\na\n\n")
+
+        stream = StringIO()
+        SlugsInWriter().write(spec, stream)
+
+        self.assertEqual(expected, stream.getvalue())
+
+    def test_file(self):
+
+        spec = GR1Specification('slugsin_writer', ['x'], ['y'])
+        spec.sys_liveness = ['y']
+
+        folder_path = tempfile.mkdtemp()
+        try:
+            file_path, _ = spec.write_slugsin_file(folder_path)
+            self.assertTrue(file_path.endswith('slugsin_writer.slugsin'))
+            with open(file_path) as spec_file:
+                self.assertIn('[SYS_LIVENESS]\ny\n', spec_file.read())
+        finally:
+            shutil.rmtree(folder_path)
+
+
+class OtherWritersTests(unittest.TestCase):
+    """The writers for other synthesizers, and the registry of writers."""
+
+    def setUp(self):
+
+        self.spec = GR1Specification('writer', ['a'], ['x:0...2', 'y'])
+        self.spec.sys_init = [LTL.eq('x', 0), '! y']
+        self.spec.sys_trans = [LTL.implication('a', LTL.next(LTL.eq('x', 2))),
+                               LTL.iff(LTL.next('y'), LTL.neg('a'))]
+        self.spec.sys_liveness = ['y']
+        self.spec.env_liveness = ['a']
+
+    def tearDown(self):
+
+        del self.spec
+
+    def test_gr1c(self):
+
+        expected = ("ENV: a;\n"
+                    "SYS: x [0,2] y;\n\n"
+                    "ENVINIT:;\n"
+                    "ENVTRANS:;\n"
+                    "ENVGOAL: []<>(a);\n"
+                    "SYSINIT: (x = 0)\n  & !y;\n"
+                    "SYSTRANS: []((a -> (x' = 2)))\n  & []((y' <-> !a));\n"
+                    "SYSGOAL: []<>(y);\n")
+
+        stream = StringIO()
+        self.spec.write(stream, 'gr1c')
+
+        self.assertEqual(expected, stream.getvalue())
+
+    def test_json(self):
+
+        expected = {'env_vars': {'a': 'boolean'},
+                    'sys_vars': {'x': [0, 2], 'y': 'boolean'},
+                    'env_init': [],
+                    'env_safety': [],
+                    'env_prog': ['a'],
+                    'sys_init': ['(x = 0)', '!y'],
+                    'sys_safety': ["(a -> (x' = 2))", "(y' <-> !a)"],
+                    'sys_prog': ['y']}
+
+        stream = StringIO()
+        JSONWriter().write(self.spec, stream)
+
+        self.assertEqual(expected, json.loads(stream.getvalue()))
+
+    def test_empty_spec(self):
+
+        for file_format in WRITERS:
+            stream = StringIO()
+            GR1Specification().write(stream, file_format)
+            self.assertTrue(stream.getvalue())
+
+        stream = StringIO()
+        GR1Specification().write(stream, 'json')
+        self.assertEqual([], json.loads(stream.getvalue())['sys_init'])
+
+    def test_file_formats(self):
+
+        folder_path = tempfile.mkdtemp()
+        try:
+            for file_format, extension in [('structuredslugs',
+                                            '.structuredslugs'),
+                                           ('gr1c', '.spc'),
+                                           ('json', '.json')]:
+                file_path, _ = self.spec.write_file(folder_path, file_format)
+                self.assertTrue(file_path.endswith('writer' + extension))
+        finally:
+            shutil.rmtree(folder_path)
+
+        self.assertRaises(ValueError, get_writer, 'promela')
+
+    def test_register_writer(self):
+
+        class LivenessWriter(SpecificationWriter):
+            file_format = 'liveness'
+            extension = '.txt'
+
+            def iter_chunks(self, spec):
+                for formula in spec.sys_liveness:
+                    yield str(formula)
+
+        register_writer(LivenessWriter)
+        try:
+            stream = StringIO()
+            self.spec.write(stream, 'liveness')
+            self.assertEqual('y', stream.getvalue())
+        finally:
+            del WRITERS['liveness']
+
+
+if __name__ == '__main__':
+    # Run all tests
+    unittest.main()